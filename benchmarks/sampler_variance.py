@@ -0,0 +1,67 @@
+"""
+Benchmarks the variance reduction of the Monte Carlo sampling strategies on the bundled
+example killwebs. Each strategy estimates every path's probability of success over a
+number of independently seeded replications, and the variance of those estimates, averaged
+over the paths, is compared with the default pseudo-random sampler
+
+Usage:
+    python -m benchmarks.sampler_variance --iterations 1024 --replications 30
+"""
+import argparse
+import os
+import time
+import numpy as np
+from mimik.killweb import Killweb
+from mimik.component_graph.samplers import SAMPLERS
+
+EXAMPLES = [
+    ("1_long_range_strikes_example", "killweb_interconnected.json"),
+    ("killchain_example", "killchain_betabernoulli.json"),
+    ("killchain_example", "killchain_hierarchical_bayes.json")
+]
+
+
+def estimate_variance(killweb: Killweb, sampler: str, iterations: int, replications: int):
+    """
+    Estimates the variance of each path's probability of success under a sampling strategy
+
+    Parameters:
+        killweb (Killweb): The killweb to simulate
+        sampler (str): The name of the sampling strategy
+        iterations (int): The number of iterations of each replication
+        replications (int): The number of independently seeded replications
+
+    Returns:
+        A tuple of the variance averaged over the paths and the seconds taken per replication
+    """
+    estimates = []
+    start_time = time.perf_counter()
+    for seed in range(replications):
+        killweb.monte_carlo_on_paths(iterations, seed=seed, sampler=sampler, store_outcomes=False)
+        probability_of_success = killweb.get_probabilities_of_paths()
+        estimates.append([probability_of_success[path] for path in sorted(probability_of_success)])
+    elapsed = (time.perf_counter() - start_time) / replications
+    return np.mean(np.var(estimates, axis=0, ddof=1)), elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="sampler_variance")
+    parser.add_argument("--iterations", type=int, default=1024)
+    parser.add_argument("--replications", type=int, default=30)
+    args = parser.parse_args()
+    examples_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "examples")
+    for example, config_file in EXAMPLES:
+        working_dir = os.path.join(examples_dir, example)
+        killweb = Killweb(
+            working_dir=working_dir,
+            config_file=os.path.join(working_dir, "configs", config_file),
+            silent=True
+        )
+        print("\n%s (%d iterations x %d replications)" % (config_file, args.iterations, args.replications))
+        print("\t%-16s %14s %12s %10s" % ("Sampler", "Mean Variance", "Reduction", "Seconds"))
+        baseline_variance = None
+        for sampler in SAMPLERS:
+            variance, elapsed = estimate_variance(killweb, sampler, args.iterations, args.replications)
+            if baseline_variance is None:
+                baseline_variance = variance
+            print("\t%-16s %14.3e %11.2fx %10.3f" % (sampler, variance, baseline_variance / variance, elapsed))
@@ -7,6 +7,8 @@ class Engage(AbstractTask):
     Class for Engage task
     """
 
+    num_uniforms = 1
+
     def __init__(self, arguments: dict):
         """
         Initialize custom Engage class
@@ -24,3 +26,9 @@ class Engage(AbstractTask):
 
     def forward(self):
         return beta.rvs(self.alpha, self.beta)
+
+    def forward_batch(self, n: int):
+        return beta.rvs(self.alpha, self.beta, size=n)
+
+    def forward_from_uniforms(self, uniforms):
+        return beta.ppf(uniforms[:, 0], self.alpha, self.beta)
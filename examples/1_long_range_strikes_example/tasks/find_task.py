@@ -5,6 +5,7 @@ class Find(AbstractTask):
     """
     Class for Find task
     """
+    pure = True
 
     def __init__(self, arguments: dict):
         """
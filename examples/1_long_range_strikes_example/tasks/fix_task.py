@@ -7,6 +7,8 @@ class Fix(AbstractTask):
     Class for Fix task
     """
 
+    num_uniforms = 2
+
     def __init__(self, arguments: dict):
         """
         Initialize custom Fix class
@@ -25,3 +27,11 @@ class Fix(AbstractTask):
     def forward(self):
         b = lognorm.rvs(self.sigma2, self.d)
         return beta.rvs(self.alpha, b)
+
+    def forward_batch(self, n: int):
+        b = lognorm.rvs(self.sigma2, self.d, size=n)
+        return beta.rvs(self.alpha, b)
+
+    def forward_from_uniforms(self, uniforms):
+        b = lognorm.ppf(uniforms[:, 0], self.sigma2, self.d)
+        return beta.ppf(uniforms[:, 1], self.alpha, b)
@@ -6,6 +6,7 @@ class Track(AbstractTask):
     """
     Class for Track event
     """
+    pure = True
 
     def __init__(self, arguments: dict):
         """
@@ -10,6 +10,9 @@ class Find(AbstractTask):
     """
     Class for Find task
     """
+    # Outcomes are sampled 0 or 1 values, which probing could mistake for a constant
+    pure = False
+
     def __init__(self, arguments: dict):
         """
         Initialize custom Find class
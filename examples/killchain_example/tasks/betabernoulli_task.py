@@ -15,6 +15,8 @@ class BetaBernoulli(AbstractTask):
     '''
     Class for the beta Bernoulli prior
     '''
+
+    num_uniforms = 1
     
     def __init__(self, arguments: dict):
         '''
@@ -31,4 +33,10 @@ class BetaBernoulli(AbstractTask):
         self.beta = arguments['beta']
         
     def forward(self):
-        return beta.rvs(self.alpha, self.beta)
\ No newline at end of file
+        return beta.rvs(self.alpha, self.beta)
+
+    def forward_batch(self, n: int):
+        return beta.rvs(self.alpha, self.beta, size=n)
+
+    def forward_from_uniforms(self, uniforms):
+        return beta.ppf(uniforms[:, 0], self.alpha, self.beta)
\ No newline at end of file
@@ -12,6 +12,7 @@ from mimik.component_graph.abstract_task import AbstractTask
 
 
 class EngageTask(AbstractTask):
+    num_uniforms = 1
     
     def __init__(self, arguments: dict):
         '''
@@ -28,4 +29,10 @@ class EngageTask(AbstractTask):
         self.beta = arguments['beta']
         
     def forward(self):
-        return beta.rvs(self.alpha, self.beta)
\ No newline at end of file
+        return beta.rvs(self.alpha, self.beta)
+
+    def forward_batch(self, n: int):
+        return beta.rvs(self.alpha, self.beta, size=n)
+
+    def forward_from_uniforms(self, uniforms):
+        return beta.ppf(uniforms[:, 0], self.alpha, self.beta)
\ No newline at end of file
@@ -12,6 +12,7 @@ from mimik.component_graph.abstract_task import AbstractTask
 
 
 class FindTask(AbstractTask):
+    num_uniforms = 2
     
     def __init__(self, arguments: dict):
         '''
@@ -30,4 +31,12 @@ class FindTask(AbstractTask):
         
     def forward(self):
         b = lognorm.rvs(self.sigma2, self.mu)
-        return beta.rvs(self.alpha, b)
\ No newline at end of file
+        return beta.rvs(self.alpha, b)
+
+    def forward_batch(self, n: int):
+        b = lognorm.rvs(self.sigma2, self.mu, size=n)
+        return beta.rvs(self.alpha, b)
+
+    def forward_from_uniforms(self, uniforms):
+        b = lognorm.ppf(uniforms[:, 0], self.sigma2, self.mu)
+        return beta.ppf(uniforms[:, 1], self.alpha, b)
\ No newline at end of file
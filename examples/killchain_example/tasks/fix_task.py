@@ -10,6 +10,7 @@ from mimik.component_graph.abstract_task import AbstractTask
 
 
 class FixTask(AbstractTask):
+    pure = True
     
     def __init__(self, arguments: dict):
         '''
@@ -11,6 +11,7 @@ from mimik.component_graph.abstract_task import AbstractTask
 
 
 class TargetTask(AbstractTask):
+    pure = True
     
     def __init__(self, arguments: dict):
         '''
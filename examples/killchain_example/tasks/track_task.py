@@ -15,6 +15,8 @@ class TrackTask(AbstractTask):
     '''
     Class for the beta Bernoulli prior
     '''
+
+    num_uniforms = 2
     
     def __init__(self, arguments: dict):
         '''
@@ -33,4 +35,12 @@ class TrackTask(AbstractTask):
         
     def forward(self):
         a = gamma.rvs(self.k, self.theta)
-        return beta.rvs(a, self.beta)
\ No newline at end of file
+        return beta.rvs(a, self.beta)
+
+    def forward_batch(self, n: int):
+        a = gamma.rvs(self.k, self.theta, size=n)
+        return beta.rvs(a, self.beta)
+
+    def forward_from_uniforms(self, uniforms):
+        a = gamma.ppf(uniforms[:, 0], self.k, self.theta)
+        return beta.ppf(uniforms[:, 1], a, self.beta)
\ No newline at end of file
@@ -1,7 +1,53 @@
+import hashlib
+import json
+import os
 from abc import ABC
+from typing import Optional
+import numpy as np
+
+
+def canonical_json(value) -> str:
+    """
+    Serializes a value as JSON with sorted keys, so that equal values are serialized identically.
+    NumPy arrays are encoded by their dtype, shape and a digest of their contents, and NumPy
+    scalars by their value
+
+    Parameters:
+        value: The value to serialize
+
+    Returns:
+        str: The canonical JSON of the value
+
+    Raises:
+        TypeError: If the value holds an object that cannot be encoded by its contents
+        ValueError: If the value is circular
+    """
+    return json.dumps(value, sort_keys=True, default=_encode_value)
+
+
+def _encode_value(value):
+    """
+    Encodes the NumPy values that the standard JSON encoder does not support
+    """
+    if isinstance(value, np.ndarray):
+        contents = hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()
+        return {"__ndarray__": [value.dtype.str, list(value.shape), contents]}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError("Objects of type %s cannot be encoded by their contents" % type(value).__name__)
 
 
 class AbstractTask(ABC):
+    # The number of uniform variates forward_from_uniforms consumes per execution
+    num_uniforms = 0
+    # True if forward always returns the same probability, so its result can be computed once
+    # and reused. False marks a stochastic task, and None leaves the task to be probed
+    pure: Optional[bool] = None
+    # True if components whose tasks have the same name and arguments may share one instance
+    # created by the TaskFactory. Tasks holding state that changes between executions should
+    # set this to False so that every component gets its own instance
+    shareable = True
+
     def __init__(self, task_name: str, arguments: dict):
         """
         A constructor for the abstract Task class
@@ -23,3 +69,109 @@ class AbstractTask(ABC):
             The static probability associated with the task
         """
         return self.probability
+
+    def forward_batch(self, n: int):
+        """
+        Computes the probabilities of n independent executions of the task at once.
+        Tasks able to draw their probabilities with array operations should override
+        this function. By default, forward is called n times
+
+        Parameters:
+            n (int): The number of probabilities to compute
+
+        Returns:
+            np.ndarray: An array of n probabilities
+        """
+        if self.is_pure():
+            return np.full(n, self.cached_forward(), dtype=float)
+        return np.fromiter((self.forward() for _ in range(n)), dtype=float, count=n)
+
+    def forward_from_uniforms(self, uniforms: np.ndarray):
+        """
+        Computes the probabilities of independent executions of the task from uniform variates,
+        typically through inverse CDFs, so that a sampling strategy controls the task's randomness.
+        Tasks implementing this function should set num_uniforms to the number of variates they
+        consume. By default, the variates are ignored and forward_batch is used
+
+        Parameters:
+            uniforms (np.ndarray): A (n x num_uniforms) array of uniform variates
+
+        Returns:
+            np.ndarray: An array of n probabilities
+        """
+        return self.forward_batch(uniforms.shape[0])
+
+    def is_pure(self) -> bool:
+        """
+        Determines whether the task is known to be pure without calling forward. Tasks using
+        the default static probability are pure, and any other task is pure only if it
+        declares pure = True
+
+        Returns:
+            bool: True if the task's forward function always returns the same probability
+        """
+        if self.pure is not None:
+            return self.pure
+        return type(self).forward is AbstractTask.forward
+
+    def cached_forward(self):
+        """
+        Calls forward once and returns the stored result on every later call. Only valid
+        for pure tasks. The stored result must be cleared with clear_forward_cache if the
+        task's attributes are changed in place. Static probabilities are read directly so
+        they can be changed in place
+
+        Returns:
+            The probability returned by the first call to forward
+        """
+        if type(self).forward is AbstractTask.forward:
+            return self.probability
+        if "_cached_probability" not in self.__dict__:
+            self._cached_probability = self.forward()
+        return self._cached_probability
+
+    def clear_forward_cache(self):
+        """
+        Clears the result stored by cached_forward
+        """
+        self.__dict__.pop("_cached_probability", None)
+
+    def fingerprint(self) -> str:
+        """
+        Identifies the task by its class, name, arguments and static probability, so that results
+        computed with the task can be reused while none of these change. NumPy arrays are identified
+        by their contents. A task whose arguments hold any other value that is not JSON serializable
+        gets a new fingerprint on every call, so its results are never reused. Tasks holding state
+        that is not derived from their arguments should extend the fingerprint with it
+
+        Returns:
+            str: A hexadecimal digest of the task's identity
+        """
+        identity = [
+            type(self).__module__,
+            type(self).__qualname__,
+            self.task_name,
+            self.task_arguments,
+            getattr(self, "probability", None)
+        ]
+        try:
+            return hashlib.sha256(canonical_json(identity).encode()).hexdigest()
+        except (TypeError, ValueError):
+            return os.urandom(32).hex()
+
+    def is_deterministic(self, num_probes=3) -> bool:
+        """
+        Determines whether the task's forward function always returns the same probability.
+        Tasks declaring pure, or using the default static probability, are answered without
+        calling forward, while any other task is probed by calling forward num_probes times
+
+        Parameters:
+            num_probes (int): The number of times to call forward when probing. Default is 3
+
+        Returns:
+            bool: True if the task is deterministic
+        """
+        if self.pure is not None or type(self).forward is AbstractTask.forward:
+            return self.is_pure()
+        first_probability = self.forward()
+        return all(self.forward() == first_probability for _ in range(num_probes - 1))
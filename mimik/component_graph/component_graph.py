@@ -1,29 +1,154 @@
+import hashlib
 import json
 import os
+import sys
 import networkx as nx
 import numpy as np
-import matplotlib.pyplot as plt
 from mimik.component_graph.component import Component
+from mimik.config_reader import DEFAULT_CHUNK_SIZE, iter_config_components, read_config
+from mimik.component_graph.path_index import PathIndex
 from mimik.component_graph.task_factory import TaskFactory
 
 
 class ComponentGraph(nx.DiGraph):
-    def __init__(self, working_dir: str, silent=False):
+    def __init__(self, working_dir: str, silent=False, headless=None):
         """
         Creates a new ComponentGraph object
 
+        matplotlib is only imported when a figure is first drawn. A headless graph never imports
+        it, which suits batch workers that only simulate
+
         Args:
             working_dir (str): The working directory to read from
             silent (bool): True if MIMIK is running in silent mode
+            headless (bool): True if the graph should never plot. Default is None which is headless
+                when the MIMIK_HEADLESS environment variable is set to 1
         """
         super().__init__()
-        plt.close()
+        self.headless = os.environ.get("MIMIK_HEADLESS") == "1" if headless is None else headless
+        if not self.headless and "matplotlib.pyplot" in sys.modules:
+            sys.modules["matplotlib.pyplot"].close()
         self.silent = silent
         self.output_dir = os.path.join(working_dir, "output")
         if not os.path.isdir(self.output_dir):
             os.mkdir(self.output_dir)
         self.task_factory = TaskFactory(os.path.join(working_dir, "tasks"), silent)
         self.mission_tasks = []
+        self.path_index = PathIndex(self)
+
+    def add_node(self, node_for_adding, **attr):
+        """
+        Adds a node to the graph, marking it in the path index if it is new
+        """
+        is_new_node = node_for_adding not in self._node
+        super().add_node(node_for_adding, **attr)
+        if is_new_node:
+            self.path_index.mark_dirty(node_for_adding)
+
+    def add_edge(self, u_of_edge, v_of_edge, **attr):
+        """
+        Adds an edge to the graph, marking both of its nodes in the path index
+        """
+        super().add_edge(u_of_edge, v_of_edge, **attr)
+        self.path_index.mark_dirty(u_of_edge, v_of_edge)
+
+    def add_nodes_from(self, nodes_for_adding, **attr):
+        """
+        Adds nodes to the graph in bulk, marking the new nodes in the path index at once
+        """
+        nodes_for_adding = list(nodes_for_adding)
+        new_nodes = [node for node in (node[0] if isinstance(node, tuple) else node for node in nodes_for_adding) if node not in self._node]
+        super().add_nodes_from(nodes_for_adding, **attr)
+        if new_nodes:
+            self.path_index.mark_dirty(*new_nodes)
+
+    def add_edges_from(self, ebunch_to_add, **attr):
+        """
+        Adds edges to the graph in bulk, marking the nodes of every edge in the path index at once
+        """
+        ebunch_to_add = list(ebunch_to_add)
+        super().add_edges_from(ebunch_to_add, **attr)
+        if ebunch_to_add:
+            self.path_index.mark_dirty(*{node for edge in ebunch_to_add for node in edge[:2]})
+
+    def remove_node(self, n):
+        """
+        Removes a node from the graph, marking its neighbours in the path index
+        """
+        neighbours = list(self.predecessors(n)) + list(self.successors(n)) if n in self._node else []
+        super().remove_node(n)
+        self.path_index.mark_removed(n, neighbours)
+
+    def remove_edge(self, u, v):
+        """
+        Removes an edge from the graph, marking both of its nodes in the path index
+        """
+        super().remove_edge(u, v)
+        self.path_index.mark_dirty(u, v)
+
+    def remove_nodes_from(self, nodes):
+        """
+        Removes nodes from the graph in bulk, marking each removed node and its neighbours in the path index
+        """
+        removed_nodes = {
+            node: list(self.predecessors(node)) + list(self.successors(node)) for node in nodes if node in self._node
+        }
+        super().remove_nodes_from(list(removed_nodes))
+        for node, neighbours in removed_nodes.items():
+            self.path_index.mark_removed(node, neighbours)
+
+    def remove_edges_from(self, ebunch):
+        """
+        Removes edges from the graph in bulk, marking the nodes of every edge in the path index at once
+        """
+        ebunch = list(ebunch)
+        super().remove_edges_from(ebunch)
+        if ebunch:
+            self.path_index.mark_dirty(*{node for edge in ebunch for node in edge[:2]})
+
+    def clear(self):
+        """
+        Removes every node and edge from the graph, discarding the paths of the path index
+        """
+        super().clear()
+        self.path_index.invalidate()
+
+    def clear_edges(self):
+        """
+        Removes every edge from the graph, discarding the paths of the path index
+        """
+        super().clear_edges()
+        self.path_index.invalidate()
+
+    def get_all_paths(self):
+        """
+        Gets all of the simple paths from a start component to an end component. Paths are
+        kept in an index which is updated incrementally after the graph is mutated
+
+        Returns:
+            list[list[str]]: A list of paths resembling kill chains
+        """
+        return self.path_index.get_paths()
+
+    def iter_paths(self):
+        """
+        Lazily iterates over the simple paths from a start component to an end component
+        without holding every path in memory
+
+        Returns:
+            Iterator[list[str]]: An iterator over the paths resembling kill chains
+        """
+        return self.path_index.iter_paths()
+
+    def count_paths(self) -> int:
+        """
+        Counts the simple paths from a start component to an end component without
+        enumerating them when the graph is acyclic
+
+        Returns:
+            int: The number of paths
+        """
+        return self.path_index.count_paths()
 
     def get_start_components(self):
         """
@@ -34,6 +159,21 @@ class ComponentGraph(nx.DiGraph):
         """
         return [component for component in self.nodes if self.in_degree(component) == 0]
 
+    def fingerprint(self) -> str:
+        """
+        Identifies the killweb by its components, their tasks and its edges, so that saved
+        results can be matched to the killweb they were simulated on
+
+        Returns:
+            str: A hexadecimal digest of the killweb's structure and tasks
+        """
+        components = sorted(
+            (component_name, None if component.task is None else component.task.fingerprint())
+            for component_name, component in self.nodes(data="component")
+        )
+        identity = [components, sorted(self.edges)]
+        return hashlib.sha256(json.dumps(identity).encode()).hexdigest()
+
     def get_end_components(self):
         """
         Gets all of the components ending a path in the killweb
@@ -74,15 +214,45 @@ class ComponentGraph(nx.DiGraph):
             killweb_name (str): The name of the killweb to load
             config_filename (str): The config file to load from
         """
-        with open(config_filename, 'r') as file:
-            data = json.load(file)
-            for killweb in data.values():
-                for component in killweb.keys():
-                    if "attributes" in killweb[component]:
-                        self.add_new_component(component, killweb[component]["connected_components"], [], killweb[component]["attributes"])
-                    else:
-                        self.add_new_component(component, killweb[component]["connected_components"], [], {})
-                break
+        self.load_killweb_from_config(read_config(config_filename))
+
+    def load_killweb_from_config(self, data: dict):
+        """
+        Loads the first killweb of an already parsed config
+
+        Args:
+            data (dict): The parsed config, mapping killweb names to their components
+        """
+        for killweb in data.values():
+            self.add_components([
+                (component, killweb[component]["connected_components"], [], killweb[component].get("attributes", {}))
+                for component in killweb.keys()
+            ])
+            break
+
+    def stream_killweb_from_config_file(self, config_filename: str, validate_component=None, batch_size=10000, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Loads the first killweb of a config file incrementally, so that peak memory is bounded by
+        the graph being built rather than the size of the file. Components are decoded one at a
+        time and added in batches with add_components
+
+        Args:
+            config_filename (str): The config file to load from
+            validate_component (Callable): A function called with the killweb name, component name
+                and component config of each component before it is added, such as
+                JsonValidator.validate_component. Default is None which skips validation
+            batch_size (int): The number of components added at a time. Default is 10000
+            chunk_size (int): The number of characters read from the file at a time. Default is DEFAULT_CHUNK_SIZE
+        """
+        components: list[tuple] = []
+        for killweb_name, component, component_config in iter_config_components(config_filename, chunk_size):
+            if validate_component is not None:
+                validate_component(killweb_name, component, component_config)
+            components.append((component, component_config["connected_components"], [], component_config.get("attributes", {})))
+            if len(components) >= batch_size:
+                self.add_components(components)
+                components = []
+        self.add_components(components)
 
     def add_new_component(self, component_name: str, to_components: list[str], from_components: list[str], component_attributes: dict):
         """
@@ -95,50 +265,78 @@ class ComponentGraph(nx.DiGraph):
             component_attributes (dict): A dictionary of component attributes including task,
                 task_arguments, and system_name
         """
-        component_name = component_name.strip()
-        stripped_to_components = []
-        
-        # add out edges
-        if isinstance(to_components, list):
-            for to_component in to_components:
-                stripped_to_components.append(to_component.strip())
-        component = Component(component_name, stripped_to_components)
-            
-        if component_name in self.nodes():
-            nx.set_node_attributes(self, {component_name: {"component": component}})
-        else:
-            self.add_node(component_name, component=component)
-            
-        if isinstance(from_components, list):
-            for from_component in from_components:
-                from_component = from_component.strip()
-                if from_component not in self.nodes():
-                    new_from_component = Component(from_component, [component_name])
-                    self.add_node(from_component, component=new_from_component)
-                self.add_edge(from_component, component_name)
-                self.nodes[from_component]["component"].connected_component_names.append(component_name)
-          
-        if isinstance(to_components, list):
-            for to_component in stripped_to_components:
-                if to_component not in self.nodes():
-                    new_to_component = Component(to_component, [])
-                    self.add_node(to_component, component=new_to_component)
-                self.add_edge(component_name, to_component)
-            
-        if isinstance(component_attributes, dict):
-            for attribute in component_attributes.keys():
-                if "task_arguments" == attribute:
-                    continue
-                elif "task" == attribute and "task_arguments" in component_attributes:
-                    self.add_task_to_component(component_name, component_attributes["task"], component_attributes["task_arguments"])
-                elif "system_name" == attribute:
-                    self.nodes[component_name]["component"].add_system_name(component_attributes["system_name"])
-                else:
-                    self.nodes[component_name][attribute] = component_attributes[attribute]
+        self.add_components([(component_name, to_components, from_components, component_attributes)])
+
+    def add_components(self, components: list[tuple]):
+        """
+        Adds many components to the killweb at once. The components are resolved in order exactly
+        as successive calls to add_new_component would, then their nodes and edges are inserted
+        with a single add_nodes_from and add_edges_from so that the path index is marked once
+
+        Args:
+            components (list[tuple]): A list of (component_name, to_components, from_components,
+                component_attributes) tuples taking the arguments of add_new_component
+        """
+        node_attributes: dict[str, dict] = {}
+        edges = []
+
+        def get_component(name: str) -> Component:
+            if name in node_attributes:
+                return node_attributes[name]["component"]
+            return self._node[name]["component"]
+
+        def add_placeholder(name: str, connected_component_names: list[str]):
+            if name not in node_attributes and name not in self._node:
+                node_attributes[name] = {"component": Component(name, connected_component_names)}
+
+        for component_name, to_components, from_components, component_attributes in components:
+            component_name = component_name.strip()
+            stripped_to_components = []
+
+            # add out edges
+            if isinstance(to_components, list):
+                for to_component in to_components:
+                    stripped_to_components.append(to_component.strip())
+            component = Component(component_name, stripped_to_components)
+            node_attributes.setdefault(component_name, {})["component"] = component
+
+            if isinstance(from_components, list):
+                for from_component in from_components:
+                    from_component = from_component.strip()
+                    add_placeholder(from_component, [component_name])
+                    edges.append((from_component, component_name))
+                    get_component(from_component).connected_component_names.append(component_name)
+
+            if isinstance(to_components, list):
+                for to_component in stripped_to_components:
+                    add_placeholder(to_component, [])
+                    edges.append((component_name, to_component))
+
+            if isinstance(component_attributes, dict):
+                for attribute in component_attributes.keys():
+                    if "task_arguments" == attribute:
+                        continue
+                    elif "task" == attribute and "task_arguments" in component_attributes:
+                        if component_attributes["task"] not in self.mission_tasks:
+                            self.mission_tasks.append(component_attributes["task"])
+                        component.add_task(self.task_factory.create_task(component_attributes["task"], component_attributes["task_arguments"]))
+                    elif "system_name" == attribute:
+                        component.add_system_name(component_attributes["system_name"])
+                    else:
+                        node_attributes[component_name][attribute] = component_attributes[attribute]
+
+        for component_name in [component_name for component_name in node_attributes if component_name in self._node]:
+            replaced_task = self._node[component_name]["component"].task
+            if replaced_task is not None:
+                replaced_task.clear_forward_cache()
+            self._node[component_name].update(node_attributes.pop(component_name))
+        self.add_nodes_from(node_attributes.items())
+        self.add_edges_from(edges)
 
     def add_task_to_component(self, component_name: str, task_name: str, task_arguments: dict):
         """
-        Adds a task to an existing component
+        Adds a task to an existing component. The memoized forward result of any task it
+        replaces is cleared
 
         Args:
             component_name (str): The name of the component to update
@@ -148,7 +346,10 @@ class ComponentGraph(nx.DiGraph):
         if task_name not in self.mission_tasks:
             self.mission_tasks.append(task_name)
         new_task = self.task_factory.create_task(task_name, task_arguments)
-        self.nodes[component_name]["component"].add_task(new_task)
+        component = self.nodes[component_name]["component"]
+        if component.task is not None:
+            component.task.clear_forward_cache()
+        component.add_task(new_task)
 
     def add_new_edge(self, from_component: str, to_component: str):
         """
@@ -248,6 +449,21 @@ class ComponentGraph(nx.DiGraph):
                 return list(nx.get_node_attributes(self, "component").values())[index["ind"][0]]
         return None
 
+    def pyplot(self):
+        """
+        Imports matplotlib.pyplot on first use, so that simulating never pays for it
+
+        Returns:
+            The matplotlib.pyplot module
+
+        Raises:
+            RuntimeError: If the graph is headless
+        """
+        if self.headless:
+            raise RuntimeError("Plotting is not available in headless mode")
+        import matplotlib.pyplot as plt
+        return plt
+
     def networkx_visualization(self, show_and_save=True):
         """
         Creates a star graph visualization by utilizing networkx to plot
@@ -259,7 +475,11 @@ class ComponentGraph(nx.DiGraph):
 
         Returns:
             The created PyPlot figure
+
+        Raises:
+            RuntimeError: If the graph is headless
         """
+        plt = self.pyplot()
         self.fig, self.ax = plt.subplots(figsize=(6, 6))
         self.fig.subplots_adjust(right=3, top=3)
         self.pos = nx.spring_layout(
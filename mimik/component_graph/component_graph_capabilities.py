@@ -1,6 +1,18 @@
+import hashlib
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Union
 import networkx as nx
+import numpy as np
 from mimik.component_graph.component_graph import ComponentGraph
-from scipy.stats import bernoulli
+from mimik.component_graph.component_outcomes import ComponentOutcomes
+from mimik.component_graph.path_results import PathResults
+from mimik.component_graph.path_statistics import wilson_score
+from mimik.component_graph.path_summary import PathSummary
+from mimik.component_graph.samplers import get_sampler
+from mimik.component_graph.result_store import save_result_arrays, load_result_arrays
+from mimik.component_graph import monte_carlo_workers
 
 
 class ComponentGraphCapabilities:
@@ -12,10 +24,124 @@ class ComponentGraphCapabilities:
             graph (ComponentGraph): A networkx graph containing the nodal information
         """
         self.graph = graph
-        self.root_components = self.graph.get_start_components()
-        self.valid_paths = self.get_all_paths()
+        self.results_version = 0
+        self.clear_monte_carlo_results()
+        self.__path_results_cache: dict[tuple, tuple] = {}
+        self.__worker_pool: Optional[ProcessPoolExecutor] = None
+        self.__worker_pool_key: Optional[tuple] = None
+
+    @property
+    def root_components(self) -> list[str]:
+        """
+        The components starting a path in the graph
+        """
+        return self.graph.get_start_components()
+
+    @property
+    def valid_paths(self) -> list[list[str]]:
+        """
+        The paths of the graph, computed when first accessed and kept up to date by its path index
+        """
+        return self.get_all_paths()
+
+    def clear_monte_carlo_results(self):
+        """
+        Discards the results of the last Monte Carlo simulation, typically after the graph is mutated.
+        The results version is incremented so that statistics cached from the results are recomputed
+        """
+        self.results_version += 1
         self.__monte_carlo_outcomes = {}
         self.__monte_carlo_probabilities = {}
+        self.__monte_carlo_summaries = {}
+        self.__monte_carlo_seed = None
+
+    def save_monte_carlo_results(self, filename: str):
+        """
+        Saves the results of the last Monte Carlo simulation, tagged with the killweb's fingerprint
+        and the seed. Files ending in .npz are written as a single archive, while any other name is
+        written as a directory of .npy files which can be memory-mapped when loaded
+
+        Parameters:
+            filename (str): The .npz file or directory to save to
+
+        Raises:
+            ValueError: If there are no results to save
+        """
+        if len(self.__monte_carlo_summaries) == 0:
+            raise ValueError("There are no Monte Carlo results to save. Please run a simulation first")
+        path_ids = list(self.__monte_carlo_summaries)
+        summaries = [self.__monte_carlo_summaries[path_id] for path_id in path_ids]
+        manifest: dict = {
+            "killweb_fingerprint": self.graph.fingerprint(),
+            "seed": _encode_seed(self.__monte_carlo_seed),
+            "paths": [self.graph.path_index.get_path(path_id) for path_id in path_ids],
+            "outcomes": "none"
+        }
+        arrays = {
+            "num_iterations": np.array([summary.num_iterations for summary in summaries], dtype=np.int64),
+            "mean_successes": np.array([summary.mean_successes for summary in summaries]),
+            "sum_squared_deviations": np.array([summary.sum_squared_deviations for summary in summaries]),
+            "position_successes": np.concatenate([summary.position_successes for summary in summaries])
+        }
+        if isinstance(self.__monte_carlo_outcomes, ComponentOutcomes):
+            manifest["outcomes"] = "components"
+            manifest["component_names"] = list(self.__monte_carlo_outcomes.component_rows)
+            manifest["num_outcome_iterations"] = self.__monte_carlo_outcomes.num_iterations
+            arrays["packed_successes"] = self.__monte_carlo_outcomes.packed_successes
+        elif len(self.__monte_carlo_outcomes) > 0:
+            manifest["outcomes"] = "paths"
+            for index, path_id in enumerate(path_ids):
+                if path_id in self.__monte_carlo_outcomes:
+                    arrays["outcomes_%d" % index] = self.__monte_carlo_outcomes[path_id]
+                if path_id in self.__monte_carlo_probabilities:
+                    arrays["probabilities_%d" % index] = self.__monte_carlo_probabilities[path_id]
+        save_result_arrays(filename, manifest, arrays)
+
+    def load_monte_carlo_results(self, filename: str, memory_map=False, check_fingerprint=True):
+        """
+        Loads results saved by save_monte_carlo_results as the results of the last Monte Carlo
+        simulation, so metrics and plots can be produced without simulating again
+
+        Parameters:
+            filename (str): The .npz file or directory to load from
+            memory_map (bool): True if the outcome and probability arrays of a directory should be
+                memory-mapped rather than read into memory. Default is False
+            check_fingerprint (bool): True if the results must have been saved from a killweb with
+                the same components, tasks and edges. Default is True
+
+        Returns:
+            int: The seed of the loaded simulation, or None if it was not recorded
+
+        Raises:
+            ValueError: If the results were saved from a different killweb
+            KeyError: If a saved path is not a path of the killweb
+        """
+        manifest, arrays = load_result_arrays(filename, memory_map)
+        if check_fingerprint and manifest["killweb_fingerprint"] != self.graph.fingerprint():
+            raise ValueError("The results in %s were saved from a different killweb" % filename)
+        path_ids = [self.graph.path_index.get_path_id(path) for path in manifest["paths"]]
+        self.clear_monte_carlo_results()
+        offsets = np.cumsum([0] + [len(path) for path in manifest["paths"]])
+        for index, path_id in enumerate(path_ids):
+            self.__monte_carlo_summaries[path_id] = PathSummary.from_state(
+                arrays["num_iterations"][index],
+                arrays["mean_successes"][index],
+                arrays["sum_squared_deviations"][index],
+                arrays["position_successes"][offsets[index]:offsets[index + 1]]
+            )
+        if manifest["outcomes"] == "components":
+            paths = {path_id: path for path_id, path in zip(path_ids, manifest["paths"])}
+            self.__monte_carlo_outcomes = ComponentOutcomes(
+                manifest["component_names"], arrays["packed_successes"], manifest["num_outcome_iterations"], paths
+            )
+        elif manifest["outcomes"] == "paths":
+            for index, path_id in enumerate(path_ids):
+                if "outcomes_%d" % index in arrays:
+                    self.__monte_carlo_outcomes[path_id] = arrays["outcomes_%d" % index]
+                if "probabilities_%d" % index in arrays:
+                    self.__monte_carlo_probabilities[path_id] = arrays["probabilities_%d" % index]
+        self.__monte_carlo_seed = _decode_seed(manifest["seed"])
+        return self.__monte_carlo_seed
 
     def validate_graph(self, graph: ComponentGraph) -> bool:
         """
@@ -32,95 +158,878 @@ class ComponentGraphCapabilities:
                 return False
         return True
 
+    def __check_graph(self) -> bool:
+        """
+        Validates the graph before a simulation, explaining why it is not valid unless running silently
+
+        Returns:
+            bool: True if the graph has a task for each component
+        """
+        if self.validate_graph(self.graph):
+            return True
+        if not self.graph.silent:
+            print("ComponentGraph was not valid for creation of ComponentMetrics. Please ensure each component has an associated task complete with a task name and arguments")
+        return False
+
     def get_monte_carlo_outcomes(self):
         """
         Returns the outcome of the Monte Carlo simulation
 
         Returns:
-            dict: A dictionary mapping paths to arrays containing results
+            Mapping: A mapping of path strings to arrays holding the index of the first failed
+                component of each iteration, equal to the path length when the path succeeded
         """
-        return self.__monte_carlo_outcomes
+        return PathResults(self.__monte_carlo_outcomes, self.graph.path_index)
     
     def get_monte_carlo_probabilities(self):
         """
         Returns the probabilities derived from the Monte Carlo simulation
 
         Returns:
-            dict: A dictionary mapping paths to arrays containing path probabilities
+            Mapping: A mapping of path strings to float32 (iterations x path length) arrays containing
+                path probabilities. Empty if probabilities were not stored by the simulation
+        """
+        return PathResults(self.__monte_carlo_probabilities, self.graph.path_index)
+
+    def get_monte_carlo_summaries(self):
+        """
+        Returns the running summary statistics of the Monte Carlo simulation
+
+        Returns:
+            Mapping: A mapping of path strings to their PathSummary
+        """
+        return PathResults(self.__monte_carlo_summaries, self.graph.path_index)
+
+    def get_path_summaries(self) -> dict:
+        """
+        Returns the running summary statistics of the Monte Carlo simulation keyed by path ID
+
+        Returns:
+            dict: A dictionary mapping path IDs to their PathSummary
+        """
+        return self.__monte_carlo_summaries
+
+    def get_path_summary(self, path: list[str]) -> PathSummary:
+        """
+        Returns the running summary statistics of a single path
+
+        Parameters:
+            path (list[str]): The component names of the path
+
+        Returns:
+            PathSummary: The summary of the path
+
+        Raises:
+            KeyError: If the path was not simulated
+        """
+        return self.__monte_carlo_summaries[self.graph.path_index.get_path_id(path)]
+
+    def get_monte_carlo_seed(self):
+        """
+        Returns the entropy of the seed sequence used by the last Monte Carlo simulation
+
+        Returns:
+            int: The seed which reproduces the last simulation when passed to monte_carlo_simulation
         """
-        return self.__monte_carlo_probabilities
+        return self.__monte_carlo_seed
 
     def get_all_paths(self):
         """
         Gets a list of all paths in the killweb that are capable of accomplishing
-        each task
+        each task. Paths are only recomputed where the graph has changed since the last call
 
         Returns:
             list[str]: A list of paths resembling kill chains
         """
-        paths = []
-        for start_component in self.graph.get_start_components():
-            for end_component in self.graph.get_end_components():
-                simple_paths = nx.all_simple_paths(
-                    self.graph,
-                    source=start_component,
-                    target=end_component,
-                )
-                for path in simple_paths:
-                    paths.append(path)
-        return paths
+        return self.graph.get_all_paths()
+
+    def iter_paths(self):
+        """
+        Lazily iterates over the paths in the killweb, one at a time
+
+        Returns:
+            Iterator[list[str]]: An iterator over the paths resembling kill chains
+        """
+        return self.graph.iter_paths()
+
+    def count_paths(self) -> int:
+        """
+        Counts the paths in the killweb without enumerating them when the killweb is acyclic
+
+        Returns:
+            int: The number of paths
+        """
+        return self.graph.count_paths()
 
     def print_all_paths(self):
         """
         Prints all of the paths in the component graph
         """
-        for path in self.valid_paths:
-            print(self.__format_path_string(path))
-        print("\nThere are %d paths through the killweb" % len(self.valid_paths))
+        for path in self.iter_paths():
+            print(", ".join(path))
+        print("\nThere are %d paths through the killweb" % self.count_paths())
 
-    def monte_carlo_simulation(self, num_iterations: int):
+    def monte_carlo_simulation(self, num_iterations: int, vectorized=False, shared_components=False, workers=None, seed=None, store_probabilities=True, store_outcomes=True, sampler=None, paths=None, incremental=True):
         """
         Gets a list of success probabilities for each path and sorts them
 
+        Iterations are split into shards which each own a child of a single NumPy SeedSequence,
+        so a run with a given seed produces the same results for any number of workers. Each path's
+        seed is derived from its component names rather than its position, so its results do not
+        depend on which other paths are simulated
+
+        The results of each path are cached under a fingerprint of its components' tasks and the
+        run's configuration and seed. With incremental set, a repeated run reuses the cached results
+        of every path whose tasks are unchanged and only simulates the rest, which gives the same
+        results as simulating every path. The cache only holds the paths of the latest run, and is
+        only used by runs given an explicit seed, as an unseeded run draws fresh entropy
+
         Parameters:
             num_iterations (int): The number of times to calculate probability of a path
                 for an average
+            vectorized (bool): True if each component should draw all of its probabilities
+                at once through its task's forward_batch function. Default is False
+            shared_components (bool): True if each component should be sampled once per iteration
+                and shared by every path containing it. Outcomes are then stored as a bit-packed
+                success matrix and each path's outcomes are computed when accessed. Per-iteration
+                probabilities are not stored in this mode. Default is False
+            workers (int): The number of worker processes to shard the simulation across. The
+                pool is kept warm between calls. Default is None which runs in this process
+            seed (int): The seed of the simulation. Default is None which draws fresh entropy
+            store_probabilities (bool): True if the probability of each component in each iteration
+                should be stored. Default is True
+            store_outcomes (bool): True if the outcome of each iteration should be stored. When False,
+                only the running summary statistics of each path are kept, shard by shard, and no
+                probabilities are stored. Default is True
+            sampler (str or Sampler): The variance reduction strategy supplying the uniform variates of
+                each task and Bernoulli outcome, by name from samplers.SAMPLERS or as a Sampler object.
+                A sampler implies vectorized. Default is None which draws independent variates
+            paths (list[list[str]]): The paths to simulate, such as a shortlist from most_probable_paths.
+                Default is None which simulates every path
+            incremental (bool): True if cached results of unchanged paths should be reused. Only
+                runs with the same explicit seed can share results. Not used with shared_components.
+                Default is True
             
         Returns:
             The probability list of each simple path over num_iterations
+
+        Raises:
+            KeyError: If one of the given paths is not a path of the graph
         """
-        if self.validate_graph(self.graph):
-            self.__monte_carlo_outcomes = {}
-            self.__monte_carlo_probabilities = {}
-            for path in self.get_all_paths():
-                path_string = self.__format_path_string(path)
-                self.__monte_carlo_outcomes[path_string] = []
-                self.__monte_carlo_probabilities[path_string] = []
-                for _run_number in range(0, num_iterations):
-                    single_outcome = [0] * len(path)
-                    single_probability = [0] * len(path)
-                    for index, component_name in enumerate(path):
-                        component = self.graph.nodes[component_name]["component"]
-                        single_probability[index] = component.task.forward()
-                        if bernoulli.rvs(single_probability[index]) != 1:
-                            break
-                        single_outcome[index] = 1
-                    self.__monte_carlo_outcomes[path_string].append(single_outcome)
-                    self.__monte_carlo_probabilities[path_string].append(single_probability)
-        elif not self.graph.silent:
-            print("ComponentGraph was not valid for creation of ComponentMetrics. Please ensure each component has an associated task complete with a task name and arguments")
+        if self.__check_graph():
+            self.clear_monte_carlo_results()
+            seed_sequence = np.random.SeedSequence(seed)
+            self.__monte_carlo_seed = seed_sequence.entropy
+            if sampler is not None:
+                sampler = get_sampler(sampler)
+            if paths is None:
+                path_ids = self.graph.path_index.get_path_ids()
+            else:
+                path_ids = [self.graph.path_index.get_path_id(path) for path in paths]
+            if shared_components:
+                component_outcomes = self.__simulate_components(num_iterations, workers, sampler, seed_sequence, path_ids)
+                for path_id, path in component_outcomes.paths.items():
+                    self.__monte_carlo_summaries[path_id] = PathSummary.from_outcomes(component_outcomes[path_id], len(path))
+                if store_outcomes:
+                    self.__monte_carlo_outcomes = component_outcomes
+                return
+            store_probabilities = store_probabilities and store_outcomes
+            run_key = (
+                num_iterations, vectorized, store_probabilities, store_outcomes,
+                None if sampler is None else type(sampler).__qualname__, _hashable_entropy(seed_sequence.entropy), seed_sequence.spawn_key
+            )
+            task_fingerprints = {component_name: task.fingerprint() for component_name, task in self.__get_tasks().items()}
+            cached_results = self.__path_results_cache if incremental and seed is not None else {}
+            self.__path_results_cache = {}
+            cache_keys = {}
+            shard_path_ids = []
+            shards = []
+            for path_id in path_ids:
+                path = self.graph.path_index.get_path(path_id)
+                cache_key = (tuple(path), tuple(task_fingerprints[component_name] for component_name in path), run_key)
+                cache_keys[path_id] = cache_key
+                if cache_key in cached_results:
+                    self.__restore_path_results(path_id, cached_results[cache_key])
+                    continue
+                for shard_iterations, shard_seed in monte_carlo_workers.split_iterations(num_iterations, self.__path_seed(seed_sequence, path)):
+                    shard_path_ids.append(path_id)
+                    shards.append((path, shard_iterations, vectorized, store_probabilities, sampler, shard_seed))
+            path_outcomes: dict[int, list] = {}
+            path_probabilities: dict[int, list] = {}
+            self.__collect_path_shards(shard_path_ids, shards, workers, path_outcomes, path_probabilities, store_outcomes)
+            self.__store_path_results(path_outcomes, path_probabilities, store_probabilities)
+            for path_id, cache_key in cache_keys.items():
+                if path_id not in self.__monte_carlo_summaries:
+                    continue
+                self.__path_results_cache[cache_key] = (
+                    self.__monte_carlo_summaries[path_id],
+                    self.__monte_carlo_outcomes.get(path_id),
+                    self.__monte_carlo_probabilities.get(path_id)
+                )
 
-    def __format_path_string(self, path) -> str:
+    def adaptive_monte_carlo_simulation(
+        self,
+        tolerance: float,
+        confidence=0.95,
+        time_budget=None,
+        batch_size=1000,
+        max_iterations=1000000,
+        vectorized=True,
+        workers=None,
+        seed=None,
+        store_probabilities=True,
+        store_outcomes=True,
+        sampler=None
+    ):
         """
-        Formats the path string by removing unwanted characters
-        
+        Runs the Monte Carlo simulation in batches and retires each path once the Wilson
+        confidence interval of its probability of success is narrower than the tolerance.
+        Every batch of a path owns a child of the path's SeedSequence, so results are
+        reproducible for any number of workers
+
         Parameters:
-            path (Any): The path string to format
-        
+            tolerance (float): The target half-width of each path's confidence interval
+            confidence (float): The confidence level of the interval. Default is 0.95
+            time_budget (float): The number of seconds after which no further batches are started.
+                Default is None which places no limit on the wall-clock time
+            batch_size (int): The number of iterations simulated for each active path per batch.
+                Default is 1000
+            max_iterations (int): The number of iterations after which a path is retired even if
+                it has not converged. Default is 1000000
+            vectorized (bool): True if each component's probabilities should be drawn with its
+                task's forward_batch function. Default is True
+            workers (int): The number of worker processes to run batches across. Default is None
+            seed (int): The seed of the simulation. Default is None which draws fresh entropy
+            store_probabilities (bool): True if the probability of each component in each iteration
+                should be stored. Default is True
+            store_outcomes (bool): True if the outcome of each iteration should be stored. Default is True
+            sampler (str or Sampler): The variance reduction strategy of each batch. Default is None
+
         Returns:
-            The formatted path string
+            dict: A dictionary mapping path strings to the number of iterations used, or None if
+                the graph is not valid
+        """
+        if not self.__check_graph():
+            return None
+        start_time = time.perf_counter()
+        self.clear_monte_carlo_results()
+        seed_sequence = np.random.SeedSequence(seed)
+        self.__monte_carlo_seed = seed_sequence.entropy
+        store_probabilities = store_probabilities and store_outcomes
+        if sampler is not None:
+            sampler = get_sampler(sampler)
+        path_ids = self.graph.path_index.get_path_ids()
+        active_paths = [
+            (path_id, self.graph.path_index.get_path(path_id), path_seed)
+            for path_id, path_seed in zip(path_ids, seed_sequence.spawn(len(path_ids)))
+        ]
+        path_outcomes: dict[int, list] = {}
+        path_probabilities: dict[int, list] = {}
+        while len(active_paths) > 0:
+            shards = [
+                (path, min(batch_size, max_iterations - self.__completed_iterations(path_id)), vectorized, store_probabilities, sampler, path_seed.spawn(1)[0])
+                for path_id, path, path_seed in active_paths
+            ]
+            shard_path_ids = [path_id for path_id, _, _ in active_paths]
+            self.__collect_path_shards(shard_path_ids, shards, workers, path_outcomes, path_probabilities, store_outcomes)
+            active_paths = [
+                (path_id, path, path_seed) for path_id, path, path_seed in active_paths
+                if self.__completed_iterations(path_id) < max_iterations
+                and self.__wilson_half_width(self.__monte_carlo_summaries[path_id], confidence) > tolerance
+            ]
+            if time_budget is not None and time.perf_counter() - start_time >= time_budget:
+                break
+        self.__store_path_results(path_outcomes, path_probabilities, store_probabilities)
+        return {
+            self.graph.path_index.format_path(path_id): summary.num_iterations
+            for path_id, summary in self.__monte_carlo_summaries.items()
+        }
+
+    def mission_success_probability(
+        self,
+        num_iterations: int,
+        start_components=None,
+        end_components=None,
+        workers=None,
+        seed=None,
+        sampler=None
+    ) -> Optional[float]:
+        """
+        Estimates the probability that at least one kill chain from the start components to the
+        end components completes. Each component is sampled once per iteration, so components
+        shared between kill chains behave consistently, and reachability is propagated through
+        the graph in topological order with bitwise operations rather than by enumerating paths
+
+        Parameters:
+            num_iterations (int): The number of iterations to simulate
+            start_components (list[str]): The components a kill chain may start from, such as a set
+                of sensors. Default is None which uses every component starting a path
+            end_components (list[str]): The components a kill chain may end at, such as a set of
+                effectors. Default is None which uses every component ending a path
+            workers (int): The number of worker processes to sample components across. Default is None
+            seed (int): The seed of the simulation. Default is None which draws fresh entropy
+            sampler (str or Sampler): The variance reduction strategy of each component. Default is None
+
+        Returns:
+            float: The estimated probability of mission success, or None if the graph is not valid
+
+        Raises:
+            NetworkXUnfeasible: If the graph contains a cycle
         """
-        str_path = str(path)
-        for replace_chars in ['[', ", 'center'", ']', "'"]:
-            str_path = str_path.replace(replace_chars, "")
-        return str_path
\ No newline at end of file
+        if not self.__check_graph():
+            return None
+        start_components = set(self.graph.get_start_components() if start_components is None else start_components)
+        end_components = self.graph.get_end_components() if end_components is None else end_components
+        if sampler is not None:
+            sampler = get_sampler(sampler)
+        component_names, packed_successes = self.__sample_components(
+            num_iterations, workers, sampler, np.random.SeedSequence(seed)
+        )
+        component_rows = {component_name: row for row, component_name in enumerate(component_names)}
+        reached = {}
+        for component_name in nx.topological_sort(self.graph):
+            if component_name in start_components:
+                reached[component_name] = packed_successes[component_rows[component_name]]
+                continue
+            reached_from = np.zeros(packed_successes.shape[1], dtype=np.uint8)
+            for predecessor in self.graph.predecessors(component_name):
+                reached_from |= reached[predecessor]
+            reached[component_name] = reached_from & packed_successes[component_rows[component_name]]
+        mission_successes = np.zeros(packed_successes.shape[1], dtype=np.uint8)
+        for component_name in end_components:
+            mission_successes |= reached[component_name]
+        return int(np.unpackbits(mission_successes, count=num_iterations).sum()) / num_iterations
+
+    def importance_sampling_simulation(self, num_iterations: int, tilt=None, workers=None, seed=None):
+        """
+        Estimates the probability of success and of failure of every path with importance sampling,
+        which lets rare-success and rare-failure paths be ranked with far fewer iterations than the
+        naive simulation. Component probabilities p are tilted to p ** tilt and each iteration is
+        reweighted by its likelihood ratio, so the estimates remain unbiased. An estimate can exceed 1
+        by chance, so the reported probabilities are clipped to [0, 1] while the relative errors are
+        computed from the unclipped estimates
+
+        Parameters:
+            num_iterations (int): The number of iterations of each path
+            tilt (float): The exponent applied to each component's probability. Default is None which
+                chooses, for each path, the tilt making its expected probability of success 0.5
+            workers (int): The number of worker processes to run the simulation across. Default is None
+            seed (int): The seed of the simulation. Default is None which draws fresh entropy
+
+        Returns:
+            dict: A dictionary mapping path strings to a dictionary of the estimated "probability" of
+                success, its "relative_error", the estimated "failure_probability", its
+                "failure_relative_error" and the "tilt" used. None if the graph is not valid
+        """
+        if not self.__check_graph():
+            return None
+        seed_sequence = np.random.SeedSequence(seed)
+        if tilt is None:
+            expected_probabilities = self.expected_component_probabilities(seed=int(seed_sequence.generate_state(1)[0]))
+        path_ids = self.graph.path_index.get_path_ids()
+        paths = [self.graph.path_index.get_path(path_id) for path_id in path_ids]
+        path_tilts = []
+        for path in paths:
+            path_tilt = tilt
+            if path_tilt is None:
+                expected_probability = np.prod([expected_probabilities[component_name] for component_name in path])
+                path_tilt = np.log(0.5) / np.log(expected_probability) if 0 < expected_probability < 1 else 1.0
+            path_tilts.append(float(path_tilt))
+        shard_path_ids = []
+        shards = []
+        for path_id, path, path_tilt, path_seed in zip(path_ids, paths, path_tilts, seed_sequence.spawn(len(paths))):
+            for shard_iterations, shard_seed in monte_carlo_workers.split_iterations(num_iterations, path_seed):
+                shard_path_ids.append(path_id)
+                shards.append((path, shard_iterations, path_tilt, shard_seed))
+        results = self.__run_shards(
+            monte_carlo_workers.simulate_importance_shard, monte_carlo_workers.run_importance_shard, shards, workers
+        )
+        weighted_sums: dict[int, np.ndarray] = {}
+        for path_id, shard_sums in zip(shard_path_ids, results):
+            weighted_sums[path_id] = weighted_sums.get(path_id, 0) + shard_sums
+        estimates = {}
+        for path_id, path_tilt in zip(path_ids, path_tilts):
+            success_sum, success_squares, failure_sum, failure_squares = weighted_sums[path_id] / num_iterations
+            estimates[self.graph.path_index.format_path(path_id)] = {
+                "probability": float(np.clip(success_sum, 0, 1)),
+                "relative_error": self.__relative_error(success_sum, success_squares, num_iterations),
+                "failure_probability": float(np.clip(failure_sum, 0, 1)),
+                "failure_relative_error": self.__relative_error(failure_sum, failure_squares, num_iterations),
+                "tilt": path_tilt
+            }
+        return estimates
+
+    def __relative_error(self, mean: float, mean_square: float, num_iterations: int) -> float:
+        """
+        Computes the relative error of a Monte Carlo estimate
+
+        Parameters:
+            mean (float): The mean of the weighted indicators
+            mean_square (float): The mean of the squared weighted indicators
+            num_iterations (int): The number of iterations
+
+        Returns:
+            float: The standard error of the estimate divided by the estimate, or infinity if the
+                estimate is 0
+        """
+        if mean == 0:
+            return float("inf")
+        return float(np.sqrt(max(mean_square - mean ** 2, 0) / num_iterations) / mean)
+
+    def __completed_iterations(self, path_id: int) -> int:
+        """
+        Gets the number of iterations simulated so far for a path
+
+        Parameters:
+            path_id (int): The ID of the path to check
+
+        Returns:
+            int: The number of iterations held by the path's summary
+        """
+        summary = self.__monte_carlo_summaries.get(path_id)
+        return 0 if summary is None else summary.num_iterations
+
+    def __wilson_half_width(self, summary: PathSummary, confidence: float) -> float:
+        """
+        Computes the half-width of the Wilson score interval of a path's probability of success
+
+        Parameters:
+            summary (PathSummary): The summary of the path
+            confidence (float): The confidence level of the interval
+
+        Returns:
+            float: The half-width of the interval
+        """
+        return float(wilson_score(summary.proportion_complete(), summary.num_iterations, confidence)[1])
+
+    def __collect_path_shards(self, shard_path_ids: list[int], shards: list[tuple], workers: int, path_outcomes: dict, path_probabilities: dict, store_outcomes: bool):
+        """
+        Runs path shards and adds each result to the summary of its path as it completes
+
+        Parameters:
+            shard_path_ids (list[int]): The ID of the path of each shard
+            shards (list[tuple]): The arguments of each path shard
+            workers (int): The number of worker processes, or None to run in this process
+            path_outcomes (dict): A dictionary of path IDs to lists of outcome arrays to append to
+            path_probabilities (dict): A dictionary of path IDs to lists of probability arrays to append to
+            store_outcomes (bool): True if the outcome arrays should be kept
+        """
+        results = self.__run_shards(
+            monte_carlo_workers.simulate_path_shard, monte_carlo_workers.run_path_shard, shards, workers
+        )
+        for path_id, shard, (outcomes, probabilities) in zip(shard_path_ids, shards, results):
+            if path_id not in self.__monte_carlo_summaries:
+                self.__monte_carlo_summaries[path_id] = PathSummary(len(shard[0]))
+            self.__monte_carlo_summaries[path_id].update(outcomes)
+            if store_outcomes:
+                path_outcomes.setdefault(path_id, []).append(outcomes)
+                path_probabilities.setdefault(path_id, []).append(probabilities)
+
+    def __path_seed(self, seed_sequence: np.random.SeedSequence, path: list[str]) -> np.random.SeedSequence:
+        """
+        Derives the seed sequence of a path from the simulation's seed sequence and the path's
+        component names, so that it does not depend on the path's position among the paths
+
+        Parameters:
+            seed_sequence (np.random.SeedSequence): The seed sequence of the simulation
+            path (list[str]): The component names of the path
+
+        Returns:
+            np.random.SeedSequence: The seed sequence owned by the path
+        """
+        path_key = int.from_bytes(hashlib.sha256(json.dumps(path).encode()).digest()[:8], "little")
+        return np.random.SeedSequence(seed_sequence.entropy, spawn_key=seed_sequence.spawn_key + (path_key,))
+
+    def __restore_path_results(self, path_id: int, cached_result: tuple):
+        """
+        Stores the cached results of a path as the results of the current simulation
+
+        Parameters:
+            path_id (int): The ID of the path
+            cached_result (tuple): The path's PathSummary, outcomes and probabilities, where the
+                outcomes and probabilities may be None
+        """
+        summary, outcomes, probabilities = cached_result
+        self.__monte_carlo_summaries[path_id] = summary
+        if outcomes is not None:
+            self.__monte_carlo_outcomes[path_id] = outcomes
+        if probabilities is not None:
+            self.__monte_carlo_probabilities[path_id] = probabilities
+
+    def __store_path_results(self, path_outcomes: dict, path_probabilities: dict, store_probabilities: bool):
+        """
+        Concatenates the collected shard arrays of each path into the stored results
+
+        Parameters:
+            path_outcomes (dict): A dictionary of path IDs to lists of outcome arrays
+            path_probabilities (dict): A dictionary of path IDs to lists of probability arrays
+            store_probabilities (bool): True if the probability arrays should be stored
+        """
+        for path_id, outcomes in path_outcomes.items():
+            self.__monte_carlo_outcomes[path_id] = np.concatenate(outcomes)
+            if store_probabilities:
+                self.__monte_carlo_probabilities[path_id] = np.concatenate(path_probabilities[path_id])
+
+    def parameter_sweep(self, scenarios: list[dict], num_iterations: int, vectorized=True, workers=None, seed=None, sampler=None, paths=None) -> Optional[dict]:
+        """
+        Simulates the paths of the graph under many scenarios of task arguments in one batched run.
+        The graph and its paths are left unchanged, and each scenario only swaps the tasks of the
+        components it names for tasks created with the overridden arguments. Every (scenario, path)
+        pair is split into shards which are run together across the worker pool
+
+        Each path uses the same seed in every scenario, so scenarios are compared under common
+        random numbers and differences between them are not masked by sampling noise. The results
+        of the last Monte Carlo simulation are not affected
+
+        Parameters:
+            scenarios (list[dict]): The scenarios to simulate, each a dictionary mapping component
+                names to the task arguments that override their tasks' arguments
+            num_iterations (int): The number of iterations of each path in each scenario
+            vectorized (bool): True if each component's probabilities should be drawn with its
+                task's forward_batch function. Default is True
+            workers (int): The number of worker processes. Default is None which runs in this process
+            seed (int): The seed of the sweep. Default is None which draws fresh entropy
+            sampler (str or Sampler): The variance reduction strategy. Default is None
+            paths (list[list[str]]): The paths to simulate. Default is None which simulates every path
+
+        Returns:
+            dict: A tidy table of one row per scenario and path, as a dictionary of the columns
+                "scenario", "path", "num_iterations", "probability" and "average_num_success",
+                or None if the graph is not valid
+
+        Raises:
+            KeyError: If a scenario names a component that is not in the graph, or one of the given
+                paths is not a path of the graph
+        """
+        if not self.__check_graph():
+            return None
+        seed_sequence = np.random.SeedSequence(seed)
+        if sampler is not None:
+            sampler = get_sampler(sampler)
+        if paths is None:
+            path_ids = self.graph.path_index.get_path_ids()
+        else:
+            path_ids = [self.graph.path_index.get_path_id(path) for path in paths]
+        base_tasks = self.__get_tasks()
+        tasks = {}
+        for scenario, task_arguments in enumerate(scenarios):
+            for component_name, task in base_tasks.items():
+                tasks[(scenario, component_name)] = task
+            for component_name, arguments in task_arguments.items():
+                task = base_tasks[component_name]
+                tasks[(scenario, component_name)] = self.graph.task_factory.create_task(
+                    task.task_name, dict(task.task_arguments, **arguments)
+                )
+        shard_keys = []
+        shards = []
+        for path_id in path_ids:
+            path = self.graph.path_index.get_path(path_id)
+            for scenario in range(len(scenarios)):
+                path_seed = self.__path_seed(seed_sequence, path)
+                for shard_iterations, shard_seed in monte_carlo_workers.split_iterations(num_iterations, path_seed):
+                    shard_keys.append((scenario, path_id))
+                    shards.append((scenario, path, shard_iterations, vectorized, sampler, shard_seed))
+        results = self.__run_shards(
+            monte_carlo_workers.simulate_scenario_shard, monte_carlo_workers.run_scenario_shard, shards, workers, tasks
+        )
+        summaries: dict[tuple[int, int], PathSummary] = {}
+        for shard_key, summary in zip(shard_keys, results):
+            if shard_key in summaries:
+                summaries[shard_key].merge(summary)
+            else:
+                summaries[shard_key] = summary
+        rows = sorted(summaries, key=lambda shard_key: shard_key[0])
+        return {
+            "scenario": np.array([scenario for scenario, _ in rows], dtype=np.int64),
+            "path": [self.graph.path_index.format_path(path_id) for _, path_id in rows],
+            "num_iterations": np.array([summaries[row].num_iterations for row in rows], dtype=np.int64),
+            "probability": np.array([summaries[row].proportion_complete() for row in rows]),
+            "average_num_success": np.array([summaries[row].average_num_success() for row in rows])
+        }
+
+    def task_scenarios(self, task_name: str, argument_grid: list[dict]) -> list[dict]:
+        """
+        Creates parameter sweep scenarios which apply each point of a grid of task arguments to
+        every component whose task has the given name
+
+        Parameters:
+            task_name (str): The name of the task whose arguments are swept
+            argument_grid (list[dict]): The task arguments overridden in each scenario
+
+        Returns:
+            list[dict]: The scenarios, in the order of argument_grid, for parameter_sweep
+        """
+        component_names = [
+            component_name for component_name, task in self.__get_tasks().items()
+            if task is not None and task.task_name == task_name
+        ]
+        return [{component_name: dict(arguments) for component_name in component_names} for arguments in argument_grid]
+
+    def expected_component_probabilities(self, num_samples=10000, seed=None) -> dict:
+        """
+        Computes the expected probability of every component. Deterministic tasks are evaluated
+        exactly with a single forward call, while stochastic tasks are averaged over num_samples
+        probabilities drawn with forward_batch
+
+        Parameters:
+            num_samples (int): The number of probabilities to average for stochastic tasks.
+                Default is 10000
+            seed (int): The seed used while sampling stochastic tasks. Default is None
+
+        Returns:
+            dict: A dictionary mapping component names to their expected probability
+        """
+        expected_probabilities = {}
+        global_state = np.random.get_state()
+        np.random.seed(np.random.SeedSequence(seed).generate_state(4))
+        try:
+            for component_name, task in self.__get_tasks().items():
+                if task.is_pure():
+                    expected_probabilities[component_name] = float(task.cached_forward())
+                elif task.is_deterministic():
+                    expected_probabilities[component_name] = float(task.forward())
+                else:
+                    expected_probabilities[component_name] = float(np.mean(task.forward_batch(num_samples)))
+        finally:
+            np.random.set_state(global_state)
+        return expected_probabilities
+
+    def analytic_path_statistics(self, num_samples=10000, seed=None):
+        """
+        Computes the probability of success, expected number of successful events and variance
+        of every path in closed form. As each component draws its probability independently,
+        the probability of reaching the j-th component of a path is the product of the expected
+        probabilities of the first j components. Paths made only of deterministic tasks are
+        therefore exact and sampling is only used for stochastic components
+
+        Parameters:
+            num_samples (int): The number of probabilities to average for stochastic tasks.
+                Default is 10000
+            seed (int): The seed used while sampling stochastic tasks. Default is None
+
+        Returns:
+            A tuple of three dictionaries mapping path strings to their probability of success,
+            sorted in ascending order, their expected number of successful events, and the variance
+            of their completion. None if the graph is not valid
+        """
+        if not self.__check_graph():
+            return None
+        expected_probabilities = self.expected_component_probabilities(num_samples, seed)
+        probability_of_success = {}
+        expected_success_events = {}
+        completion_variance = {}
+        for path in self.iter_paths():
+            path_string = ", ".join(path)
+            reach_probabilities = np.cumprod([expected_probabilities[component_name] for component_name in path])
+            probability_of_success[path_string] = float(reach_probabilities[-1])
+            expected_success_events[path_string] = float(np.sum(reach_probabilities))
+            completion_variance[path_string] = probability_of_success[path_string] * (1 - probability_of_success[path_string])
+        probability_of_success = {k: v for k, v in sorted(probability_of_success.items(), key=lambda item: item[1])}
+        return probability_of_success, expected_success_events, completion_variance
+
+    def most_probable_paths(self, k: int, min_probability=None, num_samples=10000, seed=None) -> Optional[list[tuple]]:
+        """
+        Finds the k most probable paths without enumerating every path. Each component is weighted
+        by the negative log of its expected probability, which makes the most probable paths the
+        shortest paths between a super source joined to every start component and a super sink
+        joined from every end component. These are found in order with Yen's k-shortest simple paths
+        search, so the result can be confirmed by passing the paths to monte_carlo_simulation
+
+        Parameters:
+            k (int): The number of paths to find
+            min_probability (float): The probability below which paths are not returned. Components
+                below it are pruned before the search. Default is None
+            num_samples (int): The number of probabilities to average for stochastic tasks.
+                Default is 10000
+            seed (int): The seed used while sampling stochastic tasks. Default is None
+
+        Returns:
+            list[tuple]: Up to k (path, probability) tuples in descending order of probability, or
+                None if the graph is not valid
+        """
+        if not self.__check_graph():
+            return None
+        expected_probabilities = self.expected_component_probabilities(num_samples, seed)
+        min_probability = 0.0 if min_probability is None else min_probability
+        weights = {
+            component_name: -np.log(probability)
+            for component_name, probability in expected_probabilities.items()
+            if probability > 0 and probability >= min_probability
+        }
+        source, sink = object(), object()
+        search_graph = nx.DiGraph()
+        search_graph.add_weighted_edges_from(
+            (from_component, to_component, weights[to_component])
+            for from_component, to_component in self.graph.edges
+            if from_component in weights and to_component in weights
+        )
+        search_graph.add_weighted_edges_from(
+            (source, component_name, weights[component_name])
+            for component_name in self.graph.get_start_components() if component_name in weights
+        )
+        search_graph.add_weighted_edges_from(
+            (component_name, sink, 0.0)
+            for component_name in self.graph.get_end_components() if component_name in weights
+        )
+        most_probable: list[tuple] = []
+        if k <= 0 or source not in search_graph or sink not in search_graph:
+            return most_probable
+        try:
+            for path in nx.shortest_simple_paths(search_graph, source, sink, weight="weight"):
+                path = path[1:-1]
+                probability = float(np.prod([expected_probabilities[component_name] for component_name in path]))
+                if probability < min_probability:
+                    break
+                most_probable.append((path, probability))
+                if len(most_probable) == k:
+                    break
+        except nx.NetworkXNoPath:
+            pass
+        return most_probable
+
+    def detect_pure_tasks(self, num_probes=3) -> list[str]:
+        """
+        Probes every task that has not declared whether it is pure and marks the tasks found to be
+        deterministic as pure, so their forward results are computed once and broadcast by the
+        simulations. Tasks whose stochastic forward returns few distinct values, such as sampled
+        0 or 1 outcomes, can be mistaken for deterministic and should declare pure = False
+
+        Parameters:
+            num_probes (int): The number of times to call forward on each task. Default is 3
+
+        Returns:
+            list[str]: The names of the components whose tasks were marked as pure
+        """
+        pure_components = []
+        for component_name, task in self.__get_tasks().items():
+            if task.pure is None and not task.is_pure() and task.is_deterministic(num_probes):
+                task.pure = True
+                pure_components.append(component_name)
+        return pure_components
+
+    def shutdown_workers(self):
+        """
+        Shuts down the warm worker pool, if one was created by monte_carlo_simulation
+        """
+        if self.__worker_pool is not None:
+            self.__worker_pool.shutdown()
+            self.__worker_pool = None
+            self.__worker_pool_key = None
+
+    def __get_tasks(self) -> dict:
+        """
+        Gets the task of every component in the graph
+
+        Returns:
+            dict: A dictionary mapping component names to their tasks
+        """
+        return {component_name: self.graph.nodes[component_name]["component"].task for component_name in self.graph.nodes}
+
+    def __run_shards(self, simulate_shard, run_shard, shards: list[tuple], workers: int, tasks=None):
+        """
+        Runs simulation shards in this process or across the warm worker pool
+
+        The worker pool is created once per set of tasks and worker count. Tasks replaced through
+        the ComponentGraph cause the pool to be recreated, while tasks mutated in place require
+        shutdown_workers to be called first
+
+        Parameters:
+            simulate_shard (Callable): The shard function taking the tasks as its first argument
+            run_shard (Callable): The equivalent shard function to call within a worker process
+            shards (list[tuple]): The arguments of each shard
+            workers (int): The number of worker processes, or None to run in this process
+            tasks (dict): The tasks passed to the shard functions. Default is None which uses the
+                task of every component in the graph
+
+        Returns:
+            Iterator: The result of each shard, in the order of shards, yielded as they complete
+        """
+        if tasks is None:
+            tasks = self.__get_tasks()
+        if workers is None or workers <= 1:
+            return (simulate_shard(tasks, *shard) for shard in shards)
+        pool_key = (workers, tuple((component_name, id(task), task.is_pure()) for component_name, task in tasks.items()))
+        if self.__worker_pool is None or self.__worker_pool_key != pool_key:
+            self.shutdown_workers()
+            self.__worker_pool = monte_carlo_workers.create_worker_pool(tasks, workers)
+            self.__worker_pool_key = pool_key
+        return self.__worker_pool.map(run_shard, *zip(*shards), chunksize=max(1, len(shards) // (4 * workers)))
+
+    def __simulate_components(self, num_iterations: int, workers: int, sampler, seed_sequence: np.random.SeedSequence, path_ids: list[int]) -> ComponentOutcomes:
+        """
+        Samples each component once per iteration into a bit-packed success matrix
+
+        Parameters:
+            num_iterations (int): The number of iterations to simulate
+            workers (int): The number of worker processes, or None to run in this process
+            sampler (Sampler): The sampling strategy of each component, or None
+            seed_sequence (np.random.SeedSequence): The seed sequence of the simulation
+            path_ids (list[int]): The IDs of the paths whose outcomes are evaluated
+
+        Returns:
+            ComponentOutcomes: The lazily evaluated outcomes of the paths
+        """
+        component_names, packed_successes = self.__sample_components(num_iterations, workers, sampler, seed_sequence)
+        paths = {path_id: self.graph.path_index.get_path(path_id) for path_id in path_ids}
+        return ComponentOutcomes(component_names, packed_successes, num_iterations, paths)
+
+    def __sample_components(self, num_iterations: int, workers: int, sampler, seed_sequence: np.random.SeedSequence):
+        """
+        Samples each component of the graph once per iteration
+
+        Parameters:
+            num_iterations (int): The number of iterations to simulate
+            workers (int): The number of worker processes, or None to run in this process
+            sampler (Sampler): The sampling strategy of each component, or None
+            seed_sequence (np.random.SeedSequence): The seed sequence of the simulation
+
+        Returns:
+            A tuple of the component names and their (components x iterations) success matrix,
+            packed along the iteration axis with np.packbits
+        """
+        component_names = list(self.graph.nodes)
+        shards = [
+            (component_name, shard_iterations, sampler, shard_seed)
+            for component_name, component_seed in zip(component_names, seed_sequence.spawn(len(component_names)))
+            for shard_iterations, shard_seed in monte_carlo_workers.split_iterations(num_iterations, component_seed)
+        ]
+        results = self.__run_shards(
+            monte_carlo_workers.simulate_component_shard, monte_carlo_workers.run_component_shard, shards, workers
+        )
+        packed_successes = np.empty((len(component_names), (num_iterations + 7) // 8), dtype=np.uint8)
+        rows: dict[str, list] = {}
+        for shard, packed_shard in zip(shards, results):
+            rows.setdefault(shard[0], []).append(packed_shard)
+        for row, component_name in enumerate(component_names):
+            packed_successes[row] = np.concatenate(rows.get(component_name, [packed_successes[row, :0]]))
+        return component_names, packed_successes
+
+
+def _hashable_entropy(entropy):
+    """
+    Converts the entropy of a seed sequence, which may be a list of integers, into a hashable value
+    """
+    return tuple(entropy) if isinstance(entropy, (list, tuple, np.ndarray)) else entropy
+
+
+def _encode_seed(seed) -> Optional[Union[str, list[str]]]:
+    """
+    Encodes the entropy of a seed sequence for a JSON manifest. Integers are stored as strings
+    so that 128 bit entropy survives JSON readers limited to 64 bit integers
+    """
+    if seed is None:
+        return None
+    if isinstance(seed, (list, tuple, np.ndarray)):
+        return [str(value) for value in seed]
+    return str(seed)
+
+
+def _decode_seed(seed):
+    """
+    Decodes the entropy of a seed sequence stored by _encode_seed
+    """
+    if seed is None:
+        return None
+    if isinstance(seed, list):
+        return [int(value) for value in seed]
+    return int(seed)
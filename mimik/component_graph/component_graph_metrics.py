@@ -1,10 +1,11 @@
-import matplotlib.pyplot as plt
 import numpy as np
 import copy
 import os
 import math
+from typing import Optional
 import networkx as nx
 from mimik.component_graph.component_graph_capabilities import ComponentGraphCapabilities
+from mimik.component_graph.path_statistics import PathStatistics
 
 
 class ComponentGraphMetrics:
@@ -16,7 +17,10 @@ class ComponentGraphMetrics:
             capabilities (ComponentGraphCapabilities): The capabilities object associated with a ComponentGraph
         """
         self.capabilities = capabilities
-        
+        self.__path_statistics: Optional[PathStatistics] = None
+        self.__stats_of_paths: Optional[tuple[dict[str, float], dict[str, float]]] = None
+        self.__results_version: Optional[int] = None
+
     def calc_stats_of_paths(self):
         """
         Calculates the probability of success for each path after Monte Carlo sim
@@ -24,18 +28,80 @@ class ComponentGraphMetrics:
         Returns:
             A dictionary of probabilities
         """
-        if len(self.capabilities.get_monte_carlo_outcomes()) == 0:
+        if len(self.capabilities.get_path_summaries()) == 0:
+            print("Please run the monte_carlo_simulation function before as this function utilizes those results.")
+            return
+        statistics = self.get_path_statistics()
+        if self.__stats_of_paths is None:
+            probability_of_success = {}
+            average_success_events = {}
+            for path_id, path_probability, path_average in statistics.sort_by_probability().rows():
+                path_string = self.capabilities.graph.path_index.format_path(path_id)
+                probability_of_success[path_string] = path_probability
+                average_success_events[path_string] = path_average
+            self.__stats_of_paths = (probability_of_success, average_success_events)
+        return dict(self.__stats_of_paths[0]), dict(self.__stats_of_paths[1])
+
+    def get_path_statistics(self) -> PathStatistics:
+        """
+        Gets the statistics of every simulated path as a columnar table. The table is computed
+        once per simulation and reused until the capabilities' results change
+
+        Returns:
+            PathStatistics: The probability of success and average number of successful events of
+                every path, in simulation order
+        """
+        if self.__path_statistics is None or self.__results_version != self.capabilities.results_version:
+            self.__path_statistics = PathStatistics.from_summaries(self.capabilities.get_path_summaries())
+            self.__stats_of_paths = None
+            self.__results_version = self.capabilities.results_version
+        return self.__path_statistics
+
+    def calc_confidence_intervals_of_paths(self, confidence=0.95, method="wilson"):
+        """
+        Calculates a confidence interval of the probability of success of each path after Monte Carlo sim
+
+        Parameters:
+            confidence (float): The confidence level of the intervals. Default is 0.95
+            method (str): Either "wilson" or "clopper-pearson". Default is "wilson"
+
+        Returns:
+            A dictionary mapping path strings to the (lower, upper) bounds of their intervals
+        """
+        if len(self.capabilities.get_path_summaries()) == 0:
             print("Please run the monte_carlo_simulation function before as this function utilizes those results.")
             return
-        
-        probability_of_success = {}
-        average_success_events = {}
-        for path in self.capabilities.get_monte_carlo_outcomes().keys():
-            probability_of_success[path] = self.proportion_complete(path.split(", "))
-            average_success_events[path] = self.average_num_success(path.split(", "))
-        probability_of_success = {k: v for k, v in sorted(probability_of_success.items(), key=lambda item: item[1])}
-        return probability_of_success, average_success_events
-        
+        statistics = self.get_path_statistics()
+        return self.__format_intervals(statistics, *statistics.probability_intervals(confidence, method))
+
+    def bootstrap_average_num_success(self, num_resamples=1000, confidence=0.95, seed=None):
+        """
+        Calculates a bootstrap confidence interval of the average number of successful events of
+        each path after Monte Carlo sim
+
+        Parameters:
+            num_resamples (int): The number of bootstrap resamples of each path. Default is 1000
+            confidence (float): The confidence level of the intervals. Default is 0.95
+            seed (int): The seed of the resampling. Default is None
+
+        Returns:
+            A dictionary mapping path strings to the (lower, upper) bounds of their intervals
+        """
+        if len(self.capabilities.get_path_summaries()) == 0:
+            print("Please run the monte_carlo_simulation function before as this function utilizes those results.")
+            return
+        statistics = self.get_path_statistics()
+        return self.__format_intervals(statistics, *statistics.bootstrap_average_successes(num_resamples, confidence, seed))
+
+    def __format_intervals(self, statistics: PathStatistics, lower: np.ndarray, upper: np.ndarray) -> dict:
+        """
+        Keys the intervals of every path by the path's string
+        """
+        path_index = self.capabilities.graph.path_index
+        return {
+            path_index.format_path(path_id): (path_lower, path_upper)
+            for path_id, path_lower, path_upper in zip(statistics.path_ids.tolist(), lower.tolist(), upper.tolist())
+        }
 
     def print_probability_of_paths(self, print_top_n_paths=None, selected_component=None):
         """
@@ -48,15 +114,18 @@ class ComponentGraphMetrics:
         Returns:
             The probability list of each simple path
         """
-        if len(self.capabilities.get_monte_carlo_outcomes()) == 0:
+        if len(self.capabilities.get_path_summaries()) == 0:
             print("Please run the monte_carlo_simulation function before as this function utilizes those results.")
             return
-        probability_of_success, average_success_events = self.calc_stats_of_paths()
-        count = 0
-        for path in reversed(probability_of_success.keys()):
-            if (print_top_n_paths is None or count < print_top_n_paths) and (selected_component is None or selected_component in path):
-                print("Path: %s\n\tProbability of Success: %s\n\tAverage Number of Successful Events: %s" % (path, str(probability_of_success[path]), str(average_success_events[path])))
-            count += 1
+        path_index = self.capabilities.graph.path_index
+        statistics = self.get_path_statistics()
+        if print_top_n_paths is None:
+            statistics = statistics.sort_by_probability().take(slice(None, None, -1))
+        else:
+            statistics = statistics.top_n(print_top_n_paths)
+        for path_id, path_probability, path_average in statistics.rows():
+            if selected_component is None or selected_component in path_index.get_path(path_id):
+                print("Path: %s\n\tProbability of Success: %s\n\tAverage Number of Successful Events: %s" % (path_index.format_path(path_id), str(path_probability), str(path_average)))
 
     def proportion_complete(self, path: list[str]) -> float:
         """
@@ -68,11 +137,10 @@ class ComponentGraphMetrics:
         Returns:
             The proportion of times the path succeed to when it doesn't
         """
-        if len(self.capabilities.get_monte_carlo_outcomes()) == 0:
+        if len(self.capabilities.get_path_summaries()) == 0:
             print("Please run the monte_carlo_simulation function before as this function utilizes those results.")
             return
-        monte_carlo_array = np.array(self.capabilities.get_monte_carlo_outcomes()[self.convert_path_to_string(path)])
-        return np.sum(monte_carlo_array[:, -1]) / monte_carlo_array.shape[0]
+        return self.capabilities.get_path_summary(path).proportion_complete()
 
     def average_num_success(self, path: list[str]) -> float:
         """
@@ -84,11 +152,10 @@ class ComponentGraphMetrics:
         Returns:
             The average number of successful components within the path
         """
-        if len(self.capabilities.get_monte_carlo_outcomes()) == 0:
+        if len(self.capabilities.get_path_summaries()) == 0:
             print("Please run the monte_carlo_simulation function before as this function utilizes those results.")
             return
-        monte_carlo_array = np.array(self.capabilities.get_monte_carlo_outcomes()[self.convert_path_to_string(path)])
-        return np.sum(monte_carlo_array) / monte_carlo_array.shape[0]
+        return self.capabilities.get_path_summary(path).average_num_success()
 
     def calculate_variance(self, path: list[str]) -> float:
         """
@@ -100,11 +167,10 @@ class ComponentGraphMetrics:
         Returns:
             float: The variance of the monte carlo outcomes
         """
-        if len(self.capabilities.get_monte_carlo_outcomes()) == 0:
+        if len(self.capabilities.get_path_summaries()) == 0:
             print("Please run the monte_carlo_simulation function before as this function utilizes those results.")
             return
-        string_path = self.capabilities.get_monte_carlo_outcomes()[self.convert_path_to_string(path)]
-        return np.var([path_result[-1] for path_result in list(string_path)])
+        return self.capabilities.get_path_summary(path).completion_variance()
 
     def plot_MC_distribution(self, path: list[str]):
         """
@@ -114,11 +180,11 @@ class ComponentGraphMetrics:
             path (list[str]): The path whose components are to be plotted with respect
                 to their distribution of successful events
         """
-        if len(self.capabilities.get_monte_carlo_outcomes()) == 0:
+        if len(self.capabilities.get_path_summaries()) == 0:
             print("Please run the monte_carlo_simulation function before as this function utilizes those results.")
             return
-        monte_carlo_array = np.array(self.capabilities.get_monte_carlo_outcomes()[self.convert_path_to_string(path)])
-        proportion = np.sum(monte_carlo_array, axis=0) / monte_carlo_array.shape[0]
+        plt = self.capabilities.graph.pyplot()
+        proportion = self.capabilities.get_path_summary(path).position_proportions()
         events = []
         for component_name in path:
             events.append(component_name)
@@ -0,0 +1,47 @@
+from collections.abc import Mapping
+import numpy as np
+from mimik.component_graph.monte_carlo_workers import outcome_dtype
+
+
+class ComponentOutcomes(Mapping):
+    def __init__(self, component_names: list[str], packed_successes: np.ndarray, num_iterations: int, paths: dict):
+        """
+        A read only mapping of path IDs to Monte Carlo outcomes which are computed
+        on demand from a bit-packed (components x iterations) success matrix
+
+        Parameters:
+            component_names (list[str]): The component names in the order of the matrix rows
+            packed_successes (np.ndarray): The success matrix packed along the iteration axis
+                with np.packbits
+            num_iterations (int): The number of iterations held by the success matrix
+            paths (dict): A dictionary mapping path IDs to their paths
+        """
+        self.component_rows = {name: row for row, name in enumerate(component_names)}
+        self.packed_successes = packed_successes
+        self.num_iterations = num_iterations
+        self.paths = paths
+
+    def __getitem__(self, path_id: int) -> np.ndarray:
+        """
+        Computes the outcomes of a path by AND-ing the rows of its components
+
+        Parameters:
+            path_id (int): The ID of the path
+
+        Returns:
+            np.ndarray: The index of the first failed component of each iteration, equal to
+                len(path) when every component succeeded
+        """
+        path = self.paths[path_id]
+        first_failures = np.zeros(self.num_iterations, dtype=outcome_dtype(len(path)))
+        running = np.full(self.packed_successes.shape[1], 0xFF, dtype=np.uint8)
+        for component_name in path:
+            running &= self.packed_successes[self.component_rows[component_name]]
+            first_failures += np.unpackbits(running, count=self.num_iterations)
+        return first_failures
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)
@@ -0,0 +1,333 @@
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+import numpy as np
+from mimik.component_graph.path_summary import PathSummary
+from mimik.component_graph.task_factory import get_task_file, load_task_file
+
+# Iterations are split into shards of this size so that the seed of every shard, and therefore
+# the results of a run, do not depend on the number of workers. Must remain a multiple of 8 so
+# that bit-packed shards can be concatenated
+ITERATIONS_PER_SHARD = 16384
+
+# The tasks of the simulation, installed in each worker process by initialize_worker
+_worker_tasks: dict = {}
+
+
+def split_iterations(num_iterations: int, seed_sequence: np.random.SeedSequence):
+    """
+    Splits a number of iterations into shards that each own a spawned child seed
+
+    Parameters:
+        num_iterations (int): The number of iterations to split
+        seed_sequence (np.random.SeedSequence): The seed sequence to spawn shard seeds from
+
+    Returns:
+        list[tuple]: A list of (shard_iterations, shard_seed_sequence) tuples
+    """
+    shard_sizes = [ITERATIONS_PER_SHARD] * (num_iterations // ITERATIONS_PER_SHARD)
+    if num_iterations % ITERATIONS_PER_SHARD != 0:
+        shard_sizes.append(num_iterations % ITERATIONS_PER_SHARD)
+    return list(zip(shard_sizes, seed_sequence.spawn(len(shard_sizes))))
+
+
+def outcome_dtype(path_length: int):
+    """
+    Gets the smallest unsigned integer type able to hold the first failure index of a path
+
+    Parameters:
+        path_length (int): The number of components in the path
+
+    Returns:
+        The NumPy dtype of the path's outcomes
+    """
+    return np.uint8 if path_length <= np.iinfo(np.uint8).max else np.uint16
+
+
+def simulate_path_shard(tasks: dict, path: list[str], num_iterations: int, vectorized: bool, store_probabilities: bool, sampler, seed_sequence: np.random.SeedSequence):
+    """
+    Simulates a shard of iterations of a single path
+
+    The Bernoulli outcomes are drawn from a generator seeded by seed_sequence. The global NumPy
+    random state, which scipy.stats uses inside task forward functions, is seeded from the same
+    sequence for the duration of the shard and restored afterwards
+
+    Parameters:
+        tasks (dict): A dictionary mapping component names to their tasks
+        path (list[str]): The path to simulate
+        num_iterations (int): The number of iterations in the shard
+        vectorized (bool): True if the probabilities should be drawn with each task's forward_batch
+        store_probabilities (bool): True if the probabilities of each iteration should be returned
+        sampler (Sampler): The sampling strategy supplying the uniform variates of each component,
+            or None to draw them independently. A sampler implies vectorized
+        seed_sequence (np.random.SeedSequence): The seed sequence owned by the shard
+
+    Returns:
+        A tuple of the first failure index of each iteration, equal to len(path) when every
+        component succeeded, and a float32 (num_iterations x len(path)) array of the probabilities
+        of each iteration, or None if store_probabilities is False. Components after the first
+        failure are recorded with a probability of 0
+    """
+    outcome_seed, task_seed = seed_sequence.spawn(2)
+    rng = np.random.default_rng(outcome_seed)
+    global_state = np.random.get_state()
+    np.random.seed(task_seed.generate_state(4))
+    try:
+        if vectorized or sampler is not None:
+            successes = np.empty((num_iterations, len(path)), dtype=bool)
+            probabilities = np.empty((num_iterations, len(path)), dtype=np.float32) if store_probabilities else None
+            component_uniforms = _split_uniforms(tasks, path, num_iterations, sampler, rng)
+            for index, component_name in enumerate(path):
+                component_probabilities, outcome_uniforms = next(component_uniforms)
+                successes[:, index] = outcome_uniforms < component_probabilities
+                if probabilities is not None:
+                    probabilities[:, index] = component_probabilities
+            first_failures = np.where(successes.all(axis=1), len(path), successes.argmin(axis=1))
+            first_failures = first_failures.astype(outcome_dtype(len(path)))
+            if probabilities is not None:
+                probabilities[np.arange(len(path)) > first_failures[:, None]] = 0
+        else:
+            first_failures = np.full(num_iterations, len(path), dtype=outcome_dtype(len(path)))
+            probabilities = np.zeros((num_iterations, len(path)), dtype=np.float32) if store_probabilities else None
+            forwards = [_memoized_forward(tasks[component_name]) for component_name in path]
+            for run_number in range(num_iterations):
+                for index, forward in enumerate(forwards):
+                    probability = forward()
+                    if probabilities is not None:
+                        probabilities[run_number, index] = probability
+                    if rng.random() >= probability:
+                        first_failures[run_number] = index
+                        break
+    finally:
+        np.random.set_state(global_state)
+    return first_failures, probabilities
+
+
+def simulate_component_shard(tasks: dict, component_name: str, num_iterations: int, sampler, seed_sequence: np.random.SeedSequence):
+    """
+    Samples a shard of iterations of a single component
+
+    Parameters:
+        tasks (dict): A dictionary mapping component names to their tasks
+        component_name (str): The component to sample
+        num_iterations (int): The number of iterations in the shard
+        sampler (Sampler): The sampling strategy supplying the component's uniform variates,
+            or None to draw them independently
+        seed_sequence (np.random.SeedSequence): The seed sequence owned by the shard
+
+    Returns:
+        np.ndarray: The successes of the component packed with np.packbits
+    """
+    outcome_seed, task_seed = seed_sequence.spawn(2)
+    rng = np.random.default_rng(outcome_seed)
+    global_state = np.random.get_state()
+    np.random.seed(task_seed.generate_state(4))
+    try:
+        probabilities, outcome_uniforms = next(_split_uniforms(tasks, [component_name], num_iterations, sampler, rng))
+    finally:
+        np.random.set_state(global_state)
+    return np.packbits(outcome_uniforms < probabilities)
+
+
+def simulate_scenario_shard(tasks: dict, scenario: int, path: list[str], num_iterations: int, vectorized: bool, sampler, seed_sequence: np.random.SeedSequence):
+    """
+    Simulates a shard of iterations of a single path under one scenario of a parameter sweep
+
+    Parameters:
+        tasks (dict): A dictionary mapping (scenario, component name) pairs to their tasks
+        scenario (int): The index of the scenario
+        path (list[str]): The path to simulate
+        num_iterations (int): The number of iterations in the shard
+        vectorized (bool): True if the probabilities should be drawn with each task's forward_batch
+        sampler (Sampler): The sampling strategy, or None to draw independently
+        seed_sequence (np.random.SeedSequence): The seed sequence owned by the shard
+
+    Returns:
+        PathSummary: The summary of the shard's outcomes
+    """
+    scenario_tasks = {component_name: tasks[(scenario, component_name)] for component_name in path}
+    first_failures, _ = simulate_path_shard(scenario_tasks, path, num_iterations, vectorized, False, sampler, seed_sequence)
+    return PathSummary.from_outcomes(first_failures, len(path))
+
+
+def simulate_importance_shard(tasks: dict, path: list[str], num_iterations: int, tilt: float, seed_sequence: np.random.SeedSequence):
+    """
+    Simulates a shard of iterations of a single path under importance sampling. Each component
+    succeeds with the tilted probability p ** tilt instead of p, and every iteration is weighted
+    by the likelihood ratio of the Bernoulli outcomes drawn up to its first failure
+
+    Parameters:
+        tasks (dict): A dictionary mapping component names to their tasks
+        path (list[str]): The path to simulate
+        num_iterations (int): The number of iterations in the shard
+        tilt (float): The positive exponent applied to each probability. Values below 1 make
+            successes more frequent and values above 1 make failures more frequent
+        seed_sequence (np.random.SeedSequence): The seed sequence owned by the shard
+
+    Returns:
+        np.ndarray: The sums of the weighted completion indicators and their squares, followed by
+            the sums of the weighted failure indicators and their squares
+    """
+    outcome_seed, task_seed = seed_sequence.spawn(2)
+    rng = np.random.default_rng(outcome_seed)
+    global_state = np.random.get_state()
+    np.random.seed(task_seed.generate_state(4))
+    try:
+        weights = np.ones(num_iterations)
+        completed = np.ones(num_iterations, dtype=bool)
+        for component_name in path:
+            probabilities = np.clip(_forward_batch(tasks[component_name], num_iterations), 0, 1)
+            tilted_probabilities = probabilities ** tilt
+            successes = rng.random(num_iterations) < tilted_probabilities
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratios = np.where(
+                    successes, probabilities / tilted_probabilities, (1 - probabilities) / (1 - tilted_probabilities)
+                )
+            weights[completed] *= ratios[completed]
+            completed &= successes
+    finally:
+        np.random.set_state(global_state)
+    completed_weights = np.where(completed, weights, 0)
+    failed_weights = np.where(completed, 0, weights)
+    return np.array([
+        completed_weights.sum(), np.square(completed_weights).sum(), failed_weights.sum(), np.square(failed_weights).sum()
+    ])
+
+
+def _split_uniforms(tasks: dict, component_names: list[str], num_iterations: int, sampler, rng: np.random.Generator):
+    """
+    Draws the probabilities and outcome variates of each component in turn. With a sampler,
+    a single block of variates is drawn for all components and each component consumes
+    its task's num_uniforms columns followed by one column for its Bernoulli outcome
+
+    Parameters:
+        tasks (dict): A dictionary mapping component names to their tasks
+        component_names (list[str]): The components to draw for, in order
+        num_iterations (int): The number of iterations to draw
+        sampler (Sampler): The sampling strategy, or None to draw independently
+        rng (np.random.Generator): The generator owned by the shard
+
+    Yields:
+        A tuple of the component's probabilities and the uniform variates deciding its outcomes
+    """
+    if sampler is None:
+        for component_name in component_names:
+            yield _forward_batch(tasks[component_name], num_iterations), rng.random(num_iterations)
+        return
+    num_dimensions = sum(tasks[component_name].num_uniforms + 1 for component_name in component_names)
+    uniforms = sampler.uniforms(num_iterations, num_dimensions, rng)
+    column = 0
+    for component_name in component_names:
+        task = tasks[component_name]
+        if task.is_pure():
+            probabilities = np.full(num_iterations, task.cached_forward(), dtype=float)
+        else:
+            probabilities = task.forward_from_uniforms(uniforms[:, column:column + task.num_uniforms])
+        column += task.num_uniforms
+        yield probabilities, uniforms[:, column]
+        column += 1
+
+
+def _memoized_forward(task):
+    """
+    Gets the function returning a task's probability, which is the memoized forward of pure tasks
+
+    Parameters:
+        task (AbstractTask): The task of a component
+
+    Returns:
+        The task's forward or cached_forward function
+    """
+    return task.cached_forward if task.is_pure() else task.forward
+
+
+def _forward_batch(task, num_iterations: int) -> np.ndarray:
+    """
+    Draws the probabilities of a task, broadcasting the memoized forward result of pure tasks
+
+    Parameters:
+        task (AbstractTask): The task of a component
+        num_iterations (int): The number of probabilities to draw
+
+    Returns:
+        np.ndarray: An array of num_iterations probabilities
+    """
+    if task.is_pure():
+        return np.full(num_iterations, task.cached_forward(), dtype=float)
+    return task.forward_batch(num_iterations)
+
+
+def initialize_worker(task_files: list[str], tasks):
+    """
+    Stores the tasks of the killweb in a worker process so they are shipped only once. The task
+    files are loaded first, so that pickled tasks whose classes come from a tasks directory can
+    be unpickled in workers that did not inherit the modules of the task files
+
+    Parameters:
+        task_files (list[str]): The task files the classes of the tasks were loaded from
+        tasks: A dictionary mapping component names to their tasks, or the pickled dictionary
+    """
+    global _worker_tasks
+    for task_file in task_files:
+        load_task_file(task_file)
+    _worker_tasks = pickle.loads(tasks) if isinstance(tasks, bytes) else tasks
+
+
+def run_path_shard(path: list[str], num_iterations: int, vectorized: bool, store_probabilities: bool, sampler, seed_sequence: np.random.SeedSequence):
+    """
+    Simulates a path shard within a worker process using the tasks stored by initialize_worker
+    """
+    return simulate_path_shard(_worker_tasks, path, num_iterations, vectorized, store_probabilities, sampler, seed_sequence)
+
+
+def run_component_shard(component_name: str, num_iterations: int, sampler, seed_sequence: np.random.SeedSequence):
+    """
+    Samples a component shard within a worker process using the tasks stored by initialize_worker
+    """
+    return simulate_component_shard(_worker_tasks, component_name, num_iterations, sampler, seed_sequence)
+
+
+def run_scenario_shard(scenario: int, path: list[str], num_iterations: int, vectorized: bool, sampler, seed_sequence: np.random.SeedSequence):
+    """
+    Simulates a parameter sweep shard within a worker process using the tasks stored by initialize_worker
+    """
+    return simulate_scenario_shard(_worker_tasks, scenario, path, num_iterations, vectorized, sampler, seed_sequence)
+
+
+def run_importance_shard(path: list[str], num_iterations: int, tilt: float, seed_sequence: np.random.SeedSequence):
+    """
+    Simulates an importance sampling shard within a worker process using the tasks stored by initialize_worker
+    """
+    return simulate_importance_shard(_worker_tasks, path, num_iterations, tilt, seed_sequence)
+
+
+def create_worker_pool(tasks: dict, workers: int, start_method: Optional[str] = None) -> ProcessPoolExecutor:
+    """
+    Creates a process pool whose workers each hold a copy of the killweb's tasks
+
+    Forked workers inherit the tasks. Otherwise the tasks are pickled along with the task files
+    their classes were loaded from, which each worker loads before unpickling the tasks
+
+    Parameters:
+        tasks (dict): A dictionary mapping component names to their tasks
+        workers (int): The number of worker processes
+        start_method (str): The multiprocessing start method of the workers. Default is None which
+            uses the platform's default
+
+    Returns:
+        ProcessPoolExecutor: The created process pool
+    """
+    context = multiprocessing.get_context(start_method)
+    initargs: tuple
+    if context.get_start_method() == "fork":
+        initargs = ([], tasks)
+    else:
+        task_files = {get_task_file(type(task)) for task in tasks.values()}
+        initargs = (sorted(task_file for task_file in task_files if task_file is not None), pickle.dumps(tasks))
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=initialize_worker,
+        initargs=initargs
+    )
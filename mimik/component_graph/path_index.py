@@ -0,0 +1,306 @@
+from typing import Optional
+import networkx as nx
+
+
+class PathIndex:
+    def __init__(self, graph: nx.DiGraph):
+        """
+        A constructor for the PathIndex class which maintains the simple paths from the start
+        components to the end components of a graph. Mutations only mark the nodes they touch,
+        and the paths are brought up to date when they are next requested by recomputing only
+        the paths that pass through a marked node
+
+        Each component is interned to a dense integer index and each path is stored as a tuple of
+        component indices with a stable integer path ID. A path keeps its ID for the lifetime of
+        the index, including when it is removed from the graph and added back
+
+        Parameters:
+            graph (nx.DiGraph): The graph whose paths are indexed
+        """
+        self.graph = graph
+        self.version = 0
+        self.__paths: Optional[dict[tuple[int, ...], int]] = None
+        self.__dirty_nodes: set[str] = set()
+        self.__removed_nodes: set[str] = set()
+        self.__component_indices: dict[str, int] = {}
+        self.__component_names: list[str] = []
+        self.__path_ids: dict[tuple[int, ...], int] = {}
+        self.__encoded_paths: list[tuple[int, ...]] = []
+
+    def mark_dirty(self, *nodes):
+        """
+        Records that the edges of the given nodes have changed
+
+        Parameters:
+            nodes (str): The names of the changed nodes
+        """
+        self.__dirty_nodes.update(nodes)
+        self.version += 1
+
+    def mark_removed(self, node: str, neighbours: list[str]):
+        """
+        Records that a node has been removed from the graph. Its neighbours may have become
+        start or end components and are marked as dirty
+
+        Parameters:
+            node (str): The name of the removed node
+            neighbours (list[str]): The predecessors and successors of the removed node
+        """
+        self.__removed_nodes.add(node)
+        self.mark_dirty(*neighbours)
+
+    def invalidate(self):
+        """
+        Discards every indexed path so that they are recomputed in full when next requested
+        """
+        self.__paths = None
+        self.__dirty_nodes.clear()
+        self.__removed_nodes.clear()
+        self.version += 1
+
+    def get_paths(self) -> list[list[str]]:
+        """
+        Gets every simple path from a start component to an end component. Paths are ordered
+        as found by a depth first search from each start component, with paths added by later
+        updates appended at the end
+
+        Returns:
+            list[list[str]]: A list of paths resembling kill chains
+        """
+        return [self.__decode(path) for path in self.__refresh()]
+
+    def get_path_ids(self) -> list[int]:
+        """
+        Gets the ID of every path, in the order of get_paths
+
+        Returns:
+            list[int]: A list of path IDs
+        """
+        return list(self.__refresh().values())
+
+    def get_path_id(self, path: list[str]) -> int:
+        """
+        Gets the ID of a path from its component names
+
+        Parameters:
+            path (list[str]): The component names of the path
+
+        Returns:
+            int: The ID of the path
+
+        Raises:
+            KeyError: If the path is not a path of the graph
+        """
+        paths = self.__refresh()
+        try:
+            return paths[tuple(self.__component_indices[component_name] for component_name in path)]
+        except KeyError:
+            raise KeyError("%s is not a path of the graph" % ", ".join(path))
+
+    def get_path(self, path_id: int) -> list[str]:
+        """
+        Gets the component names of a path from its ID, including paths since removed from the graph
+
+        Parameters:
+            path_id (int): The ID of the path
+
+        Returns:
+            list[str]: The component names of the path
+        """
+        return self.__decode(self.__encoded_paths[path_id])
+
+    def get_encoded_path(self, path_id: int) -> tuple:
+        """
+        Gets the component indices of a path from its ID
+
+        Parameters:
+            path_id (int): The ID of the path
+
+        Returns:
+            tuple[int]: The index of each component of the path
+        """
+        return self.__encoded_paths[path_id]
+
+    def format_path(self, path_id: int) -> str:
+        """
+        Renders a path as the comma separated string of its component names, as used to key
+        results at the print and plot boundary
+
+        Parameters:
+            path_id (int): The ID of the path
+
+        Returns:
+            str: The string of the path
+        """
+        return ", ".join(self.get_path(path_id))
+
+    def get_component_index(self, component_name: str) -> int:
+        """
+        Gets the dense integer index of a component, interning it if it has not been seen before
+
+        Parameters:
+            component_name (str): The name of the component
+
+        Returns:
+            int: The index of the component
+        """
+        if component_name not in self.__component_indices:
+            self.__component_indices[component_name] = len(self.__component_names)
+            self.__component_names.append(component_name)
+        return self.__component_indices[component_name]
+
+    def get_component_name(self, component_index: int) -> str:
+        """
+        Gets the name of a component from its index
+
+        Parameters:
+            component_index (int): The index of the component
+
+        Returns:
+            str: The name of the component
+        """
+        return self.__component_names[component_index]
+
+    def iter_paths(self):
+        """
+        Lazily iterates over every simple path from a start component to an end component.
+        Paths already held by the index are brought up to date and reused, otherwise they are
+        walked one at a time without being stored
+
+        Yields:
+            list[str]: Each path resembling a kill chain
+        """
+        if self.__paths is None:
+            yield from self.__walk_all_paths()
+            return
+        for path in list(self.__refresh()):
+            yield self.__decode(path)
+
+    def count_paths(self) -> int:
+        """
+        Counts the simple paths from a start component to an end component without enumerating
+        them. In an acyclic graph, the number of paths from each component to an end component is
+        the sum over its successors, accumulated in reverse topological order. Graphs with cycles
+        fall back to walking the paths
+
+        Returns:
+            int: The number of paths
+        """
+        if not nx.is_directed_acyclic_graph(self.graph):
+            return sum(1 for _ in self.__walk_all_paths())
+        paths_to_end: dict[str, int] = {}
+        for node in reversed(list(nx.topological_sort(self.graph))):
+            successors = list(self.graph.successors(node))
+            paths_to_end[node] = sum(paths_to_end[successor] for successor in successors) if successors else 1
+        return sum(paths_to_end[node] for node in self.graph.nodes if self.graph.in_degree(node) == 0)
+
+    def __refresh(self) -> dict[tuple[int, ...], int]:
+        """
+        Brings the indexed paths up to date, computing them in full on first use or when more
+        than half of the nodes are dirty
+
+        Returns:
+            dict: A dictionary mapping the encoded paths of the graph to their IDs
+        """
+        paths = self.__paths
+        if paths is None or 2 * len(self.__dirty_nodes) > self.graph.number_of_nodes():
+            paths = {}
+            for path in self.__walk_all_paths():
+                self.__add_path(paths, path)
+        elif self.__dirty_nodes or self.__removed_nodes:
+            paths = self.__update_paths(paths)
+        self.__paths = paths
+        self.__dirty_nodes.clear()
+        self.__removed_nodes.clear()
+        return paths
+
+    def __walk_all_paths(self):
+        """
+        Walks every path of the graph with a single depth first search from each start component
+
+        Yields:
+            list[str]: Each path of the graph
+        """
+        for start_component in [node for node in self.graph.nodes if self.graph.in_degree(node) == 0]:
+            yield from self.__maximal_paths(start_component, self.graph.successors)
+
+    def __update_paths(self, indexed_paths: dict[tuple[int, ...], int]) -> dict[tuple[int, ...], int]:
+        """
+        Drops the indexed paths touching a dirty or removed node and adds every current path
+        passing through a dirty node. Paths touching no marked node are unaffected by the
+        mutations, as a change to a node's start or end status also marks it dirty
+
+        Parameters:
+            indexed_paths (dict): A dictionary mapping the previously indexed paths to their IDs
+
+        Returns:
+            dict: A dictionary mapping the updated paths to their IDs
+        """
+        affected_nodes = {self.get_component_index(node) for node in self.__dirty_nodes | self.__removed_nodes}
+        paths = {path: path_id for path, path_id in indexed_paths.items() if affected_nodes.isdisjoint(path)}
+        for node in [node for node in self.graph.nodes if node in self.__dirty_nodes]:
+            suffixes = list(self.__maximal_paths(node, self.graph.successors))
+            for prefix in self.__maximal_paths(node, self.graph.predecessors):
+                prefix_nodes = set(prefix)
+                for suffix in suffixes:
+                    if prefix_nodes.isdisjoint(suffix[1:]):
+                        self.__add_path(paths, prefix[::-1] + suffix[1:])
+        return paths
+
+    def __add_path(self, paths: dict, path: list[str]):
+        """
+        Encodes a path into component indices and adds it to a dictionary of paths, reusing
+        the path's ID if it has been indexed before
+
+        Parameters:
+            paths (dict): A dictionary mapping encoded paths to their IDs
+            path (list[str]): The component names of the path
+        """
+        encoded_path = tuple(self.get_component_index(component_name) for component_name in path)
+        if encoded_path not in self.__path_ids:
+            self.__path_ids[encoded_path] = len(self.__encoded_paths)
+            self.__encoded_paths.append(encoded_path)
+        paths[encoded_path] = self.__path_ids[encoded_path]
+
+    def __decode(self, encoded_path: tuple) -> list[str]:
+        """
+        Decodes a tuple of component indices into component names
+        """
+        return [self.__component_names[component_index] for component_index in encoded_path]
+
+    def __maximal_paths(self, node: str, neighbours):
+        """
+        Walks simple paths from a node until a node without neighbours is reached
+
+        Parameters:
+            node (str): The node to start from
+            neighbours (Callable): Either the graph's successors or predecessors function
+
+        Yields:
+            list[str]: Each simple path from node to a node without neighbours
+        """
+        path = [node]
+        visited = {node}
+        stack = [iter(list(neighbours(node)))]
+        if not self.__has_neighbours(node, neighbours):
+            yield list(path)
+            return
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                visited.discard(path.pop())
+            elif child not in visited:
+                path.append(child)
+                if self.__has_neighbours(child, neighbours):
+                    visited.add(child)
+                    stack.append(iter(list(neighbours(child))))
+                else:
+                    yield list(path)
+                    path.pop()
+
+    def __has_neighbours(self, node: str, neighbours) -> bool:
+        """
+        Checks whether a node has any neighbours in the walked direction
+        """
+        return next(iter(neighbours(node)), None) is not None
@@ -0,0 +1,25 @@
+from collections.abc import Mapping
+from mimik.component_graph.path_index import PathIndex
+
+
+class PathResults(Mapping):
+    def __init__(self, results: Mapping, path_index: PathIndex):
+        """
+        A read only mapping of path strings to results that are stored by path ID. Path strings
+        are only rendered here, at the boundary of the public API
+
+        Parameters:
+            results (Mapping): A mapping of path IDs to their results
+            path_index (PathIndex): The path index that assigned the path IDs
+        """
+        self.results = results
+        self.path_ids = {path_index.format_path(path_id): path_id for path_id in results}
+
+    def __getitem__(self, path_string: str):
+        return self.results[self.path_ids[path_string]]
+
+    def __iter__(self):
+        return iter(self.path_ids)
+
+    def __len__(self) -> int:
+        return len(self.path_ids)
@@ -0,0 +1,181 @@
+import heapq
+from statistics import NormalDist
+import numpy as np
+
+# The methods of PathStatistics.probability_intervals
+INTERVAL_METHODS = ["wilson", "clopper-pearson"]
+
+
+def wilson_score(proportions, num_iterations, confidence=0.95):
+    """
+    Computes the center and half-width of the Wilson score interval of observed proportions of
+    success. Works on single values and on arrays of values alike
+
+    Parameters:
+        proportions: The observed proportions of success
+        num_iterations: The number of iterations each proportion was observed over
+        confidence (float): The confidence level of the interval. Default is 0.95
+
+    Returns:
+        A tuple of the centers and half-widths of the intervals
+    """
+    z_score = NormalDist().inv_cdf((1 + confidence) / 2)
+    denominator = 1 + z_score ** 2 / num_iterations
+    centers = (proportions + z_score ** 2 / (2 * num_iterations)) / denominator
+    half_widths = z_score * np.sqrt(
+        proportions * (1 - proportions) / num_iterations + z_score ** 2 / (4 * num_iterations ** 2)
+    ) / denominator
+    return centers, half_widths
+
+
+class PathStatistics:
+    def __init__(self, path_ids: np.ndarray, num_iterations: np.ndarray, completions: np.ndarray, average_successes: np.ndarray, first_failure_counts: np.ndarray):
+        """
+        A constructor for the PathStatistics class, a columnar table of the statistics of every
+        simulated path. Row i of each column belongs to the path whose ID is path_ids[i]
+
+        Parameters:
+            path_ids (np.ndarray): The ID of each path
+            num_iterations (np.ndarray): The number of iterations simulated for each path
+            completions (np.ndarray): The number of iterations in which each path succeeded
+            average_successes (np.ndarray): The average number of successful events of each path
+            first_failure_counts (np.ndarray): A (paths x longest path length + 1) matrix counting the
+                iterations of each path by the index of their first failed component, with the
+                iterations in which the path succeeded counted in the column of its length
+        """
+        self.path_ids = path_ids
+        self.num_iterations = num_iterations
+        self.completions = completions
+        self.average_successes = average_successes
+        self.first_failure_counts = first_failure_counts
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.probabilities = completions / num_iterations
+
+    @classmethod
+    def from_summaries(cls, summaries: dict):
+        """
+        Creates the table from the summaries of a simulation in a single vectorized pass
+
+        Parameters:
+            summaries (dict): A dictionary mapping path IDs to their PathSummary
+
+        Returns:
+            PathStatistics: The statistics of every path, in the order of the summaries
+        """
+        num_iterations = np.fromiter((summary.num_iterations for summary in summaries.values()), dtype=np.int64, count=len(summaries))
+        average_successes = np.fromiter((summary.mean_successes for summary in summaries.values()), dtype=np.float64, count=len(summaries))
+        longest_path = max((summary.path_length for summary in summaries.values()), default=0)
+        cumulative_successes = np.zeros((len(summaries), longest_path + 2), dtype=np.int64)
+        cumulative_successes[:, 0] = num_iterations
+        for row, summary in enumerate(summaries.values()):
+            cumulative_successes[row, 1:summary.path_length + 1] = summary.position_successes
+        first_failure_counts = -np.diff(cumulative_successes, axis=1)
+        completions = cumulative_successes[:, 1:][np.arange(len(summaries)), [summary.path_length - 1 for summary in summaries.values()]]
+        return cls(
+            np.fromiter(summaries, dtype=np.int64, count=len(summaries)), num_iterations, completions, average_successes, first_failure_counts
+        )
+
+    def __len__(self) -> int:
+        return len(self.path_ids)
+
+    def take(self, rows: np.ndarray):
+        """
+        Selects rows of the table
+
+        Parameters:
+            rows (np.ndarray): The indices of the rows to select, in the order they should appear
+
+        Returns:
+            PathStatistics: A table of the selected rows
+        """
+        return PathStatistics(
+            self.path_ids[rows], self.num_iterations[rows], self.completions[rows], self.average_successes[rows], self.first_failure_counts[rows]
+        )
+
+    def sort_by_probability(self):
+        """
+        Sorts the table by ascending probability of success. Paths with equal probabilities keep
+        their simulation order
+
+        Returns:
+            PathStatistics: The sorted table
+        """
+        return self.take(np.argsort(self.probabilities, kind="stable"))
+
+    def top_n(self, n: int):
+        """
+        Selects the n paths with the highest probability of success using a heap, without
+        sorting the whole table
+
+        Parameters:
+            n (int): The number of paths to select
+
+        Returns:
+            PathStatistics: A table of at most n paths sorted by descending probability of success
+        """
+        probabilities = self.probabilities.tolist()
+        rows = heapq.nlargest(n, range(len(probabilities)), key=probabilities.__getitem__)
+        return self.take(np.array(rows, dtype=np.int64))
+
+    def rows(self):
+        """
+        Iterates over the rows of the table
+
+        Yields:
+            tuple: The path ID, probability of success and average number of successful events of each path
+        """
+        yield from zip(self.path_ids.tolist(), self.probabilities.tolist(), self.average_successes.tolist())
+
+    def probability_intervals(self, confidence=0.95, method="wilson"):
+        """
+        Computes a confidence interval of the probability of success of every path at once
+
+        Parameters:
+            confidence (float): The confidence level of the intervals. Default is 0.95
+            method (str): Either "wilson" for the Wilson score interval or "clopper-pearson" for the
+                exact binomial interval, which is wider but never undercovers. Default is "wilson"
+
+        Returns:
+            A tuple of arrays holding the lower and upper bound of each path's interval
+
+        Raises:
+            KeyError: If the method is not one of INTERVAL_METHODS
+        """
+        alpha = 1 - confidence
+        successes = self.completions
+        num_iterations = self.num_iterations
+        if method == "wilson":
+            centers, half_widths = wilson_score(self.probabilities, num_iterations, confidence)
+            return np.clip(centers - half_widths, 0, 1), np.clip(centers + half_widths, 0, 1)
+        if method == "clopper-pearson":
+            from scipy.stats import beta
+            with np.errstate(divide="ignore", invalid="ignore"):
+                lower = np.where(successes == 0, 0.0, beta.ppf(alpha / 2, successes, num_iterations - successes + 1))
+                upper = np.where(successes == num_iterations, 1.0, beta.ppf(1 - alpha / 2, successes + 1, num_iterations - successes))
+            return lower, upper
+        raise KeyError("The provided interval method must be one of: %s" % ", ".join(INTERVAL_METHODS))
+
+    def bootstrap_average_successes(self, num_resamples=1000, confidence=0.95, seed=None):
+        """
+        Computes percentile bootstrap confidence intervals of the average number of successful
+        events of every path. Each resample of a path's iterations is drawn as a single multinomial
+        count over its first failure histogram, so every path and resample is drawn in one call
+        rather than by resampling individual iterations
+
+        Parameters:
+            num_resamples (int): The number of bootstrap resamples of each path. Default is 1000
+            confidence (float): The confidence level of the intervals. Default is 0.95
+            seed (int): The seed of the resampling. Default is None which draws fresh entropy
+
+        Returns:
+            A tuple of arrays holding the lower and upper bound of each path's interval
+        """
+        rng = np.random.default_rng(seed)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            first_failure_proportions = self.first_failure_counts / self.num_iterations[:, None]
+        resampled_counts = rng.multinomial(
+            self.num_iterations[:, None], first_failure_proportions[:, None, :], size=(len(self), num_resamples)
+        )
+        resampled_means = resampled_counts @ np.arange(self.first_failure_counts.shape[1]) / self.num_iterations[:, None]
+        lower, upper = np.quantile(resampled_means, [(1 - confidence) / 2, (1 + confidence) / 2], axis=1)
+        return lower, upper
@@ -0,0 +1,138 @@
+import numpy as np
+
+
+class PathSummary:
+    def __init__(self, path_length: int):
+        """
+        A constructor for the PathSummary class which accumulates the summary statistics of
+        a path's Monte Carlo outcomes without storing the outcomes themselves
+
+        Parameters:
+            path_length (int): The number of components in the path
+        """
+        self.path_length = path_length
+        self.num_iterations = 0
+        self.mean_successes = 0.0
+        self.sum_squared_deviations = 0.0
+        self.position_successes = np.zeros(path_length, dtype=np.int64)
+
+    @classmethod
+    def from_outcomes(cls, first_failures: np.ndarray, path_length: int):
+        """
+        Creates a PathSummary from stored Monte Carlo outcomes
+
+        Parameters:
+            first_failures (np.ndarray): The index of the first failed component of each iteration
+            path_length (int): The number of components in the path
+
+        Returns:
+            PathSummary: The summary of the outcomes
+        """
+        summary = cls(path_length)
+        summary.update(first_failures)
+        return summary
+
+    @classmethod
+    def from_state(cls, num_iterations: int, mean_successes: float, sum_squared_deviations: float, position_successes: np.ndarray):
+        """
+        Recreates a PathSummary from its saved statistics
+
+        Parameters:
+            num_iterations (int): The number of iterations summarized
+            mean_successes (float): The mean number of successful events
+            sum_squared_deviations (float): The sum of squared deviations of the number of successful events
+            position_successes (np.ndarray): The number of successes of each component of the path
+
+        Returns:
+            PathSummary: The recreated summary
+        """
+        summary = cls(len(position_successes))
+        summary.num_iterations = int(num_iterations)
+        summary.mean_successes = float(mean_successes)
+        summary.sum_squared_deviations = float(sum_squared_deviations)
+        summary.position_successes = np.array(position_successes, dtype=np.int64)
+        return summary
+
+    def update(self, first_failures: np.ndarray):
+        """
+        Adds a batch of outcomes to the running statistics. The mean and variance of the number
+        of successful events are combined with the batch using Welford's parallel update
+
+        Parameters:
+            first_failures (np.ndarray): The index of the first failed component of each iteration,
+                equal to the path length when every component succeeded
+        """
+        batch_iterations = first_failures.shape[0]
+        if batch_iterations == 0:
+            return
+        batch_mean = np.mean(first_failures, dtype=np.float64)
+        batch_squared_deviations = np.sum(np.square(first_failures - batch_mean))
+        counts = np.bincount(first_failures, minlength=self.path_length + 1)
+        self.position_successes += np.cumsum(counts[::-1])[::-1][1:]
+        total_iterations = self.num_iterations + batch_iterations
+        delta = batch_mean - self.mean_successes
+        self.mean_successes += delta * batch_iterations / total_iterations
+        self.sum_squared_deviations += batch_squared_deviations + delta ** 2 * self.num_iterations * batch_iterations / total_iterations
+        self.num_iterations = total_iterations
+
+    def merge(self, other):
+        """
+        Combines the statistics of another summary of the same path into this summary
+
+        Parameters:
+            other (PathSummary): The summary to merge
+        """
+        if other.num_iterations == 0:
+            return
+        total_iterations = self.num_iterations + other.num_iterations
+        delta = other.mean_successes - self.mean_successes
+        self.mean_successes += delta * other.num_iterations / total_iterations
+        self.sum_squared_deviations += other.sum_squared_deviations + delta ** 2 * self.num_iterations * other.num_iterations / total_iterations
+        self.position_successes += other.position_successes
+        self.num_iterations = total_iterations
+
+    def proportion_complete(self) -> float:
+        """
+        Calculates the proportion of simulations that succeed through the path
+
+        Returns:
+            float: The proportion of iterations in which every component succeeded
+        """
+        return self.position_successes[-1] / self.num_iterations
+
+    def average_num_success(self) -> float:
+        """
+        Calculates the average number of success events of the path
+
+        Returns:
+            float: The average number of successful events per iteration
+        """
+        return self.mean_successes
+
+    def success_variance(self) -> float:
+        """
+        Calculates the variance of the number of success events of the path
+
+        Returns:
+            float: The variance of the number of successful events per iteration
+        """
+        return self.sum_squared_deviations / self.num_iterations
+
+    def completion_variance(self) -> float:
+        """
+        Calculates the variance of the path's completion, a Bernoulli outcome
+
+        Returns:
+            float: The variance of whether the path completed in each iteration
+        """
+        proportion = self.proportion_complete()
+        return proportion * (1 - proportion)
+
+    def position_proportions(self) -> np.ndarray:
+        """
+        Calculates the proportion of successes of each component within the path
+
+        Returns:
+            np.ndarray: The proportion of iterations in which each component succeeded
+        """
+        return self.position_successes / self.num_iterations
@@ -0,0 +1,60 @@
+import json
+import os
+import numpy as np
+
+# The version of the layout written by save_result_arrays, stored in every manifest
+RESULT_FORMAT_VERSION = 1
+
+
+def save_result_arrays(filename: str, manifest: dict, arrays: dict):
+    """
+    Saves simulation results as NumPy arrays with a JSON manifest. Files ending in .npz are
+    written as a single uncompressed archive, while any other name is created as a directory
+    holding one .npy file per array, which can be memory-mapped when loaded. The manifest lists
+    the saved arrays so that stale files in a reused directory are ignored
+
+    Parameters:
+        filename (str): The .npz file or directory to save to
+        manifest (dict): The JSON serializable description of the results
+        arrays (dict): A dictionary mapping array names to NumPy arrays
+    """
+    manifest = dict(manifest, format_version=RESULT_FORMAT_VERSION, arrays=sorted(arrays))
+    if filename.endswith(".npz"):
+        np.savez(filename, manifest=np.array(json.dumps(manifest)), **arrays)
+        return
+    os.makedirs(filename, exist_ok=True)
+    for array_name, array in arrays.items():
+        np.save(os.path.join(filename, array_name + ".npy"), array)
+    with open(os.path.join(filename, "manifest.json"), 'w') as file:
+        json.dump(manifest, file, indent=4)
+
+
+def load_result_arrays(filename: str, memory_map=False):
+    """
+    Loads simulation results saved by save_result_arrays
+
+    Parameters:
+        filename (str): The .npz file or directory to load from
+        memory_map (bool): True if the arrays of a directory should be memory-mapped read only
+            rather than read into memory. Arrays in a .npz archive are always read. Default is False
+
+    Returns:
+        A tuple of the manifest dictionary and a dictionary mapping array names to arrays
+
+    Raises:
+        ValueError: If the results were written in an unsupported format version
+    """
+    if os.path.isdir(filename):
+        with open(os.path.join(filename, "manifest.json"), 'r') as file:
+            manifest = json.load(file)
+        arrays = {
+            array_name: np.load(os.path.join(filename, array_name + ".npy"), mmap_mode="r" if memory_map else None)
+            for array_name in manifest.get("arrays", [])
+        }
+    else:
+        with np.load(filename) as archive:
+            arrays = {array_name: archive[array_name] for array_name in archive.files}
+        manifest = json.loads(str(arrays.pop("manifest")))
+    if manifest.get("format_version") != RESULT_FORMAT_VERSION:
+        raise ValueError("The results in %s were saved in an unsupported format version" % filename)
+    return manifest, arrays
@@ -0,0 +1,116 @@
+import warnings
+import numpy as np
+
+
+class Sampler:
+    """
+    The default sampling strategy which draws independent pseudo-random uniform variates.
+    Sampling strategies supply the uniform variates that drive both the task probability
+    draws, through AbstractTask.forward_from_uniforms, and the Bernoulli outcome of each
+    component
+    """
+
+    def uniforms(self, num_iterations: int, num_dimensions: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Draws uniform variates on [0, 1)
+
+        Parameters:
+            num_iterations (int): The number of iterations to draw variates for
+            num_dimensions (int): The number of variates needed by each iteration
+            rng (np.random.Generator): The generator owned by the simulation shard
+
+        Returns:
+            np.ndarray: A (num_iterations x num_dimensions) array of uniform variates
+        """
+        return rng.random((num_iterations, num_dimensions))
+
+
+class AntitheticSampler(Sampler):
+    """
+    Pairs every draw u with its antithetic counterpart 1 - u
+    """
+
+    def uniforms(self, num_iterations: int, num_dimensions: int, rng: np.random.Generator) -> np.ndarray:
+        half_uniforms = rng.random(((num_iterations + 1) // 2, num_dimensions))
+        return np.concatenate([half_uniforms, 1 - half_uniforms])[:num_iterations]
+
+
+class StratifiedSampler(Sampler):
+    """
+    Places exactly one draw of the first dimension in each of num_iterations equal strata,
+    in random order. The remaining dimensions are drawn pseudo-randomly
+    """
+
+    def uniforms(self, num_iterations: int, num_dimensions: int, rng: np.random.Generator) -> np.ndarray:
+        uniforms = rng.random((num_iterations, num_dimensions))
+        if num_dimensions > 0:
+            uniforms[:, 0] = (rng.permutation(num_iterations) + uniforms[:, 0]) / num_iterations
+        return uniforms
+
+
+class LatinHypercubeSampler(Sampler):
+    """
+    Stratifies every dimension into num_iterations equal strata with a Latin hypercube
+    """
+
+    def uniforms(self, num_iterations: int, num_dimensions: int, rng: np.random.Generator) -> np.ndarray:
+        if num_dimensions == 0:
+            return np.empty((num_iterations, 0))
+        return _create_qmc_engine("LatinHypercube", num_dimensions, rng).random(num_iterations)
+
+
+class QuasiMonteCarloSampler(Sampler):
+    """
+    Draws a scrambled Sobol low-discrepancy sequence. Iteration counts that are powers of two
+    give the best balance
+    """
+
+    def uniforms(self, num_iterations: int, num_dimensions: int, rng: np.random.Generator) -> np.ndarray:
+        if num_dimensions == 0:
+            return np.empty((num_iterations, 0))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            return _create_qmc_engine("Sobol", num_dimensions, rng).random(num_iterations)
+
+
+SAMPLERS = {
+    "pseudo_random": Sampler,
+    "antithetic": AntitheticSampler,
+    "stratified": StratifiedSampler,
+    "latin_hypercube": LatinHypercubeSampler,
+    "sobol": QuasiMonteCarloSampler
+}
+
+
+def get_sampler(sampler) -> Sampler:
+    """
+    Resolves a sampling strategy from its name
+
+    Parameters:
+        sampler (str or Sampler): The name of a strategy in SAMPLERS, or a Sampler object
+
+    Returns:
+        Sampler: The sampling strategy
+
+    Raises:
+        KeyError: If the name does not match a sampling strategy
+    """
+    if isinstance(sampler, Sampler):
+        return sampler
+    try:
+        return SAMPLERS[sampler]()
+    except KeyError:
+        raise KeyError("The provided sampler name must be one of: %s" % ", ".join(SAMPLERS.keys()))
+
+
+def _create_qmc_engine(engine_name: str, num_dimensions: int, rng: np.random.Generator):
+    """
+    Creates a scipy.stats.qmc engine by name seeded by the shard's generator, supporting both
+    the rng and the older seed keyword. scipy.stats is imported on first use as it is slow to import
+    """
+    from scipy.stats import qmc
+    engine_class = getattr(qmc, engine_name)
+    try:
+        return engine_class(num_dimensions, rng=rng)
+    except TypeError:
+        return engine_class(num_dimensions, seed=rng)
@@ -1,8 +1,26 @@
+import ast
+import hashlib
+import importlib.util
+import inspect
 import os
-import importlib
 import sys
-import inspect
-from mimik.component_graph.abstract_task import AbstractTask
+import weakref
+from importlib.metadata import entry_points
+from typing import Optional
+from mimik.component_graph.abstract_task import AbstractTask, canonical_json
+
+# The entry point group through which installed packages register their task classes
+ENTRY_POINT_GROUP = "mimik.tasks"
+
+# The prefix of the module names task files are imported under
+TASK_MODULE_PREFIX = "mimik_tasks_"
+
+# The task classes discovered in each task file, keyed by the file's absolute path, as a tuple of
+# the file's modification time, the SHA-256 digest of its contents and a dictionary of its classes
+_task_file_cache: dict[str, tuple[int, str, dict[str, type]]] = {}
+
+# The task classes registered through entry points, loaded once per process
+_entry_point_tasks: Optional[dict[str, type]] = None
 
 
 class TaskFactory():
@@ -11,6 +29,11 @@ class TaskFactory():
         Creates a TaskFactory object which loads all modules from the given task_folder
         Utilizes a variation of the Factory design pattern.
 
+        Task classes registered under the mimik.tasks entry point group by installed packages are
+        available to every factory, and task classes in task_folder take precedence over them.
+        The classes of each task file are found by parsing it, and each file is imported once per
+        process unless its contents change
+
         Parameters:
             task_folder (str): The folder to load task modules from
             silent (bool): True if MIMIK is running in silent mode
@@ -18,23 +41,12 @@ class TaskFactory():
         Raises:
             FileNotFoundError: If the task_folder cannot be found
         """
-        self.localizers = {}
+        self.localizers = dict(load_entry_point_tasks(silent))
+        self.task_instances: weakref.WeakValueDictionary[tuple, AbstractTask] = weakref.WeakValueDictionary()
         try:
-            for module in os.listdir(task_folder):
+            for module in sorted(os.listdir(task_folder)):
                 if module[-3:] == ".py":
-                    with open(os.path.join(task_folder, module)) as task_file:
-                        lines = task_file.readlines()
-                        for line in lines:
-                            if "class" in line and "AbstractTask" in line:
-                                class_name = line.split('(')[0].replace("class ", "")
-                                module_name = module[:-2] + class_name
-                                spec = importlib.util.spec_from_file_location(module_name, os.path.join(task_folder, module))
-                                loaded_module = importlib.util.module_from_spec(spec)
-                                spec.loader.exec_module(loaded_module)
-                                sys.modules[module_name] = loaded_module
-                                for name, obj in inspect.getmembers(loaded_module):
-                                    if inspect.isclass(obj) and name == class_name:
-                                        self.localizers[class_name] = obj
+                    self.localizers.update(load_task_file(os.path.join(task_folder, module)))
         except FileNotFoundError:
             if not silent:
                 print("No tasks directory was found. Continuing with assumption that all tasks use static probability.")
@@ -45,6 +57,13 @@ class TaskFactory():
         task cannot be found, an AbstractTask is returned instead that assumes
         a static probability is found within the arguments parameter.
 
+        Tasks of a shareable class are cached by their class and a canonical hash of
+        their arguments, so components with the same task and arguments share one
+        instance rather than each constructing their own. Only weak references are kept,
+        so a task is released once no component uses it. A shared task changed in place
+        is changed for every component using it. Static probability tasks are cheap to
+        create and are never shared
+
         Parameters:
             task_name (str): The name of the task to create
             arguments (dict): The dictionary of arguments to include for the given
@@ -53,12 +72,167 @@ class TaskFactory():
         Returns:
             The created task
         """
+        task_class = self.localizers.get(task_name)
+        cache_key = None
+        if task_class is not None and getattr(task_class, "shareable", True):
+            arguments_hash = hash_task_arguments(arguments)
+            if arguments_hash is not None:
+                cache_key = (task_class, arguments_hash)
+                if cache_key in self.task_instances:
+                    return self.task_instances[cache_key]
         try:
             #print(task_name, arguments)
             return_task = self.localizers[task_name](arguments)
+            if cache_key is not None:
+                try:
+                    self.task_instances[cache_key] = return_task
+                except TypeError:
+                    pass
         except KeyError as e:
             if "probability" in arguments.keys() or task_name == 'Other':
                 return_task = AbstractTask(task_name, arguments)
             else:
                 raise KeyError("The provided task name could not be associated with a module found in the provided task directory.")
         return return_task
+
+
+def hash_task_arguments(arguments: dict) -> Optional[str]:
+    """
+    Computes a canonical hash of a task's arguments, independent of the order of their keys.
+    NumPy arrays are hashed by their contents, and arguments holding any other value that is not
+    JSON serializable are not hashed
+
+    Parameters:
+        arguments (dict): The arguments of the task
+
+    Returns:
+        str: The hexadecimal SHA-256 digest of the arguments, or None if they cannot be
+            canonicalized, such as when their keys cannot be sorted
+    """
+    try:
+        canonical_arguments = canonical_json(arguments)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(canonical_arguments.encode()).hexdigest()
+
+
+def load_task_file(filename: str) -> dict:
+    """
+    Loads the task classes of a task file. The file is parsed to find the classes directly
+    inheriting from AbstractTask and is then imported once. Results are cached by the file's
+    modification time, and by the hash of its contents when only the modification time changed
+
+    Parameters:
+        filename (str): The task file to load
+
+    Returns:
+        dict: A dictionary mapping task class names to the classes
+
+    Raises:
+        ImportError: If the task file cannot be imported
+    """
+    filename = os.path.abspath(filename)
+    modification_time = os.stat(filename).st_mtime_ns
+    cached = _task_file_cache.get(filename)
+    if cached is not None and cached[0] == modification_time:
+        return cached[2]
+    with open(filename, 'rb') as task_file:
+        source = task_file.read()
+    digest = hashlib.sha256(source).hexdigest()
+    if cached is not None and cached[1] == digest:
+        _task_file_cache[filename] = (modification_time, digest, cached[2])
+        return cached[2]
+    class_names = [
+        node.name for node in ast.parse(source, filename).body
+        if isinstance(node, ast.ClassDef) and any(_base_name(base) == "AbstractTask" for base in node.bases)
+    ]
+    task_classes = {}
+    if class_names:
+        module_name = task_module_name(filename)
+        spec = importlib.util.spec_from_file_location(module_name, filename)
+        if spec is None or spec.loader is None:
+            raise ImportError("The task file %s could not be imported" % filename)
+        loaded_module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = loaded_module
+        spec.loader.exec_module(loaded_module)
+        task_classes = {class_name: getattr(loaded_module, class_name) for class_name in class_names}
+    _task_file_cache[filename] = (modification_time, digest, task_classes)
+    return task_classes
+
+
+def task_module_name(filename: str) -> str:
+    """
+    Derives the name a task file is imported under from its absolute path, so that task files
+    with the same name in different folders, or named like an installed module, do not replace
+    each other in sys.modules
+
+    Parameters:
+        filename (str): The absolute path of the task file
+
+    Returns:
+        str: The module name of the task file
+    """
+    path_digest = hashlib.sha256(filename.encode()).hexdigest()[:16]
+    return "%s%s_%s" % (TASK_MODULE_PREFIX, path_digest, os.path.basename(filename)[:-3])
+
+
+def get_task_file(task_class: type) -> Optional[str]:
+    """
+    Gets the task file a task class was loaded from by load_task_file
+
+    Parameters:
+        task_class (type): The task class
+
+    Returns:
+        str: The absolute path of the task file, or None if the class was not loaded from a task file
+    """
+    if not task_class.__module__.startswith(TASK_MODULE_PREFIX):
+        return None
+    return getattr(sys.modules.get(task_class.__module__), "__file__", None)
+
+
+def load_entry_point_tasks(silent: bool) -> dict:
+    """
+    Loads the task classes registered under the mimik.tasks entry point group. An entry point
+    may name a task class, registered under the entry point's name, or a module, whose
+    AbstractTask subclasses are registered under their class names
+
+    Parameters:
+        silent (bool): True if MIMIK is running in silent mode
+
+    Returns:
+        dict: A dictionary mapping task names to the classes
+    """
+    global _entry_point_tasks
+    if _entry_point_tasks is not None:
+        return _entry_point_tasks
+    all_entry_points = entry_points()
+    if hasattr(all_entry_points, "select"):
+        task_entry_points = all_entry_points.select(group=ENTRY_POINT_GROUP)
+    else:
+        # Python 3.9 returns a dictionary of entry points by group
+        task_entry_points = all_entry_points.get(ENTRY_POINT_GROUP, [])  # type: ignore[arg-type]
+    _entry_point_tasks = {}
+    for entry_point in task_entry_points:
+        try:
+            loaded = entry_point.load()
+        except Exception as e:
+            if not silent:
+                print("The task entry point %s could not be loaded: %s" % (entry_point.name, e))
+            continue
+        if inspect.ismodule(loaded):
+            for name, obj in inspect.getmembers(loaded, inspect.isclass):
+                if issubclass(obj, AbstractTask) and obj is not AbstractTask:
+                    _entry_point_tasks[name] = obj
+        elif inspect.isclass(loaded) and issubclass(loaded, AbstractTask):
+            _entry_point_tasks[entry_point.name] = loaded
+    return _entry_point_tasks
+
+
+def _base_name(base: ast.expr) -> Optional[str]:
+    """
+    Gets the name of a base class expression such as AbstractTask or abstract_task.AbstractTask
+    """
+    if isinstance(base, ast.Attribute):
+        return base.attr
+    return getattr(base, "id", None)
@@ -0,0 +1,148 @@
+import json
+from typing import Any, Callable
+
+# The fastest installed JSON parser is used to read whole config files. orjson and ujson are
+# optional, and the standard library is used when neither is installed
+_loads: Callable[[bytes], Any]
+try:
+    import orjson
+    JSON_BACKEND = "orjson"
+    _loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+        JSON_BACKEND = "ujson"
+        _loads = ujson.loads
+    except ImportError:
+        JSON_BACKEND = "json"
+        _loads = json.loads
+
+# The number of characters read from a config file at a time while streaming
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def read_config(filename: str) -> dict:
+    """
+    Reads a whole config file with the fastest installed JSON parser
+
+    Parameters:
+        filename (str): The config file to read
+
+    Returns:
+        dict: The parsed config
+    """
+    with open(filename, 'rb') as file:
+        return _loads(file.read())
+
+
+def iter_config_components(filename: str, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Incrementally reads the components of the first killweb in a config file, so that only a
+    chunk of the file and the component being decoded are held in memory at once. Each component
+    is decoded with the standard library's raw_decode as soon as it has been read in full
+
+    Parameters:
+        filename (str): The config file to read
+        chunk_size (int): The number of characters read from the file at a time. Default is DEFAULT_CHUNK_SIZE
+
+    Yields:
+        tuple: The killweb name, component name and component config of each component
+
+    Raises:
+        ValueError: If the config file is not a JSON object of killwebs mapping component names to objects
+    """
+    with open(filename, 'r') as file:
+        stream = _ConfigStream(file, chunk_size)
+        stream.expect("{")
+        if stream.expect('"}', consume=False) == "}":
+            return
+        killweb_name = stream.decode()
+        stream.expect(":")
+        stream.expect("{")
+        if stream.expect('"}', consume=False) == "}":
+            return
+        while True:
+            component_name = stream.decode()
+            stream.expect(":")
+            yield killweb_name, component_name, stream.decode()
+            if stream.expect(",}") == "}":
+                return
+
+
+class _ConfigStream:
+    def __init__(self, file, chunk_size: int):
+        """
+        A buffered reader decoding JSON values one at a time from a text file
+
+        Parameters:
+            file (TextIO): The open config file
+            chunk_size (int): The number of characters read from the file at a time
+        """
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+        self.exhausted = False
+
+    def expect(self, characters: str, consume=True) -> str:
+        """
+        Skips whitespace and checks that the next character is one of the expected characters
+
+        Parameters:
+            characters (str): The allowed characters
+            consume (bool): True if the character should be consumed. Default is True
+
+        Returns:
+            str: The next character
+
+        Raises:
+            ValueError: If the next character is not one of the expected characters
+        """
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position].isspace():
+                self.position += 1
+            if self.position < len(self.buffer) or not self.read_chunk():
+                break
+        character = self.buffer[self.position:self.position + 1]
+        if character == "" or character not in characters:
+            raise ValueError("Expected one of %s in the config file but found %r" % (characters, character))
+        if consume:
+            self.position += 1
+        return character
+
+    def decode(self):
+        """
+        Decodes the next JSON value, reading more of the file until the value is complete
+
+        Returns:
+            The decoded value
+
+        Raises:
+            ValueError: If the value is not valid JSON
+        """
+        self.expect('"{[', consume=False)
+        while True:
+            try:
+                value, self.position = self.decoder.raw_decode(self.buffer, self.position)
+                return value
+            except json.JSONDecodeError:
+                if not self.read_chunk():
+                    raise
+
+    def read_chunk(self) -> bool:
+        """
+        Appends the next chunk of the file to the buffer, dropping the consumed characters
+
+        Returns:
+            bool: False if the end of the file has been reached
+        """
+        if self.exhausted:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if chunk == "":
+            self.exhausted = True
+            return False
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
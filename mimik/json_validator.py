@@ -1,5 +1,6 @@
-import json
 import jsonschema
+from jsonschema.exceptions import best_match
+from mimik.config_reader import read_config
 
 
 class JsonValidator:
@@ -36,8 +37,9 @@ class JsonValidator:
             },
             "additionalProperties": False
         }
+        self.validator = jsonschema.validators.validator_for(self.schema)(self.schema)
 
-    def validate_config(self, config_file: str, silent: bool):
+    def validate_config(self, config_file: str, silent: bool) -> dict:
         """
         Validates a JSON config file containing killweb information
         
@@ -46,14 +48,46 @@ class JsonValidator:
             silent (bool): True if MIMIK is running in silent mode
         
         Returns:
-            True if the config file had valid JSON schema
-        """
-        with open(config_file, 'r') as file:
-            data = json.load(file)
-            try:
-                jsonschema.validate(instance=data, schema=self.schema)
-                if not silent:
-                    print("JSON data is valid.")
-            except jsonschema.exceptions.ValidationError as e:
-                print(f"JSON data is invalid: {e.message}")
-                raise e
\ No newline at end of file
+            dict: The parsed config, so that it can be loaded without parsing the file again
+
+        Raises:
+            jsonschema.exceptions.ValidationError: If the config does not match the schema
+        """
+        data = read_config(config_file)
+        self.validate_data(data, silent)
+        return data
+
+    def validate_data(self, data: dict, silent: bool):
+        """
+        Validates a parsed config containing killweb information
+
+        Parameters:
+            data (dict): The parsed config to validate
+            silent (bool): True if MIMIK is running in silent mode
+
+        Raises:
+            jsonschema.exceptions.ValidationError: If the config does not match the schema
+        """
+        error = best_match(self.validator.iter_errors(data))
+        if error is not None:
+            print(f"JSON data is invalid: {error.message}")
+            raise error
+        if not silent:
+            print("JSON data is valid.")
+
+    def validate_component(self, killweb_name: str, component_name: str, component_config: dict):
+        """
+        Validates a single component of a config, as read by a streaming loader
+
+        Parameters:
+            killweb_name (str): The name of the killweb containing the component
+            component_name (str): The name of the component
+            component_config (dict): The config of the component
+
+        Raises:
+            jsonschema.exceptions.ValidationError: If the component does not match the schema
+        """
+        error = best_match(self.validator.iter_errors({killweb_name: {component_name: component_config}}))
+        if error is not None:
+            print(f"JSON data is invalid: {error.message}")
+            raise error
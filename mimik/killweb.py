@@ -1,4 +1,6 @@
 import os
+from contextlib import contextmanager
+from typing import Optional
 from mimik.component_graph.component_graph import ComponentGraph
 from mimik.component_graph.component_graph_metrics import ComponentGraphCapabilities
 from mimik.component_graph.component_graph_metrics import ComponentGraphMetrics
@@ -6,12 +8,16 @@ from mimik.json_validator import JsonValidator
 
 
 class Killweb:
+    component_capabilities: ComponentGraphCapabilities
+
     def __init__(
         self, 
         working_dir: str=os.getcwd(),
         config_file: str=None, 
         silent: bool=False, 
-        view=None
+        view=None,
+        stream_config: bool=False,
+        headless: Optional[bool]=None
     ):
         """
         A constructor for the Killweb class
@@ -26,29 +32,80 @@ class Killweb:
             silent (bool): True if MIMIK is running in silent mode. Default is False.
             view (Renderer): The Renderer object associated with running MIMIK with a GUI.
                 Default is None.
+            stream_config (bool): True if the config file should be validated and loaded one
+                component at a time, bounding peak memory for very large configs. Default is False.
+            headless (bool): True if MIMIK should never import or use matplotlib, such as in batch
+                workers. Default is None which is headless when MIMIK_HEADLESS is set to 1.
         """
         self.working_dir = working_dir
+        self.__batch_depth = 0
+        self.__pending_components: list[tuple] = []
         if not os.path.isdir(self.working_dir):
             os.mkdir(self.working_dir)
-        self.component_graph = ComponentGraph(working_dir=self.working_dir, silent=silent)
-        if config_file != None:
+        self.component_graph = ComponentGraph(working_dir=self.working_dir, silent=silent, headless=headless)
+        if config_file != None and stream_config:
+            self.stream_killweb_from_config_file(config_file)
+        elif config_file != None:
             validator = JsonValidator()
-            validator.validate_config(config_file, silent)
-            self.load_killweb_from_config_file(config_file)
+            self.component_graph.load_killweb_from_config(validator.validate_config(config_file, silent))
+            self.__update_killweb(True)
         else:
             self.__update_killweb(False)
 
     def __update_killweb(self, display_graphs: bool):
         """
         Updates the ComponentCapabilities and ComponentMetrics after the
-        component graph is updated
+        component graph is updated. The capabilities are created once and only
+        their results are cleared, as the paths are kept up to date by the
+        component graph's path index
 
         Args:
             display_graphs (bool): True if the graphs should be displayed
         """
+        if self.__batch_depth > 0:
+            return
+        if hasattr(self, "component_capabilities"):
+            self.component_capabilities.clear_monte_carlo_results()
+            return
         self.component_capabilities = ComponentGraphCapabilities(self.component_graph)
         self.component_metrics = ComponentGraphMetrics(self.component_capabilities)
 
+    @contextmanager
+    def batch(self):
+        """
+        Groups mutations of the killweb into a single transaction. Components added within the
+        batch are collected and inserted in bulk when it exits, and the derived state of the
+        killweb is updated once rather than after every mutation. Other mutations are applied
+        immediately, after any components collected before them. If the batch raises, the
+        collected components are discarded. Batches may be nested, in which case the outermost
+        batch commits
+
+        Example:
+            with killweb.batch():
+                for component_name in component_names:
+                    killweb.add_new_component(component_name, ["Target"])
+        """
+        self.__batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            if self.__batch_depth == 1:
+                self.__pending_components = []
+            raise
+        finally:
+            self.__batch_depth -= 1
+            if self.__batch_depth == 0:
+                self.__flush_components()
+                self.__update_killweb(True)
+
+    def __flush_components(self):
+        """
+        Inserts the components collected by a batch into the component graph
+        """
+        if self.__pending_components:
+            pending_components, self.__pending_components = self.__pending_components, []
+            self.component_graph.add_components(pending_components)
+
     def save_killweb_to_config_file(self, filename: str, killweb_name="killweb"):
         """
         Saves the current killweb's component graph to a config file
@@ -66,9 +123,25 @@ class Killweb:
         Args:
             filename (str): The file to load from
         """
+        self.__flush_components()
         self.component_graph.load_killweb_from_config_file(filename)
         self.__update_killweb(True)
 
+    def stream_killweb_from_config_file(self, filename: str, validate=True, batch_size=10000):
+        """
+        Loads a killweb from a given config file one component at a time, so that very large
+        config files are never held in memory at once
+
+        Args:
+            filename (str): The file to load from
+            validate (bool): True if each component should be validated against the config schema. Default is True
+            batch_size (int): The number of components added to the graph at a time. Default is 10000
+        """
+        self.__flush_components()
+        validate_component = JsonValidator().validate_component if validate else None
+        self.component_graph.stream_killweb_from_config_file(filename, validate_component, batch_size)
+        self.__update_killweb(True)
+
     def create_component_networkx_visualization(self, show_and_save=True):
         """
         Creates and displays a networkx visualization for the component graph
@@ -97,9 +170,26 @@ class Killweb:
             from_components (list[str]): A list of names of components the new component can receive from
             to_components (list[str]): A list of names of components the new component can output to
         """
+        if self.__batch_depth > 0:
+            self.__pending_components.append((component_name, to_components, from_components, component_attributes))
+            return
         self.component_graph.add_new_component(component_name, to_components, from_components, component_attributes)
         self.__update_killweb(True)
 
+    def add_components(self, components: list[tuple]):
+        """
+        Adds many components to the existing component graph at once
+
+        Args:
+            components (list[tuple]): A list of (component_name, to_components, from_components,
+                component_attributes) tuples taking the arguments of add_new_component
+        """
+        if self.__batch_depth > 0:
+            self.__pending_components.extend(components)
+            return
+        self.component_graph.add_components(components)
+        self.__update_killweb(True)
+
     def add_task_to_component(self, component_name: str, task_name: str, task_arguments: dict):
         """
         Create a new task and add it to a new component
@@ -109,6 +199,7 @@ class Killweb:
             task_name (str): The name of the task to create
             task_arguments (dict): The arguments to create the task with
         """
+        self.__flush_components()
         self.component_graph.add_task_to_component(component_name, task_name, task_arguments)
         self.__update_killweb(True)
 
@@ -120,6 +211,7 @@ class Killweb:
             from_component_name (str): The component pointing to "to_component"
             to_component_name (str): The component being pointed to by "from_component"
         """
+        self.__flush_components()
         self.component_graph.add_new_edge(from_component_name, to_component_name)
         self.__update_killweb(True)
 
@@ -130,7 +222,9 @@ class Killweb:
         Args:
             component_name (str): _description_
         """
+        self.__flush_components()
         self.component_graph.remove_component(component_name)
+        self.__update_killweb(True)
         
     def remove_edge(self, from_component_name: str, to_component_name: str):
         """
@@ -140,6 +234,7 @@ class Killweb:
             from_component_name (str): The component pointing to "to_component"
             to_component_name (str): The component being pointed to by "from_component"
         """
+        self.__flush_components()
         self.component_graph.remove_existing_edge(from_component_name, to_component_name)
         self.__update_killweb(True)
         
@@ -166,20 +261,193 @@ class Killweb:
         """
         return self.component_capabilities.get_all_paths()
 
+    def iter_paths_in_killweb(self):
+        """
+        Lazily iterates over the paths in the killweb without holding them all in memory
+
+        Returns:
+            Iterator[list[str]]: An iterator over the paths in the killweb
+        """
+        return self.component_capabilities.iter_paths()
+
+    def count_paths_in_killweb(self) -> int:
+        """
+        Counts the paths in the killweb without enumerating them when the killweb is acyclic
+
+        Returns:
+            int: The number of paths in the killweb
+        """
+        return self.component_capabilities.count_paths()
+
     def print_all_paths_in_killweb(self):
         """
         Print all of the paths in the killweb across the component graph
         """
         self.component_capabilities.print_all_paths()
 
-    def monte_carlo_on_paths(self, num_iterations: int):
+    def monte_carlo_on_paths(
+        self,
+        num_iterations: int,
+        vectorized=False,
+        shared_components=False,
+        workers=None,
+        seed=None,
+        store_probabilities=True,
+        store_outcomes=True,
+        sampler=None,
+        paths=None,
+        incremental=True
+    ):
         """
         Runs a Monte Carlo simulation num_iterations times across all paths within the killweb
 
         Args:
             num_iterations (int): The number of monte carlo iterations to execute
+            vectorized (bool): True if each component's probabilities should be drawn in a
+                single batch through its task's forward_batch function. Default is False
+            shared_components (bool): True if each component should be sampled once per iteration
+                and shared across all paths containing it. Default is False
+            workers (int): The number of worker processes to run the simulation across.
+                Default is None which runs in the current process
+            seed (int): The seed making the simulation reproducible for any number of workers.
+                Default is None
+            store_probabilities (bool): True if the probability of each component in each iteration
+                should be kept. Default is True
+            store_outcomes (bool): True if the outcome of each iteration should be kept. When False,
+                only the summary statistics of each path are kept. Default is True
+            sampler (str): The variance reduction strategy, one of "pseudo_random", "antithetic",
+                "stratified", "latin_hypercube" or "sobol". Default is None
+            paths (list[list[str]]): The paths to simulate, such as those returned by
+                get_most_probable_paths. Default is None which simulates every path
+            incremental (bool): True if the results of paths whose tasks are unchanged since the
+                previous run with the same explicit seed and settings should be reused. Default is True
+        """
+        self.component_capabilities.monte_carlo_simulation(
+            num_iterations, vectorized, shared_components, workers, seed, store_probabilities, store_outcomes, sampler, paths, incremental
+        )
+
+    def adaptive_monte_carlo_on_paths(
+        self,
+        tolerance: float,
+        confidence=0.95,
+        time_budget=None,
+        batch_size=1000,
+        max_iterations=1000000,
+        workers=None,
+        seed=None,
+        sampler=None
+    ):
         """
-        self.component_capabilities.monte_carlo_simulation(num_iterations)
+        Runs a Monte Carlo simulation in batches until the confidence interval of each path's
+        probability of success is narrower than the tolerance
+
+        Args:
+            tolerance (float): The target half-width of each path's confidence interval
+            confidence (float): The confidence level of the interval. Default is 0.95
+            time_budget (float): The wall-clock budget in seconds. Default is None
+            batch_size (int): The number of iterations per path in each batch. Default is 1000
+            max_iterations (int): The maximum number of iterations of any path. Default is 1000000
+            workers (int): The number of worker processes to run the batches across. Default is None
+            seed (int): The seed making the simulation reproducible. Default is None
+            sampler (str): The variance reduction strategy of each batch. Default is None
+
+        Returns:
+            dict: A dictionary mapping each path to the number of iterations actually used
+        """
+        return self.component_capabilities.adaptive_monte_carlo_simulation(
+            tolerance, confidence, time_budget, batch_size, max_iterations, workers=workers, seed=seed, sampler=sampler
+        )
+
+    def importance_sampling_on_paths(self, num_iterations: int, tilt=None, workers=None, seed=None):
+        """
+        Estimates the probability of success and failure of each path with importance sampling,
+        suited to ranking paths whose success or failure is a rare event
+
+        Args:
+            num_iterations (int): The number of iterations of each path
+            tilt (float): The exponent applied to each component's probability. Default is None
+                which tilts each path towards an expected probability of success of 0.5
+            workers (int): The number of worker processes to run the simulation across. Default is None
+            seed (int): The seed making the simulation reproducible. Default is None
+
+        Returns:
+            dict: A dictionary mapping each path to its estimates and their relative errors
+        """
+        return self.component_capabilities.importance_sampling_simulation(num_iterations, tilt, workers, seed)
+
+    def mission_success_probability(
+        self,
+        num_iterations: int,
+        start_components: Optional[list[str]]=None,
+        end_components: Optional[list[str]]=None,
+        workers=None,
+        seed=None
+    ) -> Optional[float]:
+        """
+        Estimates the probability that at least one kill chain from the start components to the
+        end components completes, without enumerating the paths of the killweb
+
+        Args:
+            num_iterations (int): The number of monte carlo iterations to execute
+            start_components (list[str]): The components kill chains may start from. Default is None
+                which uses every component starting a path
+            end_components (list[str]): The components kill chains may end at. Default is None
+                which uses every component ending a path
+            workers (int): The number of worker processes to run the simulation across. Default is None
+            seed (int): The seed making the simulation reproducible. Default is None
+
+        Returns:
+            float: The estimated probability of mission success, or None if the killweb is not valid
+        """
+        return self.component_capabilities.mission_success_probability(
+            num_iterations, start_components, end_components, workers, seed
+        )
+
+    def parameter_sweep(self, scenarios: list[dict], num_iterations: int, vectorized=True, workers=None, seed=None, sampler=None, paths=None):
+        """
+        Simulates the paths of the killweb under many scenarios of task arguments without rebuilding it
+
+        Args:
+            scenarios (list[dict]): Dictionaries mapping component names to the task arguments they override
+            num_iterations (int): The number of iterations of each path in each scenario
+            vectorized (bool): True if probabilities should be drawn with forward_batch. Default is True
+            workers (int): The number of worker processes. Default is None
+            seed (int): The seed of the sweep, shared by every scenario. Default is None
+            sampler (str or Sampler): The variance reduction strategy. Default is None
+            paths (list[list[str]]): The paths to simulate. Default is None which simulates every path
+
+        Returns:
+            dict: The columns of a table with one row per scenario and path
+        """
+        return self.component_capabilities.parameter_sweep(scenarios, num_iterations, vectorized, workers, seed, sampler, paths)
+
+    def task_scenarios(self, task_name: str, argument_grid: list[dict]):
+        """
+        Creates parameter sweep scenarios applying each point of a grid of arguments to every component with the task
+
+        Args:
+            task_name (str): The name of the task whose arguments are swept
+            argument_grid (list[dict]): The task arguments overridden in each scenario
+
+        Returns:
+            list[dict]: The scenarios for parameter_sweep
+        """
+        return self.component_capabilities.task_scenarios(task_name, argument_grid)
+
+    def detect_pure_tasks(self, num_probes=3):
+        '''
+        Probes the tasks that have not declared whether they are pure and marks the deterministic
+        ones as pure, so their forward results are computed once during simulations
+
+        Parameters
+        ----------
+        num_probes : number of times forward is called on each task
+
+        Returns
+        -------
+        list of the component names whose tasks were marked as pure
+        '''
+        return self.component_capabilities.detect_pure_tasks(num_probes)
 
     def get_monte_carlo_results(self):
         """
@@ -191,6 +459,29 @@ class Killweb:
         """
         return self.component_capabilities.get_monte_carlo_outcomes(), self.component_capabilities.get_monte_carlo_probabilities()
 
+    def save_monte_carlo_results(self, filename: str):
+        """
+        Saves the results of the last Monte Carlo simulation with the killweb's fingerprint and seed
+
+        Args:
+            filename (str): The .npz file, or a directory for results to be memory-mapped when loaded
+        """
+        self.component_capabilities.save_monte_carlo_results(filename)
+
+    def load_monte_carlo_results(self, filename: str, memory_map=False, check_fingerprint=True):
+        """
+        Loads saved Monte Carlo results so metrics and plots can be produced without simulating again
+
+        Args:
+            filename (str): The .npz file or directory to load from
+            memory_map (bool): True if the arrays of a directory should be memory-mapped. Default is False
+            check_fingerprint (bool): True if the results must come from an identical killweb. Default is True
+
+        Returns:
+            int: The seed of the loaded simulation
+        """
+        return self.component_capabilities.load_monte_carlo_results(filename, memory_map, check_fingerprint)
+
     def get_probabilities_of_paths(self):
         '''
         Returns the probability of success for each path after Monte Carlo sim
@@ -213,6 +504,104 @@ class Killweb:
         _, avg_num_success_events = self.component_metrics.calc_stats_of_paths()
         return avg_num_success_events
 
+    def get_confidence_intervals_of_paths(self, confidence=0.95, method="wilson"):
+        '''
+        Returns a confidence interval of the probability of success for each path after Monte Carlo sim
+
+        Parameters
+        ----------
+        confidence : confidence level of the intervals
+        method : either "wilson" or the exact "clopper-pearson" interval
+
+        Returns
+        -------
+        dictionary of (lower, upper) bounds of success probabilities
+        '''
+        return self.component_metrics.calc_confidence_intervals_of_paths(confidence, method)
+
+    def get_bootstrap_intervals_of_avg_number_success_events(self, num_resamples=1000, confidence=0.95, seed=None):
+        '''
+        Returns a bootstrap confidence interval of the average number of successful events for each path
+
+        Parameters
+        ----------
+        num_resamples : number of bootstrap resamples of each path
+        confidence : confidence level of the intervals
+        seed : seed used while resampling
+
+        Returns
+        -------
+        dictionary of (lower, upper) bounds of the average number of successful events
+        '''
+        return self.component_metrics.bootstrap_average_num_success(num_resamples, confidence, seed)
+
+    def get_top_paths(self, n: int):
+        '''
+        Returns the n paths with the highest probability of success after Monte Carlo sim
+
+        Parameters
+        ----------
+        n : number of paths to return
+
+        Returns
+        -------
+        dictionary of success probabilities in descending order
+        '''
+        statistics = self.component_metrics.get_path_statistics().top_n(n)
+        path_index = self.component_graph.path_index
+        return {path_index.format_path(path_id): probability for path_id, probability, _ in statistics.rows()}
+
+    def get_analytic_probabilities_of_paths(self, num_samples=10000, seed=None):
+        '''
+        Returns the closed form probability of success for each path without running a
+        Monte Carlo simulation. Only stochastic components are sampled
+
+        Parameters
+        ----------
+        num_samples : number of probabilities averaged for each stochastic component
+        seed : seed used while sampling stochastic components
+
+        Returns
+        -------
+        dictionary of success probabilities
+        '''
+        probability_of_success, _, _ = self.component_capabilities.analytic_path_statistics(num_samples, seed)
+        return probability_of_success
+
+    def get_most_probable_paths(self, k: int, min_probability=None, num_samples=10000, seed=None):
+        '''
+        Returns the k most probable paths from the expected probability of each component,
+        found with a k-shortest paths search rather than by enumerating every path
+
+        Parameters
+        ----------
+        k : number of paths to return
+        min_probability : probability below which paths are not returned
+        num_samples : number of probabilities averaged for each stochastic component
+        seed : seed used while sampling stochastic components
+
+        Returns
+        -------
+        list of (path, probability) tuples in descending order of probability
+        '''
+        return self.component_capabilities.most_probable_paths(k, min_probability, num_samples, seed)
+
+    def get_analytic_statistics_of_paths(self, num_samples=10000, seed=None):
+        '''
+        Returns the closed form probability of success, expected number of successful events
+        and completion variance of each path
+
+        Parameters
+        ----------
+        num_samples : number of probabilities averaged for each stochastic component
+        seed : seed used while sampling stochastic components
+
+        Returns
+        -------
+        tuple of dictionaries of success probabilities, expected successful events and variances
+        '''
+        return self.component_capabilities.analytic_path_statistics(num_samples, seed)
+
     def print_probabilities_of_paths(self, amount_to_print=None, selected_component=None):
         """
         Prints the amount_to_print number of paths with the highest probability
@@ -225,25 +614,25 @@ class Killweb:
         """
         self.component_metrics.print_probability_of_paths(amount_to_print, selected_component)
     
-    def print_proportion_complete(self, path_to_test: str):
+    def print_proportion_complete(self, path_to_test: list[str]):
         """
         Prints the proportion of complete (successful) path_to_tests compared to the
         incomplete (failed) path_to_test based on the results of the Monte Carlo simulation
 
         Args:
-            path_to_test (str): The specific path to view the proportion of complete paths
+            path_to_test (list[str]): The specific path to view the proportion of complete paths
         """
         prop_complete = self.component_metrics.proportion_complete(path_to_test)
         print("Proportion of complete kill chains: %s" % str(prop_complete))
         return prop_complete
 
-    def print_average_number_of_successes(self, path_to_test: str):
+    def print_average_number_of_successes(self, path_to_test: list[str]):
         """
         Prints the average number of successful events across the path_to_test
         based on the results of the Monte Carlo simulation
 
         Args:
-            path_to_test (str): The specific path to view the average number of successes
+            path_to_test (list[str]): The specific path to view the average number of successes
         """
         avg_success = self.component_metrics.average_num_success(path_to_test)
         print("Average number of success events: %s" % str(avg_success))
@@ -263,13 +652,13 @@ class Killweb:
         print("The variance from the monte carlo results is: %s" % str(variance))
         return variance
 
-    def plot_monte_carlo_distribution(self, path_to_test: str):
+    def plot_monte_carlo_distribution(self, path_to_test: list[str]):
         """
         Plots the monte carlo results of each component within the path_to_test 
         based on the results of the Monte Carlo simulation
 
         Args:
-            path_to_test (str): The path whose Monte Carlo results are to be plot
+            path_to_test (list[str]): The path whose Monte Carlo results are to be plot
         """
         self.component_metrics.plot_MC_distribution(path_to_test)
 
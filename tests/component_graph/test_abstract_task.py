@@ -1,4 +1,5 @@
 from unittest import TestCase
+import numpy as np
 from mimik.component_graph.abstract_task import AbstractTask
 
 
@@ -27,3 +28,65 @@ class TestTask(TestCase):
         Tests the forward function of AbstractTask
         """
         self.assertEqual(self.test_task.forward(), 1.0)
+
+    def test_forward_batch(self):
+        """
+        Tests the forward_batch function of AbstractTask
+        """
+        self.assertEqual(self.test_task.forward_batch(5).tolist(), [1.0] * 5)
+
+    def test_is_deterministic(self):
+        """
+        Tests the is_deterministic function of AbstractTask
+        """
+        self.assertTrue(self.test_task.is_deterministic())
+
+    def test_forward_from_uniforms(self):
+        """
+        Tests the forward_from_uniforms function of AbstractTask
+        """
+        self.assertEqual(self.test_task.num_uniforms, 0)
+        self.assertEqual(self.test_task.forward_from_uniforms(np.empty((3, 0))).tolist(), [1.0] * 3)
+
+    def test_cached_forward(self):
+        """
+        Tests the purity and forward memoization functions of AbstractTask
+        """
+        class CountingTask(AbstractTask):
+            pure = True
+
+            def __init__(self):
+                super().__init__("counting_task", {})
+                self.calls = 0
+
+            def forward(self):
+                self.calls += 1
+                return 0.5
+
+        task = CountingTask()
+        self.assertTrue(self.test_task.is_pure())
+        self.assertTrue(task.is_pure())
+        self.assertTrue(task.is_deterministic())
+        self.assertEqual(task.forward_batch(4).tolist(), [0.5] * 4)
+        self.assertEqual(task.cached_forward(), 0.5)
+        self.assertEqual(task.calls, 1)
+        task.clear_forward_cache()
+        task.cached_forward()
+        self.assertEqual(task.calls, 2)
+
+    def test_fingerprint(self):
+        """
+        Tests the fingerprint function of AbstractTask
+        """
+        same_task = AbstractTask("test_task", {"probability": 1.0})
+        self.assertEqual(self.test_task.fingerprint(), same_task.fingerprint())
+        self.assertNotEqual(self.test_task.fingerprint(), AbstractTask("test_task", {"probability": 0.5}).fingerprint())
+        same_task.probability = 0.5
+        self.assertNotEqual(self.test_task.fingerprint(), same_task.fingerprint())
+        array_task = AbstractTask("test_task", {"probability": 1.0, "weights": np.zeros(2000)})
+        array_fingerprint = array_task.fingerprint()
+        self.assertEqual(array_fingerprint, array_task.fingerprint())
+        array_task.task_arguments["weights"][1000] = 1
+        self.assertNotEqual(array_fingerprint, array_task.fingerprint())
+        opaque_task = AbstractTask("test_task", {"probability": 1.0, "model": object()})
+        self.assertNotEqual(opaque_task.fingerprint(), opaque_task.fingerprint())
@@ -3,6 +3,7 @@ import pytest
 import json
 import networkx as nx
 from unittest.mock import patch, mock_open, MagicMock
+from mimik.component_graph.abstract_task import AbstractTask
 from mimik.component_graph.component_graph import ComponentGraph
 
 
@@ -112,6 +113,26 @@ class TestComponentGraph():
         test_component_graph.load_killweb_from_config_file(os.path.join(".", "tests", "test_configs", "test_json.json"))
         assert len(test_component_graph.nodes) == 3
 
+    def test_stream_killweb_from_config_file(self, test_component_graph: ComponentGraph):
+        """
+        Tests that the ComponentGraph's streamed loading matches loading the whole config file
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        component_graph = ComponentGraph(working_dir=os.path.join(".", "tests"), silent=True)
+        validated_components = []
+        component_graph.stream_killweb_from_config_file(
+            os.path.join(".", "tests", "test_configs", "test_json.json"),
+            lambda killweb_name, component_name, component_config: validated_components.append(component_name),
+            batch_size=2,
+            chunk_size=16
+        )
+        assert validated_components == list(test_component_graph.nodes)
+        assert list(component_graph.nodes) == list(test_component_graph.nodes)
+        assert list(component_graph.edges) == list(test_component_graph.edges)
+        assert component_graph.fingerprint() == test_component_graph.fingerprint()
+
     def test_add_new_component(self, test_component_graph: ComponentGraph):
         """
         Tests the ComponentGraph's add_new_component method
@@ -132,6 +153,62 @@ class TestComponentGraph():
         assert len(nx.descendants(test_component_graph, "Test_Component_2_2")) == 1
         assert len(nx.ancestors(test_component_graph, "Test_Component_3")) == 3
         
+    def test_add_components(self, test_component_graph: ComponentGraph):
+        """
+        Tests that the ComponentGraph's add_components method matches successive calls to add_new_component
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        assert len(test_component_graph.get_all_paths()) == 1
+        test_component_graph.add_components([
+            ("Test_Component_4", ["Test_Component_5"], ["Test_Component_3"], {"task": "Test_Task", "task_arguments": {"probability": 0.5}}),
+            ("Test_Component_5 ", [], [], {"task": "Test_Task", "task_arguments": {"probability": 0.4}, "system_name": "Test_System", "color": "red"}),
+            ("Test_Component_2_2", ["Test_Component_4"], ["Test_Component_1"], {})
+        ])
+        assert list(test_component_graph.nodes) == [
+            "Test_Component_1", "Test_Component_2", "Test_Component_3", "Test_Component_4", "Test_Component_5", "Test_Component_2_2"
+        ]
+        assert set(test_component_graph.edges) == {
+            ("Test_Component_1", "Test_Component_2"), ("Test_Component_2", "Test_Component_3"), ("Test_Component_3", "Test_Component_4"),
+            ("Test_Component_4", "Test_Component_5"), ("Test_Component_1", "Test_Component_2_2"), ("Test_Component_2_2", "Test_Component_4")
+        }
+        component_5 = test_component_graph.nodes["Test_Component_5"]
+        assert component_5["component"].task.probability == 0.4
+        assert component_5["component"].system_name == "Test_System"
+        assert component_5["color"] == "red"
+        assert test_component_graph.nodes["Test_Component_4"]["component"].task.probability == 0.5
+        assert test_component_graph.nodes["Test_Component_3"]["component"].connected_component_names == ["Test_Component_4"]
+        assert "Test_Component_2_2" in test_component_graph.nodes["Test_Component_1"]["component"].connected_component_names
+        assert sorted(test_component_graph.get_all_paths()) == [
+            ["Test_Component_1", "Test_Component_2", "Test_Component_3", "Test_Component_4", "Test_Component_5"],
+            ["Test_Component_1", "Test_Component_2_2", "Test_Component_4", "Test_Component_5"]
+        ]
+
+    def test_add_task_to_component(self, test_component_graph: ComponentGraph):
+        """
+        Tests that the ComponentGraph's add_task_to_component method clears the memoized
+        forward result of the replaced task
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        class PureTask(AbstractTask):
+            pure = True
+
+            def forward(self):
+                return 0.9
+
+        old_task = PureTask("Pure_Task", {})
+        test_component_graph.nodes["Test_Component_2"]["component"].add_task(old_task)
+        assert old_task.cached_forward() == 0.9
+        assert "_cached_probability" in old_task.__dict__
+        test_component_graph.add_task_to_component("Test_Component_2", "Test_Task_2", {"probability": 0.5})
+        new_task = test_component_graph.nodes["Test_Component_2"]["component"].task
+        assert new_task is not old_task
+        assert "_cached_probability" not in old_task.__dict__
+        assert new_task.cached_forward() == 0.5
+
     def test_add_new_edge(self, test_component_graph: ComponentGraph):
         """
         Tests the ComponentGraph's add_new_edge method
@@ -185,7 +262,7 @@ class TestComponentGraph():
             test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
             mocker (pytest-mock): A mocker object to create mocks
         """
-        mocker.patch("mimik.component_graph.component_graph.plt.figure")
+        mocker.patch("matplotlib.pyplot.figure")
         mock_draw = MagicMock()
         mock_to_agraph = MagicMock()
         mock_to_agraph = mocker.patch("networkx.nx_agraph.to_agraph")
@@ -218,7 +295,7 @@ class TestComponentGraph():
             test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
             mocker (pytest-mock): A mocker object to create mocks
         """
-        mocker.patch("mimik.component_graph.component_graph.plt.figure")
+        mocker.patch("matplotlib.pyplot.figure")
         mock_draw = MagicMock()
         mock_to_agraph = MagicMock()
         mock_to_agraph = mocker.patch("networkx.nx_agraph.to_agraph")
@@ -253,7 +330,7 @@ class TestComponentGraph():
             test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
             mocker (pytest-mock): A mocker object to create mocks
         """
-        mocker.patch("mimik.component_graph.component_graph.plt.figure")
+        mocker.patch("matplotlib.pyplot.figure")
         mock_draw = MagicMock()
         mock_to_agraph = MagicMock()
         mock_to_agraph = mocker.patch("networkx.nx_agraph.to_agraph")
@@ -1,8 +1,12 @@
 import builtins
 import os
+import numpy as np
 import pytest
+from mimik.component_graph.abstract_task import AbstractTask
 from mimik.component_graph.component_graph import ComponentGraph
 from mimik.component_graph.component_graph_capabilities import ComponentGraphCapabilities
+from mimik.component_graph.task_factory import TaskFactory
+from mimik.component_graph import monte_carlo_workers
 
 
 class TestComponentMetrics():
@@ -49,3 +53,330 @@ class TestComponentMetrics():
             assert (print_string == "Test_Component_1, Test_Component_2, Test_Component_3") or (print_string == "\nThere are 1 paths through the killweb")
         monkeypatch.setattr(builtins, 'print', mock_stdout)
         test_component_capabilities.print_all_paths()
+
+    def test_monte_carlo_simulation_vectorized(self, test_component_graph):
+        """
+        Tests the ComponentGraphCapabilities's monte_carlo_simulation method in vectorized mode
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        capabilities = ComponentGraphCapabilities(test_component_graph)
+        capabilities.monte_carlo_simulation(1000, vectorized=True)
+        outcomes = capabilities.get_monte_carlo_outcomes()["Test_Component_1, Test_Component_2, Test_Component_3"]
+        probabilities = capabilities.get_monte_carlo_probabilities()["Test_Component_1, Test_Component_2, Test_Component_3"]
+        assert outcomes.shape == (1000,)
+        assert outcomes.dtype == np.uint8
+        assert probabilities.shape == (1000, 3)
+        assert probabilities.dtype == np.float32
+        assert set(outcomes.tolist()) <= {1, 2, 3}
+        assert (probabilities[:, 2] == np.where(outcomes >= 2, np.float32(0.8), 0)).all()
+        assert 0.6 <= np.mean(outcomes == 3) <= 0.85
+
+    def test_monte_carlo_simulation_workers(self, test_component_graph):
+        """
+        Tests that a seeded monte_carlo_simulation gives the same results for any number of workers
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        capabilities = ComponentGraphCapabilities(test_component_graph)
+        path_string = "Test_Component_1, Test_Component_2, Test_Component_3"
+        for vectorized, shared_components in [(False, False), (True, False), (True, True)]:
+            capabilities.monte_carlo_simulation(500, vectorized, shared_components, seed=1234)
+            serial_outcomes = capabilities.get_monte_carlo_outcomes()[path_string]
+            assert capabilities.get_monte_carlo_seed() == 1234
+            capabilities.monte_carlo_simulation(500, vectorized, shared_components, workers=2, seed=1234)
+            parallel_outcomes = capabilities.get_monte_carlo_outcomes()[path_string]
+            assert np.array_equal(serial_outcomes, parallel_outcomes)
+        capabilities.shutdown_workers()
+
+    def test_invalid_graph(self, test_component_graph, mocker):
+        """
+        Tests that simulations on a graph with a component missing its task explain why and return nothing
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+            mocker (pytest_mock.MockerFixture): An object to patch print
+        """
+        test_component_graph.add_new_component("Taskless_Component", ["Test_Component_3"], ["Test_Component_1"], {})
+        test_component_graph.silent = False
+        mock_print = mocker.patch("builtins.print")
+        capabilities = ComponentGraphCapabilities(test_component_graph)
+        assert capabilities.monte_carlo_simulation(10) is None
+        assert capabilities.adaptive_monte_carlo_simulation(0.1) is None
+        assert capabilities.mission_success_probability(10) is None
+        assert mock_print.call_count == 3
+        assert mock_print.call_args[0][0].startswith("ComponentGraph was not valid")
+        assert len(capabilities.get_monte_carlo_summaries()) == 0
+
+    def test_spawned_worker_pool(self, tmp_path):
+        """
+        Tests that spawned workers load the task files of the tasks before unpickling them
+
+        Args:
+            tmp_path (Path): A temporary directory for the task file
+        """
+        (tmp_path / "spawn_task.py").write_text(
+            "from mimik.component_graph.abstract_task import AbstractTask\n\n"
+            "class Spawn_Task(AbstractTask):\n"
+            "    def __init__(self, arguments: dict):\n"
+            "        super().__init__(\"Spawn_Task\", arguments)\n\n"
+            "    def forward(self):\n"
+            "        return self.task_arguments[\"value\"]\n"
+        )
+        task_factory = TaskFactory(str(tmp_path), True)
+        tasks = {"Component": task_factory.create_task("Spawn_Task", {"value": 0.5})}
+        shard = (["Component"], 1000, False, False, None, np.random.SeedSequence(7))
+        pool = monte_carlo_workers.create_worker_pool(tasks, 2, "spawn")
+        try:
+            spawned_outcomes, _ = pool.submit(monte_carlo_workers.run_path_shard, *shard).result()
+        finally:
+            pool.shutdown()
+        serial_outcomes, _ = monte_carlo_workers.simulate_path_shard(tasks, *shard)
+        assert np.array_equal(spawned_outcomes, serial_outcomes)
+
+    def test_monte_carlo_simulation_without_probabilities(self, test_component_graph):
+        """
+        Tests the ComponentGraphCapabilities's monte_carlo_simulation method when probabilities are not stored
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        capabilities = ComponentGraphCapabilities(test_component_graph)
+        capabilities.monte_carlo_simulation(100, store_probabilities=False)
+        assert len(capabilities.get_monte_carlo_outcomes()["Test_Component_1, Test_Component_2, Test_Component_3"]) == 100
+        assert len(capabilities.get_monte_carlo_probabilities()) == 0
+
+    def test_monte_carlo_simulation_without_outcomes(self, test_component_graph):
+        """
+        Tests that monte_carlo_simulation only keeps summary statistics when outcomes are not stored
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        capabilities = ComponentGraphCapabilities(test_component_graph)
+        path_string = "Test_Component_1, Test_Component_2, Test_Component_3"
+        capabilities.monte_carlo_simulation(1000, vectorized=True, seed=5)
+        stored_summary = capabilities.get_monte_carlo_summaries()[path_string]
+        capabilities.monte_carlo_simulation(1000, vectorized=True, seed=5, store_outcomes=False)
+        assert len(capabilities.get_monte_carlo_outcomes()) == 0
+        assert len(capabilities.get_monte_carlo_probabilities()) == 0
+        streamed_summary = capabilities.get_monte_carlo_summaries()[path_string]
+        assert streamed_summary.num_iterations == 1000
+        assert streamed_summary.position_successes.tolist() == stored_summary.position_successes.tolist()
+        assert streamed_summary.average_num_success() == pytest.approx(stored_summary.average_num_success())
+
+    def test_analytic_path_statistics(self, test_component_graph):
+        """
+        Tests the ComponentGraphCapabilities's analytic_path_statistics method
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        capabilities = ComponentGraphCapabilities(test_component_graph)
+        probability_of_success, expected_success_events, completion_variance = capabilities.analytic_path_statistics()
+        path_string = "Test_Component_1, Test_Component_2, Test_Component_3"
+        assert probability_of_success[path_string] == pytest.approx(0.72)
+        assert expected_success_events[path_string] == pytest.approx(2.62)
+        assert completion_variance[path_string] == pytest.approx(0.72 * 0.28)
+
+    def test_detect_pure_tasks(self, test_component_graph):
+        """
+        Tests that tasks detected as pure are evaluated once by the ComponentGraphCapabilities's
+        monte_carlo_simulation method
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        class CountingTask(AbstractTask):
+            def __init__(self):
+                super().__init__("Counting_Task", {})
+                self.calls = 0
+
+            def forward(self):
+                self.calls += 1
+                return 0.9
+
+        task = CountingTask()
+        test_component_graph.nodes["Test_Component_2"]["component"].add_task(task)
+        capabilities = ComponentGraphCapabilities(test_component_graph)
+        assert capabilities.detect_pure_tasks() == ["Test_Component_2"]
+        assert task.pure
+        task.calls = 0
+        capabilities.monte_carlo_simulation(1000, seed=0)
+        capabilities.monte_carlo_simulation(1000, vectorized=True, seed=0)
+        assert task.calls == 1
+        outcomes = capabilities.get_monte_carlo_outcomes()["Test_Component_1, Test_Component_2, Test_Component_3"]
+        assert abs(np.mean(outcomes == 3) - 0.72) < 0.05
+
+    def test_most_probable_paths(self, test_component_graph):
+        """
+        Tests the ComponentGraphCapabilities's most_probable_paths method against the closed form
+        probability of every path, and the confirmation of its shortlist by monte_carlo_simulation
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        rng = np.random.default_rng(0)
+        for index in range(6):
+            test_component_graph.add_new_component(
+                "Extra_%d" % index,
+                ["Test_Component_3"] if index % 2 == 0 else ["Extra_%d" % (index - 1)],
+                ["Test_Component_1"] if index < 3 else ["Test_Component_2", "Extra_0"],
+                {"task": "Test_Task_2", "task_arguments": {"probability": float(rng.uniform(0.3, 1.0))}}
+            )
+        capabilities = ComponentGraphCapabilities(test_component_graph)
+        analytic_probabilities, _, _ = capabilities.analytic_path_statistics()
+        expected = sorted(analytic_probabilities.values(), reverse=True)
+        most_probable = capabilities.most_probable_paths(4)
+        assert [probability for _, probability in most_probable] == pytest.approx(expected[:4])
+        for path, probability in most_probable:
+            assert analytic_probabilities[", ".join(path)] == pytest.approx(probability)
+        cutoff = (expected[1] + expected[2]) / 2
+        assert len(capabilities.most_probable_paths(len(expected), min_probability=cutoff)) == 2
+        assert len(capabilities.most_probable_paths(100)) == len(expected)
+        shortlist = [path for path, _ in most_probable[:2]]
+        capabilities.monte_carlo_simulation(100, seed=0, paths=shortlist)
+        assert set(capabilities.get_monte_carlo_summaries()) == {", ".join(path) for path in shortlist}
+
+    @pytest.mark.parametrize("filename", ["results.npz", "results"])
+    def test_save_and_load_monte_carlo_results(self, test_component_graph, tmp_path, filename):
+        """
+        Tests that results saved by the ComponentGraphCapabilities can be loaded without simulating again
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+            tmp_path (pathlib.Path): A temporary directory
+            filename (str): The name of the .npz file or directory to save to
+        """
+        filename = str(tmp_path / filename)
+        path_string = "Test_Component_1, Test_Component_2, Test_Component_3"
+        capabilities = ComponentGraphCapabilities(test_component_graph)
+        capabilities.monte_carlo_simulation(500, seed=9)
+        capabilities.save_monte_carlo_results(filename)
+        loaded_capabilities = ComponentGraphCapabilities(test_component_graph)
+        assert loaded_capabilities.load_monte_carlo_results(filename, memory_map=True) == 9
+        assert np.array_equal(loaded_capabilities.get_monte_carlo_outcomes()[path_string], capabilities.get_monte_carlo_outcomes()[path_string])
+        assert np.array_equal(loaded_capabilities.get_monte_carlo_probabilities()[path_string], capabilities.get_monte_carlo_probabilities()[path_string])
+        loaded_summary = loaded_capabilities.get_monte_carlo_summaries()[path_string]
+        summary = capabilities.get_monte_carlo_summaries()[path_string]
+        assert loaded_summary.proportion_complete() == summary.proportion_complete()
+        assert loaded_summary.success_variance() == summary.success_variance()
+        capabilities.monte_carlo_simulation(500, seed=[9, 10], shared_components=True)
+        capabilities.save_monte_carlo_results(filename)
+        assert loaded_capabilities.load_monte_carlo_results(filename) == [9, 10]
+        assert np.array_equal(loaded_capabilities.get_monte_carlo_outcomes()[path_string], capabilities.get_monte_carlo_outcomes()[path_string])
+        assert len(loaded_capabilities.get_monte_carlo_probabilities()) == 0
+        test_component_graph.add_task_to_component("Test_Component_2", "Test_Task_2", {"probability": 0.5})
+        with pytest.raises(ValueError):
+            loaded_capabilities.load_monte_carlo_results(filename)
+
+    def test_parameter_sweep(self, test_component_graph):
+        """
+        Tests that the ComponentGraphCapabilities's parameter sweep swaps task arguments per scenario
+        without changing the graph, and gives the same results for any number of workers
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        capabilities = ComponentGraphCapabilities(test_component_graph)
+        scenarios = capabilities.task_scenarios("Test_Task_2", [{"probability": 0.0}, {"probability": 0.9}, {"probability": 1.0}])
+        assert scenarios == [{"Test_Component_2": {"probability": probability}} for probability in [0.0, 0.9, 1.0]]
+        table = capabilities.parameter_sweep(scenarios, 1000, seed=5)
+        assert table["scenario"].tolist() == [0, 1, 2]
+        assert table["path"] == ["Test_Component_1, Test_Component_2, Test_Component_3"] * 3
+        assert table["num_iterations"].tolist() == [1000, 1000, 1000]
+        assert table["probability"][0] == 0
+        assert table["average_num_success"][0] == 1
+        assert table["probability"][1] < table["probability"][2]
+        assert 0.75 <= table["probability"][2] <= 0.85
+        assert test_component_graph.nodes["Test_Component_2"]["component"].task.probability == 0.9
+        capabilities.monte_carlo_simulation(1000, vectorized=True, seed=5)
+        assert table["probability"][1] == capabilities.get_path_summary(
+            ["Test_Component_1", "Test_Component_2", "Test_Component_3"]
+        ).proportion_complete()
+        parallel_table = capabilities.parameter_sweep(scenarios, 1000, seed=5, workers=2)
+        capabilities.shutdown_workers()
+        assert np.array_equal(parallel_table["probability"], table["probability"])
+        with pytest.raises(KeyError):
+            capabilities.parameter_sweep([{"Missing_Component": {"probability": 0.5}}], 10)
+
+    def test_adaptive_monte_carlo_simulation(self, test_component_graph):
+        """
+        Tests the ComponentGraphCapabilities's adaptive_monte_carlo_simulation method
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        test_component_graph.add_new_component("Test_Component_2_2",  ["Test_Component_3"], ["Test_Component_1"], {"task": "Test_Task_2", "task_arguments": {"probability": 0.0}})
+        capabilities = ComponentGraphCapabilities(test_component_graph)
+        iterations_used = capabilities.adaptive_monte_carlo_simulation(0.02, batch_size=500, seed=3)
+        certain_path = "Test_Component_1, Test_Component_2_2, Test_Component_3"
+        uncertain_path = "Test_Component_1, Test_Component_2, Test_Component_3"
+        assert iterations_used[certain_path] == 500
+        assert iterations_used[uncertain_path] > 1000
+        assert len(capabilities.get_monte_carlo_outcomes()[uncertain_path]) == iterations_used[uncertain_path]
+        assert abs(capabilities.get_monte_carlo_summaries()[uncertain_path].proportion_complete() - 0.72) < 0.04
+        iterations_used = capabilities.adaptive_monte_carlo_simulation(0.0001, batch_size=500, max_iterations=1200, seed=3)
+        assert iterations_used[uncertain_path] == 1200
+
+    @pytest.mark.parametrize("sampler", ["antithetic", "latin_hypercube", "sobol"])
+    def test_monte_carlo_simulation_sampler(self, test_component_graph, sampler):
+        """
+        Tests the ComponentGraphCapabilities's monte_carlo_simulation method with a variance reduction sampler
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+            sampler (str): The name of the sampler to use
+        """
+        capabilities = ComponentGraphCapabilities(test_component_graph)
+        path_string = "Test_Component_1, Test_Component_2, Test_Component_3"
+        capabilities.monte_carlo_simulation(4096, seed=11, sampler=sampler)
+        outcomes = capabilities.get_monte_carlo_outcomes()[path_string]
+        assert abs(np.mean(outcomes == 3) - 0.72) < 0.02
+        capabilities.monte_carlo_simulation(4096, seed=11, sampler=sampler, shared_components=True)
+        assert abs(np.mean(capabilities.get_monte_carlo_outcomes()[path_string] == 3) - 0.72) < 0.02
+        capabilities.monte_carlo_simulation(4096, seed=11, sampler=sampler)
+        assert np.array_equal(outcomes, capabilities.get_monte_carlo_outcomes()[path_string])
+
+    def test_importance_sampling_simulation(self, test_component_graph):
+        """
+        Tests the ComponentGraphCapabilities's importance_sampling_simulation method on a rare-success path
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        for component_name in ["Test_Component_1", "Test_Component_2", "Test_Component_3"]:
+            test_component_graph.add_task_to_component(component_name, "Rare_Task", {"probability": 0.02})
+        capabilities = ComponentGraphCapabilities(test_component_graph)
+        estimates = capabilities.importance_sampling_simulation(10000, seed=0)
+        estimate = estimates["Test_Component_1, Test_Component_2, Test_Component_3"]
+        assert estimate["tilt"] == pytest.approx(np.log(0.5) / np.log(0.02 ** 3))
+        assert estimate["probability"] == pytest.approx(8e-6, rel=0.1)
+        assert estimate["relative_error"] < 0.05
+        failure_error = estimate["failure_relative_error"] * estimate["failure_probability"]
+        assert abs(estimate["failure_probability"] - (1 - 8e-6)) < 4 * failure_error
+        for seed in range(5):
+            short_estimate = capabilities.importance_sampling_simulation(100, seed=seed)["Test_Component_1, Test_Component_2, Test_Component_3"]
+            assert type(short_estimate["probability"]) is float and type(short_estimate["failure_probability"]) is float
+            assert 0 <= short_estimate["probability"] <= 1 and 0 <= short_estimate["failure_probability"] <= 1
+        naive_estimate = capabilities.importance_sampling_simulation(10000, tilt=1.0, seed=0)
+        assert naive_estimate["Test_Component_1, Test_Component_2, Test_Component_3"]["relative_error"] > estimate["relative_error"]
+
+    def test_mission_success_probability(self, test_component_graph):
+        """
+        Tests the ComponentGraphCapabilities's mission_success_probability method
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        test_component_graph.add_new_component("Test_Component_2_2",  ["Test_Component_3"], ["Test_Component_1"], {"task": "Test_Task_2", "task_arguments": {"probability": 0.5}})
+        test_component_graph.add_new_component("Test_Component_3_2", [], ["Test_Component_2_2"], {"task": "Test_Task_3", "task_arguments": {"probability": 0.4}})
+        capabilities = ComponentGraphCapabilities(test_component_graph)
+        mission_probability = capabilities.mission_success_probability(20000, seed=0)
+        assert abs(mission_probability - (0.8 * (1 - 0.1 * 0.5) + 0.5 * 0.4 - 0.8 * 0.5 * 0.4)) < 0.015
+        single_end_probability = capabilities.mission_success_probability(20000, end_components=["Test_Component_3"], seed=0)
+        assert abs(single_end_probability - 0.8 * (1 - 0.1 * 0.5)) < 0.015
+        start_probability = capabilities.mission_success_probability(20000, start_components=["Test_Component_2"], seed=0)
+        assert abs(start_probability - 0.9 * 0.8) < 0.015
@@ -112,6 +112,69 @@ T
         variance = round(test_metrics.calculate_variance(["Test_Component_1", "Test_Component_2", "Test_Component_3"]), 2)
         assert 0.05 <= variance <= 1.5
 
+    def test_metrics_without_outcomes(self, test_component_capabilities):
+        """
+        Tests that the ComponentGraphMetrics are answered from summaries when outcomes are not stored
+
+        Args:
+            test_component_capabilities (ComponetGraphCapabilities): The test_component_capabilities returned from the fixture
+        """
+        test_component_capabilities.monte_carlo_simulation(1000, store_outcomes=False)
+        test_metrics = ComponentGraphMetrics(test_component_capabilities)
+        path = ["Test_Component_1", "Test_Component_2", "Test_Component_3"]
+        probability_of_success, average_success_events = test_metrics.calc_stats_of_paths()
+        assert 0.6 <= probability_of_success[", ".join(path)] <= 0.85
+        assert 2.5 <= average_success_events[", ".join(path)] <= 2.8
+        assert 0.1 <= test_metrics.calculate_variance(path) <= 0.25
+
+    def test_get_path_statistics(self, test_component_capabilities, test_metrics):
+        """
+        Tests that the ComponentGraphMetrics's path statistics are cached until the next simulation
+
+        Args:
+            test_component_capabilities (ComponetGraphCapabilities): The test_component_capabilities returned from the fixture
+            test_metrics (ComponentGraphMetrics): The test_metrics returned from the fixture
+        """
+        statistics = test_metrics.get_path_statistics()
+        assert test_metrics.get_path_statistics() is statistics
+        assert test_metrics.calc_stats_of_paths() == test_metrics.calc_stats_of_paths()
+        test_component_capabilities.monte_carlo_simulation(100, seed=1)
+        assert test_metrics.get_path_statistics() is not statistics
+        probability_of_success, _ = test_metrics.calc_stats_of_paths()
+        assert list(probability_of_success.values()) == test_metrics.get_path_statistics().probabilities.tolist()
+
+    def test_confidence_intervals(self, test_metrics):
+        """
+        Tests that the ComponentGraphMetrics's confidence intervals contain each path's estimates
+
+        Args:
+            test_metrics (ComponentGraphMetrics): The test_metrics returned from the fixture
+        """
+        probability_of_success, average_success_events = test_metrics.calc_stats_of_paths()
+        for method in ["wilson", "clopper-pearson"]:
+            intervals = test_metrics.calc_confidence_intervals_of_paths(method=method)
+            assert intervals.keys() == probability_of_success.keys()
+            for path_string, (lower, upper) in intervals.items():
+                assert lower <= probability_of_success[path_string] <= upper
+        for path_string, (lower, upper) in test_metrics.bootstrap_average_num_success(seed=0).items():
+            assert lower <= average_success_events[path_string] <= upper
+
+    def test_metrics_with_separator_in_component_name(self, test_component_graph):
+        """
+        Tests that the ComponentGraphMetrics look paths up by their components rather than their strings
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        test_component_graph.add_new_component("Test, Component", ["Test_Component_3"], ["Test_Component_1"], {"task": "Test_Task_2", "task_arguments": {"probability": 1.0}})
+        capabilities = ComponentGraphCapabilities(test_component_graph)
+        capabilities.monte_carlo_simulation(100, seed=0)
+        test_metrics = ComponentGraphMetrics(capabilities)
+        path = ["Test_Component_1", "Test, Component", "Test_Component_3"]
+        assert capabilities.get_path_summary(path).path_length == 3
+        assert test_metrics.proportion_complete(path) == capabilities.get_monte_carlo_summaries()[", ".join(path)].proportion_complete()
+        assert len(test_metrics.calc_stats_of_paths()[0]) == 2
+
     def test_plot_MC_distribution(self, test_metrics, mocker):
         """
         Tests the ComponentGraphMetrics's plot_MC_distribution method
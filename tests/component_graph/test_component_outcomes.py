@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from mimik.component_graph.component_outcomes import ComponentOutcomes
+
+
+class TestComponentOutcomes:
+    """
+    A class to test the ComponentOutcomes class
+    """
+
+    @pytest.fixture
+    def test_component_outcomes(self) -> ComponentOutcomes:
+        """
+        Creates a ComponentOutcomes object over 10 iterations of 3 components
+
+        Returns:
+            ComponentOutcomes: The test ComponentOutcomes object
+        """
+        successes = np.array([
+            [1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+            [1, 0, 1, 0, 1, 0, 1, 0, 1, 0],
+            [1, 1, 0, 0, 1, 1, 0, 0, 1, 1]
+        ], dtype=bool)
+        paths = {0: ["A", "B", "C"], 1: ["A", "C"]}
+        return ComponentOutcomes(["A", "B", "C"], np.packbits(successes, axis=1), 10, paths)
+
+    def test_getitem(self, test_component_outcomes: ComponentOutcomes):
+        """
+        Tests the ComponentOutcomes's __getitem__ method
+
+        Args:
+            test_component_outcomes (ComponentOutcomes): The test_component_outcomes returned from the fixture
+        """
+        assert test_component_outcomes[0].tolist() == [3, 1, 2, 1, 3, 1, 2, 1, 3, 1]
+        assert test_component_outcomes[1].tolist() == [2, 2, 1, 1, 2, 2, 1, 1, 2, 2]
+
+    def test_mapping(self, test_component_outcomes: ComponentOutcomes):
+        """
+        Tests the ComponentOutcomes's mapping methods
+
+        Args:
+            test_component_outcomes (ComponentOutcomes): The test_component_outcomes returned from the fixture
+        """
+        assert len(test_component_outcomes) == 2
+        assert list(test_component_outcomes) == [0, 1]
+        with pytest.raises(KeyError):
+            test_component_outcomes[2]
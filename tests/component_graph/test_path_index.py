@@ -0,0 +1,145 @@
+import os
+import random
+import networkx as nx
+import pytest
+from mimik.component_graph.component_graph import ComponentGraph
+
+
+class TestPathIndex:
+    """
+    A class to test the PathIndex class
+    """
+
+    @pytest.fixture
+    def test_component_graph(self) -> ComponentGraph:
+        """
+        Creates the ComponentGraph object
+
+        Returns:
+            ComponentGraph: A ComponentGraph object to be used for testing
+        """
+        component_graph = ComponentGraph(working_dir=os.path.join(".", "tests"), silent=True)
+        component_graph.load_killweb_from_config_file(os.path.join(".", "tests", "test_configs", "test_json.json"))
+        return component_graph
+
+    def all_paths(self, graph: ComponentGraph) -> set:
+        """
+        Computes every path of a graph from scratch
+
+        Args:
+            graph (ComponentGraph): The graph to compute the paths of
+
+        Returns:
+            set: The set of path tuples
+        """
+        return {
+            tuple(path)
+            for start_component in graph.get_start_components()
+            for end_component in graph.get_end_components()
+            for path in nx.all_simple_paths(graph, start_component, end_component)
+        }
+
+    def test_get_paths(self, test_component_graph: ComponentGraph):
+        """
+        Tests the paths of the PathIndex after each kind of mutation
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        assert test_component_graph.get_all_paths() == [["Test_Component_1", "Test_Component_2", "Test_Component_3"]]
+        test_component_graph.add_new_component("Test_Component_2_2", ["Test_Component_3"], ["Test_Component_1"], {})
+        assert self.all_paths(test_component_graph) == set(map(tuple, test_component_graph.get_all_paths()))
+        test_component_graph.remove_existing_edge("Test_Component_2", "Test_Component_3")
+        assert self.all_paths(test_component_graph) == set(map(tuple, test_component_graph.get_all_paths()))
+        test_component_graph.remove_component("Test_Component_1")
+        assert self.all_paths(test_component_graph) == set(map(tuple, test_component_graph.get_all_paths()))
+
+    def test_bulk_removal(self, test_component_graph: ComponentGraph):
+        """
+        Tests the paths of the PathIndex after the inherited bulk removal and clearing methods
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        test_component_graph.add_edges_from([("A", "B"), ("B", "D"), ("A", "C"), ("C", "D"), ("A", "E"), ("E", "D")])
+        assert self.all_paths(test_component_graph) == set(map(tuple, test_component_graph.get_all_paths()))
+        test_component_graph.remove_edges_from([("A", "B")])
+        assert self.all_paths(test_component_graph) == set(map(tuple, test_component_graph.get_all_paths()))
+        test_component_graph.remove_nodes_from(["C", "Missing_Component"])
+        assert self.all_paths(test_component_graph) == set(map(tuple, test_component_graph.get_all_paths()))
+        assert ["A", "E", "D"] in test_component_graph.get_all_paths()
+        test_component_graph.clear_edges()
+        assert self.all_paths(test_component_graph) == set(map(tuple, test_component_graph.get_all_paths()))
+        test_component_graph.clear()
+        assert test_component_graph.get_all_paths() == []
+
+    def test_path_ids(self, test_component_graph: ComponentGraph):
+        """
+        Tests that the PathIndex's path IDs and component indices are stable across mutations
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        path_index = test_component_graph.path_index
+        path = ["Test_Component_1", "Test_Component_2", "Test_Component_3"]
+        path_id = path_index.get_path_id(path)
+        assert path_index.get_path_ids() == [path_id]
+        assert path_index.get_path(path_id) == path
+        assert path_index.format_path(path_id) == "Test_Component_1, Test_Component_2, Test_Component_3"
+        assert [path_index.get_component_name(index) for index in path_index.get_encoded_path(path_id)] == path
+        test_component_graph.add_new_component("Test_Component_2_2", ["Test_Component_3"], ["Test_Component_1"], {})
+        assert path_index.get_path_id(path) == path_id
+        assert len(set(path_index.get_path_ids())) == 2
+        test_component_graph.remove_existing_edge("Test_Component_1", "Test_Component_2")
+        with pytest.raises(KeyError):
+            path_index.get_path_id(path)
+        assert path_index.get_path(path_id) == path
+        test_component_graph.add_new_edge("Test_Component_1", "Test_Component_2")
+        assert path_index.get_path_id(path) == path_id
+
+    def test_iter_paths_and_count_paths(self, test_component_graph: ComponentGraph):
+        """
+        Tests the PathIndex's lazy iteration and path counting on acyclic and cyclic graphs
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        for layer in range(4):
+            for index in range(3):
+                for next_index in range(3):
+                    test_component_graph.add_edge("Layer_%d_%d" % (layer, index), "Layer_%d_%d" % (layer + 1, next_index))
+        paths = test_component_graph.iter_paths()
+        assert not isinstance(paths, list)
+        paths = list(paths)
+        assert set(map(tuple, paths)) == self.all_paths(test_component_graph)
+        assert test_component_graph.count_paths() == len(paths) == 1 + 3 ** 5
+        test_component_graph.add_edge("Layer_2_0", "Layer_1_0")
+        assert test_component_graph.count_paths() == len(self.all_paths(test_component_graph))
+        assert set(map(tuple, test_component_graph.iter_paths())) == self.all_paths(test_component_graph)
+
+    def test_random_mutations(self, test_component_graph: ComponentGraph):
+        """
+        Tests that the PathIndex matches a full recomputation over random mutations, including cycles
+
+        Args:
+            test_component_graph (ComponentGraph): The test_component_graph returned from the fixture
+        """
+        rng = random.Random(0)
+        names = ["Component_%d" % index for index in range(8)]
+        for _ in range(200):
+            action = rng.random()
+            from_component, to_component = rng.sample(names, 2)
+            if action < 0.5:
+                if from_component not in test_component_graph.nodes:
+                    test_component_graph.add_new_component(from_component, [], [], {})
+                if to_component not in test_component_graph.nodes:
+                    test_component_graph.add_new_component(to_component, [], [], {})
+                test_component_graph.add_new_edge(from_component, to_component)
+            elif action < 0.8:
+                test_component_graph.remove_existing_edge(from_component, to_component)
+            elif from_component in test_component_graph.nodes:
+                test_component_graph.remove_component(from_component)
+            if rng.random() < 0.5:
+                paths = test_component_graph.get_all_paths()
+                assert len(paths) == len(set(map(tuple, paths)))
+                assert self.all_paths(test_component_graph) == set(map(tuple, paths))
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from mimik.component_graph.path_summary import PathSummary
+from mimik.component_graph.path_statistics import PathStatistics
+
+
+class TestPathStatistics:
+    """
+    A class to test the PathStatistics class
+    """
+
+    def test_from_summaries(self):
+        """
+        Tests that the PathStatistics columns match the statistics of each PathSummary
+        """
+        summaries = {
+            4: PathSummary.from_outcomes(np.array([3, 1, 3, 3], dtype=np.uint8), 3),
+            1: PathSummary.from_outcomes(np.array([0, 2, 2, 1], dtype=np.uint8), 2),
+            7: PathSummary.from_outcomes(np.array([1, 1, 0, 1], dtype=np.uint8), 1)
+        }
+        statistics = PathStatistics.from_summaries(summaries)
+        assert len(statistics) == 3
+        assert statistics.path_ids.tolist() == [4, 1, 7]
+        assert statistics.num_iterations.tolist() == [4, 4, 4]
+        assert statistics.probabilities.tolist() == [summary.proportion_complete() for summary in summaries.values()]
+        assert statistics.average_successes.tolist() == [summary.average_num_success() for summary in summaries.values()]
+        assert statistics.first_failure_counts.tolist() == [[0, 1, 0, 3], [1, 1, 2, 0], [1, 3, 0, 0]]
+
+    def test_sort_and_top_n(self):
+        """
+        Tests the PathStatistics's sort_by_probability and top_n methods
+        """
+        completions = np.array([2, 9, 5, 7, 1])
+        statistics = PathStatistics(np.arange(5), np.full(5, 10), completions, completions * 0.3, np.zeros((5, 2), dtype=np.int64))
+        assert statistics.sort_by_probability().path_ids.tolist() == [4, 0, 2, 3, 1]
+        top_paths = statistics.top_n(3)
+        assert top_paths.path_ids.tolist() == [1, 3, 2]
+        assert [row[1] for row in top_paths.rows()] == [0.9, 0.7, 0.5]
+        assert len(statistics.top_n(10)) == 5
+        assert len(statistics.top_n(0)) == 0
+
+    def test_probability_intervals(self):
+        """
+        Tests the PathStatistics's Wilson and Clopper-Pearson intervals against known values
+        """
+        statistics = PathStatistics(np.arange(3), np.array([100, 20, 50]), np.array([50, 0, 50]), np.zeros(3), np.zeros((3, 2), dtype=np.int64))
+        lower, upper = statistics.probability_intervals()
+        assert lower[0] == pytest.approx(0.4038, abs=1e-4)
+        assert upper[0] == pytest.approx(0.5962, abs=1e-4)
+        assert lower[1] == pytest.approx(0) and upper[2] == pytest.approx(1)
+        lower, upper = statistics.probability_intervals(method="clopper-pearson")
+        assert lower[0] == pytest.approx(0.3983, abs=1e-4)
+        assert upper[0] == pytest.approx(0.6017, abs=1e-4)
+        assert lower[1] == 0 and upper[1] == pytest.approx(0.1684, abs=1e-4)
+        assert upper[2] == 1 and lower[2] == pytest.approx(0.9289, abs=1e-4)
+        with pytest.raises(KeyError):
+            statistics.probability_intervals(method="normal")
+
+    def test_bootstrap_average_successes(self):
+        """
+        Tests that the PathStatistics's bootstrap intervals contain the average and are reproducible
+        """
+        summaries = {
+            0: PathSummary.from_outcomes(np.tile(np.array([3, 1, 2, 0], dtype=np.uint8), 100), 3),
+            1: PathSummary.from_outcomes(np.full(50, 2, dtype=np.uint8), 2)
+        }
+        statistics = PathStatistics.from_summaries(summaries)
+        lower, upper = statistics.bootstrap_average_successes(num_resamples=500, seed=3)
+        assert lower[0] < 1.5 < upper[0]
+        assert upper[0] - lower[0] == pytest.approx(2 * 1.96 * np.sqrt(1.25 / 400), rel=0.2)
+        assert lower[1] == upper[1] == 2
+        assert np.array_equal(statistics.bootstrap_average_successes(num_resamples=500, seed=3)[0], lower)
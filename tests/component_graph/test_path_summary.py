@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from mimik.component_graph.path_summary import PathSummary
+
+
+class TestPathSummary:
+    """
+    A class to test the PathSummary class
+    """
+
+    @pytest.fixture
+    def test_outcomes(self) -> np.ndarray:
+        """
+        Creates the first failure indices of 10 iterations of a path of 3 components
+
+        Returns:
+            np.ndarray: The test outcomes
+        """
+        return np.array([3, 1, 2, 1, 3, 0, 2, 1, 3, 3], dtype=np.uint8)
+
+    def test_from_outcomes(self, test_outcomes: np.ndarray):
+        """
+        Tests the PathSummary's statistics after creation from outcomes
+
+        Args:
+            test_outcomes (np.ndarray): The test_outcomes returned from the fixture
+        """
+        summary = PathSummary.from_outcomes(test_outcomes, 3)
+        assert summary.num_iterations == 10
+        assert summary.proportion_complete() == 0.4
+        assert summary.average_num_success() == pytest.approx(1.9)
+        assert summary.success_variance() == pytest.approx(np.var(test_outcomes))
+        assert summary.completion_variance() == pytest.approx(0.24)
+        assert summary.position_proportions().tolist() == [0.9, 0.6, 0.4]
+
+    def test_update_and_merge(self, test_outcomes: np.ndarray):
+        """
+        Tests that batched updates and merges match a summary of all outcomes at once
+
+        Args:
+            test_outcomes (np.ndarray): The test_outcomes returned from the fixture
+        """
+        summary = PathSummary(3)
+        summary.update(test_outcomes[:3])
+        summary.update(test_outcomes[3:6])
+        other_summary = PathSummary.from_outcomes(test_outcomes[6:], 3)
+        summary.merge(other_summary)
+        full_summary = PathSummary.from_outcomes(test_outcomes, 3)
+        assert summary.num_iterations == full_summary.num_iterations
+        assert summary.average_num_success() == pytest.approx(full_summary.average_num_success())
+        assert summary.success_variance() == pytest.approx(full_summary.success_variance())
+        assert summary.position_successes.tolist() == full_summary.position_successes.tolist()
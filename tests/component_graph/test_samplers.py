@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from mimik.component_graph.samplers import SAMPLERS, AntitheticSampler, StratifiedSampler, get_sampler
+
+
+class TestSamplers:
+    """
+    A class to test the sampling strategies
+    """
+
+    @pytest.mark.parametrize("sampler_name", list(SAMPLERS.keys()))
+    def test_uniforms(self, sampler_name):
+        """
+        Tests that every sampler draws reproducible uniform variates of the requested shape
+
+        Args:
+            sampler_name (str): The name of the sampler to test
+        """
+        sampler = get_sampler(sampler_name)
+        uniforms = sampler.uniforms(64, 5, np.random.default_rng(0))
+        assert uniforms.shape == (64, 5)
+        assert ((uniforms >= 0) & (uniforms < 1)).all()
+        assert np.array_equal(uniforms, sampler.uniforms(64, 5, np.random.default_rng(0)))
+        assert abs(np.mean(uniforms) - 0.5) < 0.1
+        assert sampler.uniforms(8, 0, np.random.default_rng(0)).shape == (8, 0)
+
+    def test_antithetic_sampler(self):
+        """
+        Tests that the AntitheticSampler pairs each draw with its complement
+        """
+        uniforms = AntitheticSampler().uniforms(10, 3, np.random.default_rng(0))
+        assert np.allclose(uniforms[:5] + uniforms[5:], 1)
+
+    def test_stratified_sampler(self):
+        """
+        Tests that the StratifiedSampler places one draw of the first dimension in each stratum
+        """
+        uniforms = StratifiedSampler().uniforms(10, 2, np.random.default_rng(0))
+        assert sorted(np.floor(uniforms[:, 0] * 10).astype(int).tolist()) == list(range(10))
+
+    def test_get_sampler(self):
+        """
+        Tests the get_sampler function
+        """
+        sampler = AntitheticSampler()
+        assert get_sampler(sampler) is sampler
+        with pytest.raises(KeyError):
+            get_sampler("bad_sampler")
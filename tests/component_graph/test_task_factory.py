@@ -1,5 +1,13 @@
 import pytest
 import os
+import importlib.util
+import pickle
+import sys
+import types
+import numpy as np
+from unittest.mock import MagicMock
+from mimik.component_graph import task_factory
+from mimik.component_graph.abstract_task import AbstractTask
 from mimik.component_graph.task_factory import TaskFactory
 
 class TestTaskFactory:
@@ -23,4 +31,114 @@ class TestTaskFactory:
         assert found_task.forward() == 3
         assert not_found_task.forward() == 1.0
         with pytest.raises(KeyError):
-            error_task = test_task_factory.create_task("Random", {'bad_parameter': "ABC123"})
\ No newline at end of file
+            error_task = test_task_factory.create_task("Random", {'bad_parameter': "ABC123"})
+
+    def test_forward_batch_fallback(self, test_task_factory):
+        """
+        Tests that forward_batch falls back to calling a task's forward function once per execution
+        """
+        found_task = test_task_factory.create_task("Random", {'x': 0.25, 'y': 0.5})
+        assert found_task.forward_batch(4).tolist() == [0.75] * 4
+
+    def test_is_deterministic(self, test_task_factory):
+        """
+        Tests that is_deterministic probes a task's forward function for repeatable probabilities
+        """
+        found_task = test_task_factory.create_task("Random", {'x': 0.25, 'y': 0.5})
+        assert found_task.is_deterministic()
+        found_task.forward = lambda: np.random.random()
+        assert not found_task.is_deterministic()
+
+    def test_shared_task_instances(self, test_task_factory, monkeypatch):
+        """
+        Tests that tasks with the same name and arguments share an instance unless their class opts out
+        """
+        task = test_task_factory.create_task("Random", {'x': 1, 'y': 2})
+        assert test_task_factory.create_task("Random", {'y': 2, 'x': 1}) is task
+        assert test_task_factory.create_task("Random", {'x': 1, 'y': 3}) is not task
+        assert test_task_factory.create_task("Random", {'x': 1.5, 'y': 2}) is not task
+        static_task = test_task_factory.create_task("Static", {'probability': 0.5})
+        assert test_task_factory.create_task("Static", {'probability': 0.5}) is not static_task
+        monkeypatch.setattr(test_task_factory.localizers["Random"], "shareable", False)
+        assert test_task_factory.create_task("Random", {'x': 1, 'y': 2}) is not task
+        del task
+        assert len(test_task_factory.task_instances) == 0
+        assert task_factory.hash_task_arguments({1: 'a', 'b': 2}) is None
+        assert task_factory.hash_task_arguments({'x': object()}) is None
+        first_array, second_array = np.zeros(2000), np.zeros(2000)
+        second_array[1000] = 1
+        assert task_factory.hash_task_arguments({'x': first_array}) != task_factory.hash_task_arguments({'x': second_array})
+        assert task_factory.hash_task_arguments({'x': first_array}) == task_factory.hash_task_arguments({'x': np.zeros(2000)})
+        assert task_factory.hash_task_arguments({'x': first_array}) != task_factory.hash_task_arguments({'x': np.zeros(2000, dtype=np.float32)})
+
+    def test_task_discovery_cache(self, tmp_path, mocker):
+        """
+        Tests that a task file with several classes is imported once and only reloaded when its contents change
+        """
+        task_file = tmp_path / "multi_task.py"
+        task_file.write_text(
+            "from mimik.component_graph.abstract_task import AbstractTask\n"
+            "from mimik.component_graph import abstract_task\n\n"
+            "class Helper:\n    pass\n\n"
+            "class First(AbstractTask):\n    pass\n\n"
+            "class Second(abstract_task.AbstractTask):\n    pass\n"
+        )
+        spy = mocker.spy(importlib.util, "spec_from_file_location")
+        localizers = TaskFactory(str(tmp_path), True).localizers
+        assert {"First", "Second"} <= localizers.keys() and "Helper" not in localizers
+        assert spy.call_count == 1
+        first_class = localizers["First"]
+        os.utime(task_file, ns=(os.stat(task_file).st_atime_ns, os.stat(task_file).st_mtime_ns + 10 ** 9))
+        assert TaskFactory(str(tmp_path), True).localizers["First"] is first_class
+        assert spy.call_count == 1
+        task_file.write_text(task_file.read_text() + "\nclass Third(AbstractTask):\n    pass\n")
+        os.utime(task_file, ns=(os.stat(task_file).st_atime_ns, os.stat(task_file).st_mtime_ns + 2 * 10 ** 9))
+        localizers = TaskFactory(str(tmp_path), True).localizers
+        assert "Third" in localizers and localizers["First"] is not first_class
+        assert spy.call_count == 2
+
+    def test_task_module_names(self, tmp_path):
+        """
+        Tests that task files with the same name in different folders are imported as distinct modules
+        """
+        task_classes = []
+        for folder_name in ["first", "second"]:
+            task_folder = tmp_path / folder_name
+            task_folder.mkdir()
+            (task_folder / "types.py").write_text(
+                "from mimik.component_graph.abstract_task import AbstractTask\n\n"
+                "class %sTask(AbstractTask):\n    pass\n" % folder_name.capitalize()
+            )
+            task_classes.append(TaskFactory(str(task_folder), True).localizers[folder_name.capitalize() + "Task"])
+        first_class, second_class = task_classes
+        assert first_class.__module__ != second_class.__module__
+        assert sys.modules["types"] is types
+        assert pickle.loads(pickle.dumps(first_class)) is first_class
+        assert pickle.loads(pickle.dumps(second_class)) is second_class
+
+    def test_entry_point_tasks(self, monkeypatch, test_task_factory):
+        """
+        Tests that task classes registered through entry points are available and overridden by the task folder
+        """
+        class Installed(AbstractTask):
+            def __init__(self, arguments: dict):
+                super().__init__("Installed", arguments)
+
+        class Random(AbstractTask):
+            pass
+
+        installed_entry_point = MagicMock()
+        installed_entry_point.name = "Installed"
+        installed_entry_point.load.return_value = Installed
+        random_entry_point = MagicMock()
+        random_entry_point.name = "Random"
+        random_entry_point.load.return_value = Random
+        all_entry_points = MagicMock()
+        all_entry_points.select.return_value = [installed_entry_point, random_entry_point]
+        monkeypatch.setattr(task_factory, "_entry_point_tasks", None)
+        monkeypatch.setattr(task_factory, "entry_points", lambda: all_entry_points)
+        factory = TaskFactory(os.path.join(os.getcwd(), "tests", "test_tasks"), True)
+        all_entry_points.select.assert_called_with(group="mimik.tasks")
+        assert isinstance(factory.create_task("Installed", {}), Installed)
+        assert factory.localizers["Random"] is test_task_factory.localizers["Random"]
+        assert TaskFactory("missing_task_folder", True).localizers.keys() == {"Installed", "Random"}
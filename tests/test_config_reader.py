@@ -0,0 +1,65 @@
+import json
+import os
+import pytest
+from mimik.config_reader import iter_config_components, read_config
+
+
+class TestConfigReader:
+    """
+    A class to test the config_reader module
+    """
+
+    @pytest.fixture
+    def test_config_file(self) -> str:
+        """
+        Returns the path of the test config file
+
+        Returns:
+            str: The path of the test config file
+        """
+        return os.path.join("tests", "test_configs", "test_json.json")
+
+    def test_read_config(self, test_config_file: str):
+        """
+        Tests that read_config matches the standard library's parser
+
+        Args:
+            test_config_file (str): The test_config_file returned from the fixture
+        """
+        with open(test_config_file, 'r') as file:
+            assert read_config(test_config_file) == json.load(file)
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+    def test_iter_config_components(self, test_config_file: str, chunk_size: int):
+        """
+        Tests that streamed components match the parsed config for any chunk size
+
+        Args:
+            test_config_file (str): The test_config_file returned from the fixture
+            chunk_size (int): The number of characters read at a time
+        """
+        with open(test_config_file, 'r') as file:
+            data = json.load(file)
+        components = list(iter_config_components(test_config_file, chunk_size))
+        assert components == [
+            ("TestKillweb", component_name, component_config)
+            for component_name, component_config in data["TestKillweb"].items()
+        ]
+
+    def test_iter_config_components_edge_cases(self, tmp_path):
+        """
+        Tests streaming empty and malformed config files
+
+        Args:
+            tmp_path (pathlib.Path): A temporary directory
+        """
+        config_file = str(tmp_path / "config.json")
+        for contents, components in [("{}", []), ('{"killweb": {}}', []), ('{"killweb": {"A": {"connected_components": []}}, "other": {}}', [("killweb", "A", {"connected_components": []})])]:
+            with open(config_file, 'w') as file:
+                file.write(contents)
+            assert list(iter_config_components(config_file)) == components
+        for contents in ["[]", '{"killweb": {"A": {"connected_components": []}', '{"killweb": {"A" {}}}']:
+            with open(config_file, 'w') as file:
+                file.write(contents)
+            with pytest.raises(ValueError):
+                list(iter_config_components(config_file))
@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+
+
+class TestImports:
+    """
+    A class for testing that importing MIMIK stays fast by deferring heavy optional imports
+    """
+
+    def run_python(self, code: str, **environment) -> str:
+        """
+        Runs code in a fresh interpreter, so that modules imported by other tests are not counted
+
+        Args:
+            code (str): The code to run
+            environment (dict): Environment variables to set
+
+        Returns:
+            str: The standard output of the interpreter
+        """
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=dict(os.environ, **environment)
+        )
+        return result.stdout.strip()
+
+    def test_import_killweb(self):
+        """
+        Tests that importing the Killweb does not import matplotlib, scipy or pygraphviz
+        """
+        loaded_modules = self.run_python(
+            "import sys, mimik.killweb; print(sorted(name for name in ('matplotlib', 'scipy', 'pygraphviz') if name in sys.modules))"
+        )
+        assert loaded_modules == "[]"
+
+    def test_headless_killweb(self):
+        """
+        Tests that a headless Killweb simulates without importing matplotlib and refuses to plot
+        """
+        loaded_modules = self.run_python(
+            "import os, sys\n"
+            "from mimik.killweb import Killweb\n"
+            "killweb = Killweb(working_dir='tests', config_file=os.path.join('tests', 'test_configs', 'test_json.json'), silent=True)\n"
+            "killweb.monte_carlo_on_paths(10, seed=0)\n"
+            "killweb.get_probabilities_of_paths()\n"
+            "try:\n"
+            "    killweb.create_component_networkx_visualization()\n"
+            "except RuntimeError:\n"
+            "    print('matplotlib' in sys.modules)\n",
+            MIMIK_HEADLESS="1"
+        )
+        assert loaded_modules == "False"
+
+    def test_task_factory_in_fresh_interpreter(self):
+        """
+        Tests that task folders load without relying on modules imported by plotting libraries
+        """
+        task_names = self.run_python(
+            "import os\n"
+            "from mimik.component_graph.task_factory import TaskFactory\n"
+            "print(sorted(TaskFactory(os.path.join('tests', 'test_tasks'), True).localizers))"
+        )
+        assert task_names == "['Random']"
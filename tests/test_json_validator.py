@@ -32,4 +32,18 @@ class TestJsonValidator:
 
         with pytest.raises(jsonschema.exceptions.ValidationError):
             test_json_validator.validate_config(os.path.join("tests", "test_configs", "invalid_config.json"), False)
-            mock_print.assert_called_with("JSON data is invalid:")
\ No newline at end of file
+            mock_print.assert_called_with("JSON data is invalid:")
+
+    def test_validate_component(self, test_json_validator, mocker):
+        """
+        Tests the JsonValidator's validate_config return value and validate_component method
+
+        Args:
+            test_json_validator (JsonValidator): The JsonValidator for test provided by the fixture
+        """
+        mocker.patch("builtins.print")
+        data = test_json_validator.validate_config(os.path.join("tests", "test_configs", "test_json.json"), True)
+        for component_name, component_config in data["TestKillweb"].items():
+            test_json_validator.validate_component("TestKillweb", component_name, component_config)
+        with pytest.raises(jsonschema.exceptions.ValidationError):
+            test_json_validator.validate_component("TestKillweb", "Test_Component", {"connected_components": [1]})
@@ -1,6 +1,8 @@
 import os
 import builtins
+import numpy as np
 import pytest
+import jsonschema
 import networkx as nx
 from unittest.mock import MagicMock
 from mimik.killweb import Killweb
@@ -36,8 +38,8 @@ class TestKillweb:
             test_killweb (Killweb): The test killweb from the fixture
             mocker (pytest-mock): An object to create mocks by patching functions
         """
-        mocker.patch("mimik.component_graph.component_graph.plt.show")
-        mocker.patch("mimik.component_graph.component_graph.plt.subplots", return_value=(MagicMock(), MagicMock()))
+        mocker.patch("matplotlib.pyplot.show")
+        mocker.patch("matplotlib.pyplot.subplots", return_value=(MagicMock(), MagicMock()))
         mock_draw = MagicMock()
         mock_to_agraph = MagicMock()
         mock_to_agraph = mocker.patch("networkx.nx_agraph.to_agraph")
@@ -62,6 +64,49 @@ class TestKillweb:
         assert len(nx.descendants(test_killweb.component_graph, "Test_Component_2_2")) == 1
         assert len(nx.ancestors(test_killweb.component_graph, "Test_Component_3")) == 3
 
+    def test_stream_config(self, test_killweb: Killweb):
+        """
+        Test that a Killweb streamed from its config file matches one loaded in full
+
+        Args:
+            test_killweb (Killweb): The test killweb from the fixture
+        """
+        streamed_killweb = Killweb(
+            working_dir=os.path.join(".", "tests"),
+            config_file=os.path.join(".", "tests", "test_configs", "test_json.json"),
+            silent=True,
+            stream_config=True
+        )
+        assert streamed_killweb.component_graph.fingerprint() == test_killweb.component_graph.fingerprint()
+        assert streamed_killweb.get_all_paths_in_killweb() == test_killweb.get_all_paths_in_killweb()
+        with pytest.raises(jsonschema.exceptions.ValidationError):
+            streamed_killweb.stream_killweb_from_config_file(os.path.join(".", "tests", "test_configs", "invalid_config.json"))
+
+    def test_batch(self, test_killweb: Killweb):
+        """
+        Test that the Killweb's batch collects components and commits them at once
+
+        Args:
+            test_killweb (Killweb): The test killweb from the fixture
+        """
+        test_killweb.monte_carlo_on_paths(10)
+        with test_killweb.batch():
+            test_killweb.add_new_component("Test_Component_2_2", ["Test_Component_3"], ["Test_Component_1"], {"task": "Test_Task_2", "task_arguments": {"probability": 0.9}})
+            test_killweb.add_components([("Test_Component_4", [], ["Test_Component_3"], {"task": "Test_Task", "task_arguments": {"probability": 0.5}})])
+            assert "Test_Component_2_2" not in test_killweb.component_graph.nodes
+            assert len(test_killweb.component_capabilities.get_path_summaries()) == 1
+            test_killweb.add_new_edge("Test_Component_2_2", "Test_Component_4")
+            assert "Test_Component_4" in test_killweb.component_graph.nodes
+        assert len(test_killweb.component_capabilities.get_path_summaries()) == 0
+        assert test_killweb.count_paths_in_killweb() == 3
+        with pytest.raises(RuntimeError):
+            with test_killweb.batch():
+                test_killweb.add_new_component("Test_Component_5", [], ["Test_Component_4"], {})
+                raise RuntimeError
+        assert "Test_Component_5" not in test_killweb.component_graph.nodes
+        test_killweb.add_new_component("Test_Component_5", [], ["Test_Component_4"], {})
+        assert "Test_Component_5" in test_killweb.component_graph.nodes
+
     def test_add_new_edge(self, test_killweb: Killweb):
         """
         Test the Killweb's add_new_edge method
@@ -72,8 +117,13 @@ class TestKillweb:
         test_killweb.add_new_component("Test_Component_2_2",  ["Test_Component_3"], ["Test_Component_1"], {"task": "Test_Task_2", "task_arguments": {"probability": 0.9}})
         test_killweb.add_new_component("Test_Component_3_2", [], ["Test_Component_2"], {"task": "Test_Task_3", "task_arguments": {"probability": 0.9}})
         assert len(nx.ancestors(test_killweb.component_graph, "Test_Component_3_2")) == 2
+        capabilities = test_killweb.component_capabilities
+        test_killweb.monte_carlo_on_paths(10, seed=0)
         test_killweb.add_new_edge("Test_Component_2_2", "Test_Component_3_2")
         assert len(nx.ancestors(test_killweb.component_graph, "Test_Component_3_2")) == 3
+        assert test_killweb.component_capabilities is capabilities
+        assert len(capabilities.get_monte_carlo_summaries()) == 0
+        assert ["Test_Component_1", "Test_Component_2_2", "Test_Component_3_2"] in test_killweb.get_all_paths_in_killweb()
 
     def test_remove_component(self, test_killweb: Killweb):
         """
@@ -161,6 +211,47 @@ class TestKillweb:
         test_killweb.monte_carlo_on_paths(10)
         test_killweb.print_probabilities_of_paths(amount_to_print=1)
     
+    def test_parameter_sweep(self, test_killweb: Killweb):
+        """
+        Test the Killweb's parameter_sweep and task_scenarios methods
+
+        Args:
+            test_killweb (Killweb): The test killweb from the fixture
+        """
+        scenarios = test_killweb.task_scenarios("Test_Task_3", [{"probability": 0.0}, {"probability": 1.0}])
+        table = test_killweb.parameter_sweep(scenarios, 100, seed=0)
+        assert table["scenario"].tolist() == [0, 1]
+        assert table["probability"][0] == 0
+        assert table["average_num_success"][0] < table["average_num_success"][1]
+
+    def test_get_top_paths(self, test_killweb: Killweb):
+        """
+        Test the Killweb's get_top_paths method
+
+        Args:
+            test_killweb (Killweb): The test killweb from the fixture
+        """
+        test_killweb.add_new_component("Test_Component_2_2",  ["Test_Component_3"], ["Test_Component_1"], {"task": "Test_Task_2", "task_arguments": {"probability": 0.0}})
+        test_killweb.monte_carlo_on_paths(100, seed=0)
+        top_paths = test_killweb.get_top_paths(1)
+        assert list(top_paths.keys()) == ["Test_Component_1, Test_Component_2, Test_Component_3"]
+        assert top_paths["Test_Component_1, Test_Component_2, Test_Component_3"] == test_killweb.get_probabilities_of_paths()["Test_Component_1, Test_Component_2, Test_Component_3"]
+
+    def test_get_analytic_probabilities_of_paths(self, test_killweb: Killweb):
+        """
+        Test the Killweb's get_analytic_probabilities_of_paths method
+
+        Args:
+            test_killweb (Killweb): The test killweb from the fixture
+        """
+        test_killweb.add_new_component("Test_Component_2_2",  ["Test_Component_3"], ["Test_Component_1"], {"task": "Test_Task_2", "task_arguments": {"probability": 0.5}})
+        probability_of_success = test_killweb.get_analytic_probabilities_of_paths()
+        assert list(probability_of_success.keys()) == [
+            "Test_Component_1, Test_Component_2_2, Test_Component_3",
+            "Test_Component_1, Test_Component_2, Test_Component_3"
+        ]
+        assert probability_of_success["Test_Component_1, Test_Component_2_2, Test_Component_3"] == pytest.approx(0.4)
+
     def test_print_proportion_complete(self, test_killweb: Killweb):
         """
         Test the Killweb's proportion_complete method
@@ -212,6 +303,52 @@ class TestKillweb:
         )
         mock_ax.set_title.assert_called_once_with("Distribution of Successful Events")
 
+    def test_adaptive_monte_carlo_on_paths(self, test_killweb: Killweb):
+        """
+        Tests the Killweb's adaptive_monte_carlo_on_paths method
+
+        Args:
+            test_killweb (Killweb): The test killweb from the fixture
+        """
+        iterations_used = test_killweb.adaptive_monte_carlo_on_paths(0.05, seed=0)
+        assert iterations_used["Test_Component_1, Test_Component_2, Test_Component_3"] == 1000
+        assert 0.6 <= test_killweb.print_proportion_complete(["Test_Component_1", "Test_Component_2", "Test_Component_3"]) <= 0.85
+
+    def test_monte_carlo_on_paths_incremental(self, test_killweb: Killweb):
+        """
+        Tests that the Killweb's monte_carlo_on_paths method only re-simulates the paths whose tasks changed
+
+        Args:
+            test_killweb (Killweb): The test killweb from the fixture
+        """
+        test_killweb.add_new_component("Test_Component_2_2",  ["Test_Component_3"], ["Test_Component_1"], {"task": "Test_Task_2", "task_arguments": {"probability": 0.5}})
+        unchanged_path = "Test_Component_1, Test_Component_2, Test_Component_3"
+        changed_path = "Test_Component_1, Test_Component_2_2, Test_Component_3"
+        test_killweb.monte_carlo_on_paths(1000, seed=4)
+        outcomes, _ = test_killweb.get_monte_carlo_results()
+        unchanged_outcomes = outcomes[unchanged_path]
+        test_killweb.add_task_to_component("Test_Component_2_2", "Test_Task_2", {"probability": 0.1})
+        test_killweb.monte_carlo_on_paths(1000, seed=4)
+        outcomes, _ = test_killweb.get_monte_carlo_results()
+        assert outcomes[unchanged_path] is unchanged_outcomes
+        assert 0.04 <= test_killweb.print_proportion_complete(changed_path.split(", ")) <= 0.12
+        incremental_outcomes = outcomes[changed_path]
+        test_killweb.monte_carlo_on_paths(1000, seed=4, incremental=False)
+        outcomes, _ = test_killweb.get_monte_carlo_results()
+        assert outcomes[unchanged_path] is not unchanged_outcomes
+        assert np.array_equal(outcomes[unchanged_path], unchanged_outcomes)
+        assert np.array_equal(outcomes[changed_path], incremental_outcomes)
+        test_killweb.monte_carlo_on_paths(1000)
+        unseeded_outcomes = test_killweb.get_monte_carlo_results()[0][unchanged_path]
+        unseeded_seed = test_killweb.component_capabilities.get_monte_carlo_seed()
+        test_killweb.monte_carlo_on_paths(1000)
+        assert test_killweb.component_capabilities.get_monte_carlo_seed() != unseeded_seed
+        assert test_killweb.get_monte_carlo_results()[0][unchanged_path] is not unseeded_outcomes
+        test_killweb.monte_carlo_on_paths(1000, seed=[4, 5])
+        sequence_outcomes = test_killweb.get_monte_carlo_results()[0][unchanged_path]
+        test_killweb.monte_carlo_on_paths(1000, seed=[4, 5])
+        assert test_killweb.get_monte_carlo_results()[0][unchanged_path] is sequence_outcomes
+
     def test_get_monte_carlo_results(self, test_killweb: Killweb):
         """
         Tests the Killweb's get_monte_carlo_results method
@@ -223,6 +360,25 @@ class TestKillweb:
         assert len(outcomes["Test_Component_1, Test_Component_2, Test_Component_3"]) == 100
         assert len(probabilities["Test_Component_1, Test_Component_2, Test_Component_3"]) == 100
 
+    def test_monte_carlo_on_paths_shared_components(self, test_killweb: Killweb):
+        """
+        Tests the Killweb's monte_carlo_on_paths method when components are shared between paths
+
+        Args:
+            test_killweb (Killweb): The test killweb from the fixture
+        """
+        test_killweb.add_new_component("Test_Component_2_2",  ["Test_Component_3"], ["Test_Component_1"], {"task": "Test_Task_2", "task_arguments": {"probability": 0.5}})
+        test_killweb.monte_carlo_on_paths(1000, shared_components=True)
+        outcomes, _ = test_killweb.get_monte_carlo_results()
+        assert len(outcomes) == 2
+        first_path = outcomes["Test_Component_1, Test_Component_2, Test_Component_3"]
+        second_path = outcomes["Test_Component_1, Test_Component_2_2, Test_Component_3"]
+        assert first_path.shape == (1000,)
+        both_reached = (first_path >= 2) & (second_path >= 2)
+        assert (first_path[both_reached] == second_path[both_reached]).all()
+        assert 0.6 <= test_killweb.print_proportion_complete(["Test_Component_1", "Test_Component_2", "Test_Component_3"]) <= 0.85
+        assert 0.3 <= test_killweb.print_proportion_complete(["Test_Component_1", "Test_Component_2_2", "Test_Component_3"]) <= 0.5
+
     def test_calculate_node_centrality(self, test_killweb: Killweb):
         """
         Test the Killweb's calculate_node_centrality method